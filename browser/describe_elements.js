@@ -0,0 +1,20 @@
+function irrelevant(arguments) {
+    const [elements, cssNames] = arguments;
+    return elements.map((element) => {
+        const style = window.getComputedStyle(element);
+        const cssValues = {};
+        for (const name of cssNames) cssValues[name] = style.getPropertyValue(name);
+        const rect = element.getBoundingClientRect();
+        return {
+            // SVG elements have no innerText.
+            text: element.innerText ?? element.textContent,
+            displayed: (
+                style.display !== 'none'
+                && style.visibility !== 'hidden'
+                && element.getClientRects().length !== 0),
+            // Same as WebDriver does, coordinates are relative to the document.
+            rect: {x: rect.x + window.scrollX, y: rect.y + window.scrollY, width: rect.width, height: rect.height},
+            cssValues: cssValues,
+        };
+    });
+}
@@ -0,0 +1,34 @@
+function irrelevant(arguments) {
+    const [root, using, value, timeoutMs, done] = arguments;
+    const context = root === null ? document : root;
+
+    function find() {
+        if (using === 'css selector') return Array.from(context.querySelectorAll(value));
+        const snapshot = document.evaluate(
+            value, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const found = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            const node = snapshot.snapshotItem(i);
+            if (node.nodeType === Node.ELEMENT_NODE) found.push(node);
+        }
+        return found;
+    }
+
+    let found = find();
+    if (found.length !== 0) {
+        done(found);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        found = find();
+        if (found.length === 0) return;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(found);
+    });
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done([]);
+    }, timeoutMs);
+}
@@ -9,6 +9,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from typing import Mapping
+from typing import NamedTuple
 from typing import NoReturn
 from typing import Optional
 from typing import Sequence
@@ -97,6 +98,16 @@ def _execute_synchronous_javascript(
     return webdriver_session.post('/execute/sync', script_arguments)
 
 
+def _execute_asynchronous_javascript(
+        webdriver_session: 'WebDriverSession',
+        script: str,
+        arguments: Sequence[Any] = (),
+        ) -> Any:
+    # The script gets a callback as the last argument and must call it with the result.
+    script_arguments = {"script": script, "args": arguments}
+    return webdriver_session.post('/execute/async', script_arguments)
+
+
 class Keyboard:
 
     def __init__(self, name: str, webdriver_session: 'WebDriverSession'):
@@ -174,14 +185,20 @@ class ElementSelector:
         search_expression = {"using": self._location_strategy, "value": self._selector}
         timeout_at = time.monotonic() + timeout
         while True:
-            if post_result := element.http_post("/elements", search_expression):
+            wait_sec = min(max(timeout_at - time.monotonic(), 0), _max_browser_wait_sec)
+            post_result = element.wait_for_elements(self._location_strategy, self._selector, wait_sec)
+            polled = post_result is None
+            if polled:
+                post_result = element.http_post("/elements", search_expression)
+            if post_result:
                 elements = [element.get_child(element_struct) for element_struct in post_result]
                 if len(elements) == 1:
                     return elements[0]
                 raise MultipleElementsFound(f"Multiple elements are identified by {self}: {elements}")
             if time.monotonic() > timeout_at:
                 raise ElementNotFound(f"Can't find element identified by {self}")
-            time.sleep(0.5)
+            if polled:
+                time.sleep(0.5)
 
     def find_in(self, element: '_DOMElement') -> 'WebDriverElement':
         search_expression = {"using": self._location_strategy, "value": self._selector}
@@ -248,10 +265,52 @@ class ByCSS(ElementSelector):
         super().__init__('css selector', value)
 
 
+# A single wait in the browser must end before the WebDriver script timeout, 30 seconds by default.
+_max_browser_wait_sec = 20
+
+
 def get_visible_text(element: 'WebDriverElement') -> str:
     return element.http_get("/text")
 
 
+class ElementDescription(NamedTuple):
+    # Text is taken as innerText, which is close to what get_visible_text() returns.
+    text: str
+    is_displayed: bool
+    rect: BoundingRectangle
+    css_values: Mapping[str, str]
+
+
+def describe_elements(
+        elements: Sequence['WebDriverElement'],
+        css_names: Sequence[str] = (),
+        ) -> Sequence[ElementDescription]:
+    """Get text, visibility, position and CSS values of many elements at once."""
+    if not elements:
+        return []
+    [first, *_] = elements
+    script = Path(__file__).with_name('describe_elements.js').read_text()
+    script_arguments = [[element._id.serialize() for element in elements], list(css_names)]
+    try:
+        result = _execute_synchronous_javascript(
+            first._webdriver_session, f'return ({script})(arguments);', script_arguments)
+    except WebDriverError as err:
+        if err.error == 'stale element reference':
+            raise StaleElementReference(
+                "A stale element ID is received. Probably the page has been reloaded. "
+                f"Some of {elements} should be re-created")
+        raise
+    return [
+        ElementDescription(
+            text=raw['text'],
+            is_displayed=raw['displayed'],
+            rect=BoundingRectangle(raw['rect']['x'], raw['rect']['y'], raw['rect']['width'], raw['rect']['height']),
+            css_values=raw['cssValues'],
+            )
+        for raw in result
+        ]
+
+
 class _DOMElement(metaclass=ABCMeta):
 
     def __init__(self, webdriver_session: 'WebDriverSession'):
@@ -264,9 +323,39 @@ class _DOMElement(metaclass=ABCMeta):
     def http_post(self, path: str, params: Mapping[str, Any]) -> Optional[Any]:
         pass
 
+    @abstractmethod
+    def _serialize_for_script(self) -> Optional[Mapping[str, str]]:
+        pass
+
+    def wait_for_elements(
+            self,
+            location_strategy: str,
+            selector: str,
+            timeout_sec: float,
+            ) -> Optional[Sequence[Mapping[str, str]]]:
+        """Wait for elements in the browser, watching the DOM for changes.
+
+        Return element ID structures as the /elements endpoint does, possibly empty.
+        Return None if the browser can't wait: if the location strategy is
+        not supported or if the page is reloaded while waiting.
+        """
+        if location_strategy not in ('css selector', 'xpath'):
+            return None
+        script = Path(__file__).with_name('wait_elements.js').read_text()
+        script_arguments = [self._serialize_for_script(), location_strategy, selector, int(timeout_sec * 1000)]
+        try:
+            return _execute_asynchronous_javascript(
+                self._webdriver_session, f'({script})(arguments);', script_arguments)
+        except WebDriverError as err:
+            _logger.debug("Can't wait for %s %r in browser: %r", location_strategy, selector, err)
+            return None
+
 
 class _VirtualRootElement(_DOMElement):
 
+    def _serialize_for_script(self):
+        return None
+
     def http_post(self, path, params):
         full_path = f"/{path.lstrip('/')}"
         try:
@@ -290,6 +379,9 @@ class WebDriverElement(_DOMElement):
         super().__init__(webdriver_session)
         self._id = id_
 
+    def _serialize_for_script(self):
+        return self._id.serialize()
+
     def http_get(self, path: str) -> Optional[Any]:
         full_path = f"/element/{self._id.value()}/{path.lstrip('/')}"
         try:
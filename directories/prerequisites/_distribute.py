@@ -1,4 +1,5 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import getpass
 import logging
 import os
 import re
@@ -6,7 +7,9 @@ import socket
 import subprocess
 import time
 from collections import Counter
+from pathlib import Path
 from typing import Optional
+from typing import Sequence
 
 from config import global_config
 from directories import NotALocalArtifact
@@ -97,6 +100,39 @@ class DefaultDistributionGroup(_DistributionGroup):
         if failed_targets:
             _logger.info("Failed to distribute file to %s", failed_targets)
 
+    def peer_dir_urls(self, local_dir: Path) -> Sequence[str]:
+        """Return URLs of the same directory on the other hosts of the group.
+
+        Hosts share their directories over HTTP as set by http_share,
+        which is the same on all hosts of the group.
+
+        >>> from config import global_config
+        >>> global_config['distribution_group'] = socket.gethostname() + ',sc-ft002,sc-ft003'
+        >>> global_config['http_share'] = os.pathsep.join(['{home}', 'http://{hostname}/share/'])
+        >>> group = DefaultDistributionGroup()
+        >>> group.peer_dir_urls(Path.home() / 'prerequisites' / 'vm')
+        ['http://sc-ft002/share/prerequisites/vm/', 'http://sc-ft003/share/prerequisites/vm/']
+        >>> group.peer_dir_urls(Path('/nonexistent/prerequisites'))
+        []
+        """
+        if 'http_share' not in global_config:
+            return []
+        [root, url] = global_config['http_share'].split(os.pathsep, 1)
+        this_host = socket.gethostname()
+        root = Path(root.format(home=Path.home(), username=getpass.getuser(), hostname=this_host))
+        try:
+            relative_path = local_dir.relative_to(root)
+        except ValueError:
+            _logger.info("%s is not shared, peers are not used", local_dir)
+            return []
+        urls = []
+        for host in self._hosts:
+            if host == this_host:
+                continue
+            host_url = url.format(home=Path.home(), username=getpass.getuser(), hostname=host)
+            urls.append(host_url.rstrip('/') + '/' + relative_path.as_posix() + '/')
+        return urls
+
 
 class _RemotePath:
 
@@ -8,6 +8,7 @@ import time
 from http import HTTPStatus
 from pathlib import Path
 from pathlib import PurePosixPath
+from typing import Collection
 from typing import Optional
 from typing import Sequence
 from urllib.error import HTTPError
@@ -16,49 +17,68 @@ from urllib.parse import urlparse
 from urllib.request import urlopen
 
 from directories.filelocker import wait_locked_exclusively
+from directories.prerequisites._segmented_download import PeerFile
+from directories.prerequisites._segmented_download import download_in_segments
 
 
-def concurrent_safe_download(source_url: str, destination_dir: Path) -> Path:
+def concurrent_safe_download(source_url: str, destination_dir: Path, peer_dir_urls: Collection[str] = ()) -> Path:
+    """Download a file, unless it's downloaded already.
+
+    Peer dir URLs point to the same directory on other hosts, where the
+    same file may be downloaded already or being downloaded.
+    """
     if not destination_dir.is_dir():
         raise RuntimeError(f"Should be a directory: {destination_dir=}")
     destination = destination_dir / _get_resource_name(source_url)
     lock_file = destination.with_name(destination.name + ".lock")
     with wait_locked_exclusively(lock_file, _http_download_timeout + 5):
         if not destination.exists():
-            _download(source_url, destination)
+            _download(source_url, destination, peer_dir_urls)
     return destination
 
 
-def _download(source_url: str, destination: Path):
+def _download(source_url: str, destination: Path, peer_dir_urls: Collection[str]):
     _logger.info("Download: start: %s -> %s", source_url, destination)
     scheme = urlparse(source_url).scheme
     if scheme in ('http', 'https'):
-        _http_download(source_url, destination)
+        _http_download(source_url, destination, peer_dir_urls)
     elif scheme == 'file':
         _move_file(source_url, destination)
     else:
         raise RuntimeError(f'Unsupported URL scheme: {scheme}')
 
 
-def _http_download(source_url: str, destination: Path):
+def _http_download(source_url: str, destination: Path, peer_dir_urls: Collection[str]):
     tmp_file = destination.with_suffix('.download')
-    process = CurlProcess(
-        args=[
-            '--output', str(tmp_file),
-            '--continue-at', '-',
-            '--fail',
-            '--location',
-            '--connect-timeout', '10',
-            ],
-        url=source_url)
-    process.wait()
     expected_md5_hash = _get_source_md5(source_url)
+    if expected_md5_hash is None:
+        _logger.info("No MD5 for %s, copies on peers can't be verified and are not used", source_url)
+        peers = []
+    else:
+        peers = [
+            PeerFile(url.rstrip('/') + '/' + destination.name, url.rstrip('/') + '/' + tmp_file.name)
+            for url in peer_dir_urls
+            ]
+    actual_md5_hash = download_in_segments(source_url, tmp_file, _segmented_download_workers, _http_download_timeout, peers)
+    if peers and actual_md5_hash is not None and actual_md5_hash != expected_md5_hash:
+        _logger.warning("Checksum mismatch after download with peers, download from the source only: %s", source_url)
+        tmp_file.unlink()
+        actual_md5_hash = download_in_segments(source_url, tmp_file, _segmented_download_workers, _http_download_timeout)
+    if actual_md5_hash is None:
+        process = CurlProcess(
+            args=[
+                '--output', str(tmp_file),
+                '--continue-at', '-',
+                '--fail',
+                '--location',
+                '--connect-timeout', '10',
+                ],
+            url=source_url)
+        process.wait()
     if expected_md5_hash is not None:
-        actual_md5_hash = hashlib.md5()
-        with tmp_file.open('rb') as f:
-            while chunk := f.read(1024 * 1024):
-                actual_md5_hash.update(chunk)
-        if expected_md5_hash != actual_md5_hash.hexdigest():
+        if actual_md5_hash is None:
+            actual_md5_hash = _calculate_md5(tmp_file)
+        if expected_md5_hash != actual_md5_hash:
             tmp_file.unlink()
             raise RuntimeError(
                 f"Checksum for {destination} mismatch. "
@@ -67,6 +87,14 @@ def _http_download(source_url: str, destination: Path):
     tmp_file.replace(destination)
 
 
+def _calculate_md5(path: Path) -> str:
+    md5_hash = hashlib.md5()
+    with path.open('rb') as f:
+        while chunk := f.read(1024 * 1024):
+            md5_hash.update(chunk)
+    return md5_hash.hexdigest()
+
+
 class CurlProcess:
 
     def __init__(self, args: Sequence[str], url: str):
@@ -191,3 +219,4 @@ class DownloadHTTPError(Exception):
 
 _logger = logging.getLogger(__name__)
 _http_download_timeout = 120 * 60
+_segmented_download_workers = 8
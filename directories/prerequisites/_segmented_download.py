@@ -0,0 +1,352 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Collection
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from urllib.error import HTTPError
+from urllib.error import URLError
+from urllib.request import Request
+from urllib.request import urlopen
+
+_logger = logging.getLogger(__name__)
+
+_segment_size = 32 * 1024 * 1024
+_chunk_size = 1024 * 1024
+_segment_attempts = 3
+_progress_period_sec = 10
+_peer_check_period_sec = 10
+_state_suffix = '.segments'
+
+
+class _Remote(NamedTuple):
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class PeerFile(NamedTuple):
+    """The same file on another host, served over HTTP.
+
+    It's either complete or being downloaded in segments. In the latter
+    case, the completed segments are listed in the state file, which is
+    served next to the partial download.
+    """
+
+    url: str
+    download_url: str
+
+
+def download_in_segments(
+        source_url: str,
+        destination: Path,
+        workers: int,
+        timeout_sec: float,
+        peers: Collection[PeerFile] = (),
+        ) -> Optional[str]:
+    """Download with concurrent range requests and return MD5 of the file.
+
+    The file is preallocated, and the segments are written to their
+    offsets as they arrive. Completed segments are recorded in a state
+    file next to the destination, so that an interrupted download
+    resumes with the remaining segments. MD5 can only be calculated
+    sequentially: it's calculated over the completed beginning of the
+    file while the rest is being downloaded.
+
+    Segments, which peers have, are taken from them, others are taken
+    from the source. Every host starts from its own segment, so that
+    hosts downloading the same file at the same time take most of it
+    from each other. Without peers, segments are requested in order.
+    With peers, the beginning of the file may be completed last, and
+    then most of the file is hashed after the download, when it's read
+    back, mostly from the page cache. Hashing is much faster than
+    downloading, so this costs less than what peers save. Data from
+    peers are only as good as the returned MD5 checksum, which must be
+    verified by the caller.
+
+    None is returned and nothing is downloaded if the server is
+    unreachable, doesn't support ranges, responds with an error or
+    the file is too small to split. Errors are left for the caller's
+    fallback to report.
+    """
+    remote = _probe(source_url)
+    if remote is None:
+        _logger.info("Can't download in segments: %s", source_url)
+        return None
+    if remote.size < 2 * _segment_size:
+        _logger.info("Too small to download in segments: %s, %d bytes", source_url, remote.size)
+        return None
+    download = _SegmentedDownload(source_url, destination, remote, peers)
+    return download.run(workers, timeout_sec)
+
+
+def _probe(url: str, timeout_sec: float = 30) -> Optional[_Remote]:
+    request = Request(url, headers={'Range': 'bytes=0-0'})
+    try:
+        response = urlopen(request, timeout=timeout_sec)
+    except HTTPError as e:
+        e.close()
+        _logger.info("Range request to %s failed: %s", url, e)
+        return None
+    except (URLError, ConnectionError, TimeoutError) as e:
+        _logger.info("Range request to %s failed: %r", url, e)
+        return None
+    with response:
+        if response.status != 206:
+            return None
+        content_range = response.headers.get('Content-Range', '')
+        match = re.fullmatch(r'bytes 0-0/(\d+)', content_range)
+        if match is None:
+            return None
+        return _Remote(int(match.group(1)), response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+
+class _Peer:
+
+    def __init__(self, file: PeerFile, download_description):
+        self._file = file
+        self._download_description = download_description
+        self._lock = threading.Lock()
+        self._checked_at = float('-inf')
+        self._complete = False
+        self._completed_segments = frozenset()
+
+    def __repr__(self):
+        return f'<_Peer {self._file.url}>'
+
+    def find_segment(self, index: int) -> Optional[str]:
+        with self._lock:
+            if not self._complete and time.monotonic() - self._checked_at > _peer_check_period_sec:
+                self._check()
+            if self._complete:
+                return self._file.url
+            if index in self._completed_segments:
+                return self._file.download_url
+            return None
+
+    def forget(self):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            self._complete = False
+            self._completed_segments = frozenset()
+
+    def _check(self):
+        self._checked_at = time.monotonic()
+        try:
+            with urlopen(self._file.download_url + _state_suffix, timeout=3) as response:
+                state = json.load(response)
+        except (URLError, ConnectionError, TimeoutError, ValueError):
+            state = None
+        if state is not None and state.get('download') == self._download_description:
+            self._completed_segments = frozenset(state['completed_segments'])
+            _logger.debug("%r: %d segments completed", self, len(self._completed_segments))
+            return
+        remote = _probe(self._file.url, timeout_sec=3)
+        expected_size = self._download_description['remote']['size']
+        self._complete = remote is not None and remote.size == expected_size
+        _logger.debug("%r: complete: %s", self, self._complete)
+
+
+class _SegmentedDownload:
+
+    def __init__(self, url: str, destination: Path, remote: _Remote, peers: Collection[PeerFile]):
+        self._url = url
+        self._destination = destination
+        self._state_file = destination.with_name(destination.name + _state_suffix)
+        self._remote = remote
+        self._peers = [_Peer(peer, self._describe()) for peer in peers]
+        self._peer_bytes = 0
+        self._segment_count = -(-remote.size // _segment_size)
+        self._lock = threading.Lock()
+        self._segment_completed = threading.Condition(self._lock)
+        self._completed_segments = set()
+        self._stopped = threading.Event()
+        self._downloaded_bytes = 0
+
+    def run(self, workers: int, timeout_sec: float) -> str:
+        started_at = time.monotonic()
+        fd = os.open(self._destination, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+        try:
+            self._load_state(fd)
+            pending = [index for index in self._ordered_segments() if index not in self._completed_segments]
+            _logger.info(
+                "Download %s in %d segments with %d workers, %d segments left",
+                self._url, self._segment_count, workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='Segment') as executor:
+                futures = [executor.submit(self._fetch_segment, fd, index) for index in pending]
+                try:
+                    md5_hash = self._hash_completed(futures, started_at + timeout_sec)
+                finally:
+                    self._stopped.set()
+                    for future in futures:
+                        future.cancel()
+        finally:
+            os.close(fd)
+        self._state_file.unlink()
+        duration_sec = time.monotonic() - started_at
+        _logger.info(
+            "Downloaded %s: %d MB in %.1f sec, %.1f MB/s, %d MB from peers",
+            self._url, self._downloaded_bytes // 10**6, duration_sec, self._downloaded_bytes / 10**6 / duration_sec,
+            self._peer_bytes // 10**6)
+        return md5_hash
+
+    def _ordered_segments(self) -> Sequence[int]:
+        if not self._peers:
+            return range(self._segment_count)
+        # Hosts, which start at the same time, take different segments
+        # from the source and the rest from each other.
+        first = zlib.crc32(socket.gethostname().encode()) % self._segment_count
+        return [*range(first, self._segment_count), *range(first)]
+
+    def _load_state(self, fd: int):
+        try:
+            state = json.loads(self._state_file.read_text())
+        except (FileNotFoundError, ValueError):
+            state = None
+        if state is not None and state.get('download') == self._describe():
+            self._completed_segments = set(state['completed_segments'])
+            _logger.info("Resume %s: %d segments completed", self._url, len(self._completed_segments))
+            return
+        self._completed_segments = set()
+        self._save_state()
+        # A file left by another download may be longer; data beyond the size would remain.
+        os.ftruncate(fd, 0)
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fd, 0, self._remote.size)
+        else:
+            os.ftruncate(fd, self._remote.size)
+
+    def _describe(self):
+        return {'url': self._url, 'remote': self._remote._asdict(), 'segment_size': _segment_size}
+
+    def _save_state(self):
+        state = {
+            'download': self._describe(),
+            'completed_segments': sorted(self._completed_segments),
+            }
+        tmp_file = self._state_file.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(state))
+        tmp_file.replace(self._state_file)
+
+    def _fetch_segment(self, fd: int, index: int):
+        start = index * _segment_size
+        end = min(start + _segment_size, self._remote.size)
+        if not self._fetch_from_peers(fd, index, start, end):
+            for attempt in range(1, _segment_attempts + 1):
+                try:
+                    self._fetch_range(fd, self._url, start, end, self._remote.etag)
+                except (URLError, ConnectionError, TimeoutError) as e:
+                    if self._stopped.is_set() or attempt == _segment_attempts:
+                        raise
+                    _logger.info("Segment %d of %s failed, attempt %d: %s", index, self._url, attempt, e)
+                else:
+                    break
+        with self._segment_completed:
+            self._completed_segments.add(index)
+            self._save_state()
+            self._segment_completed.notify_all()
+
+    def _fetch_from_peers(self, fd: int, index: int, start: int, end: int) -> bool:
+        for peer in random.sample(self._peers, len(self._peers)):
+            if self._stopped.is_set():
+                return False
+            url = peer.find_segment(index)
+            if url is None:
+                continue
+            try:
+                self._fetch_range(fd, url, start, end, None)
+            except (URLError, ConnectionError, TimeoutError, _RangeNotServed) as e:
+                _logger.info("Segment %d from %r failed: %s", index, peer, e)
+                peer.forget()
+                continue
+            with self._lock:
+                self._peer_bytes += end - start
+            return True
+        return False
+
+    def _fetch_range(self, fd: int, url: str, start: int, end: int, etag: Optional[str]):
+        request = Request(url, headers={'Range': f'bytes={start}-{end - 1}'})
+        if etag is not None:
+            request.add_header('If-Range', etag)
+        with urlopen(request, timeout=30) as response:
+            if response.status != 206:
+                raise _RangeNotServed(f"{url} changed while downloaded: {response.status} response to a range request")
+            buffer = bytearray(_chunk_size)
+            view = memoryview(buffer)
+            offset = start
+            while offset < end:
+                if self._stopped.is_set():
+                    raise RuntimeError("Download stopped")
+                size = response.readinto(view[:min(_chunk_size, end - offset)])
+                if size == 0:
+                    raise ConnectionError(f"Range {start}-{end} of {url} ended at {offset}")
+                _write_at(fd, view[:size], offset)
+                offset += size
+                with self._lock:
+                    self._downloaded_bytes += size
+
+    def _hash_completed(self, futures, deadline: float) -> str:
+        md5_hash = hashlib.md5()
+        hashed_segments = 0
+        last_progress_at = time.monotonic()
+        last_progress_bytes = 0
+        with open(self._destination, 'rb') as f:
+            while hashed_segments < self._segment_count:
+                with self._segment_completed:
+                    if hashed_segments not in self._completed_segments:
+                        self._segment_completed.wait(1)
+                    ready = hashed_segments in self._completed_segments
+                if ready:
+                    # Segments have just been written, they are read from the page cache.
+                    f.seek(hashed_segments * _segment_size)
+                    md5_hash.update(f.read(_segment_size))
+                    hashed_segments += 1
+                for future in futures:
+                    if future.done() and not future.cancelled() and future.exception() is not None:
+                        raise future.exception()
+                now = time.monotonic()
+                if now > deadline:
+                    raise TimeoutError(f"Timed out downloading {self._url}")
+                if now - last_progress_at > _progress_period_sec:
+                    _logger.info(
+                        "Download %s: %d of %d segments, %.1f MB/s",
+                        self._url, len(self._completed_segments), self._segment_count,
+                        (self._downloaded_bytes - last_progress_bytes) / 10**6 / (now - last_progress_at))
+                    last_progress_at = now
+                    last_progress_bytes = self._downloaded_bytes
+        return md5_hash.hexdigest()
+
+
+class _RangeNotServed(Exception):
+    pass
+
+
+if hasattr(os, 'pwrite'):
+
+    def _write_at(fd: int, data, offset: int):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+
+else:
+    _seek_lock = threading.Lock()
+
+    def _write_at(fd: int, data, offset: int):
+        # Windows doesn't have pwrite(); seek and write must be atomic.
+        with _seek_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
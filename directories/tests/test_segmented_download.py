@@ -0,0 +1,183 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import hashlib
+import json
+import os
+import re
+import socket
+import unittest
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+
+from directories.prerequisites import DownloadHTTPError
+from directories.prerequisites import concurrent_safe_download
+from directories.prerequisites._segmented_download import PeerFile
+from directories.prerequisites._segmented_download import _segment_size
+from directories.prerequisites._segmented_download import download_in_segments
+
+
+class _RangeHandler(SimpleHTTPRequestHandler):
+
+    def do_GET(self):
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        path = Path(self.translate_path(self.path))
+        if match is None or not path.is_file():
+            super().do_GET()
+            return
+        [start, end] = [int(group) for group in match.groups()]
+        self.server.requested_ranges.append((start, end))
+        size = path.stat().st_size
+        with path.open('rb') as f:
+            f.seek(start)
+            data = f.read(end + 1 - start)
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SegmentedDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self._root = TemporaryDirectory()
+        self._served_dir = Path(self._root.name, 'served')
+        self._served_dir.mkdir()
+        self._data = os.urandom(_segment_size * 2 + 12345)
+        self._served_dir.joinpath('disk.vdi').write_bytes(self._data)
+        self._destination = Path(self._root.name, 'disk.download')
+
+    def tearDown(self):
+        self._root.cleanup()
+
+    def _serve(self, handler_class, served_dir=None):
+        served_dir = served_dir or self._served_dir
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler_class, directory=str(served_dir)))
+        server.requested_ranges = []
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        [address, port] = server.server_address
+        return server, f'http://{address}:{port}/disk.vdi'
+
+    @staticmethod
+    def _closed_port():
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            [_, port] = sock.getsockname()
+        return port
+
+    def _write_state(self, path, url, completed_segments):
+        state = {
+            'download': {
+                'url': url,
+                'remote': {'size': len(self._data), 'etag': None, 'last_modified': None},
+                'segment_size': _segment_size,
+                },
+            'completed_segments': completed_segments,
+            }
+        path.write_text(json.dumps(state))
+
+    def test_download(self):
+        [_, url] = self._serve(_RangeHandler)
+        md5 = download_in_segments(url, self._destination, workers=3, timeout_sec=60)
+        self.assertEqual(md5, hashlib.md5(self._data).hexdigest())
+        self.assertEqual(self._destination.read_bytes(), self._data)
+        self.assertFalse(self._destination.with_name('disk.download.segments').exists())
+
+    def test_resume(self):
+        [server, url] = self._serve(_RangeHandler)
+        self._destination.write_bytes(self._data[:_segment_size] + bytes(len(self._data) - _segment_size))
+        self._write_state(self._destination.with_name('disk.download.segments'), url, [0])
+        md5 = download_in_segments(url, self._destination, workers=3, timeout_sec=60)
+        self.assertEqual(md5, hashlib.md5(self._data).hexdigest())
+        self.assertEqual(self._destination.read_bytes(), self._data)
+        segment_starts = sorted(start for start, _ in server.requested_ranges if start > 0)
+        self.assertEqual(segment_starts, [_segment_size, _segment_size * 2])
+
+    def test_ranges_not_supported(self):
+        [_, url] = self._serve(SimpleHTTPRequestHandler)
+        self.assertIsNone(download_in_segments(url, self._destination, workers=3, timeout_sec=60))
+        self.assertFalse(self._destination.exists())
+
+    def test_not_found(self):
+        [_, url] = self._serve(_RangeHandler)
+        self.assertIsNone(download_in_segments(url + '.missing', self._destination, workers=3, timeout_sec=60))
+        self.assertFalse(self._destination.exists())
+
+    def test_unreachable(self):
+        url = f'http://127.0.0.1:{self._closed_port()}/disk.vdi'
+        self.assertIsNone(download_in_segments(url, self._destination, workers=3, timeout_sec=60))
+        self.assertFalse(self._destination.exists())
+
+    def test_unreachable_peer(self):
+        [_, url] = self._serve(_RangeHandler)
+        peer_url = f'http://127.0.0.1:{self._closed_port()}/disk.vdi'
+        peer = PeerFile(peer_url, peer_url.replace('disk.vdi', 'disk.download'))
+        md5 = download_in_segments(url, self._destination, workers=3, timeout_sec=60, peers=[peer])
+        self.assertEqual(md5, hashlib.md5(self._data).hexdigest())
+        self.assertEqual(self._destination.read_bytes(), self._data)
+
+    def test_not_found_with_fallback(self):
+        [_, url] = self._serve(_RangeHandler)
+        with self.assertRaises(DownloadHTTPError) as raised:
+            concurrent_safe_download(url + '.missing', self._destination.parent)
+        self.assertEqual(raised.exception.code, 404)
+
+    def test_corrupted_peer(self):
+        md5 = hashlib.md5(self._data).hexdigest()
+        self._served_dir.joinpath('disk.vdi.md5').write_text(f'{md5} disk.vdi\n')
+        [origin, url] = self._serve(_RangeHandler)
+        peer_dir = Path(self._root.name, 'peer')
+        peer_dir.mkdir()
+        peer_dir.joinpath('disk.vdi').write_bytes(bytes(len(self._data)))
+        [peer, peer_url] = self._serve(_RangeHandler, peer_dir)
+        destination_dir = Path(self._root.name, 'destination')
+        destination_dir.mkdir()
+        peer_dir_url = peer_url.replace('disk.vdi', '')
+        path = concurrent_safe_download(url, destination_dir, peer_dir_urls=[peer_dir_url])
+        self.assertEqual(path.read_bytes(), self._data)
+        self.assertTrue(peer.requested_ranges)
+        segment_starts = sorted(start for start, _ in origin.requested_ranges if start > 0)
+        self.assertEqual(segment_starts, [_segment_size, _segment_size * 2])
+
+    def test_restart_over_longer_file(self):
+        [_, url] = self._serve(_RangeHandler)
+        self._destination.write_bytes(os.urandom(len(self._data) + 12345))
+        md5 = download_in_segments(url, self._destination, workers=3, timeout_sec=60)
+        self.assertEqual(md5, hashlib.md5(self._data).hexdigest())
+        self.assertEqual(self._destination.read_bytes(), self._data)
+
+    def test_complete_on_peer(self):
+        [origin, url] = self._serve(_RangeHandler)
+        peer_dir = Path(self._root.name, 'peer')
+        peer_dir.mkdir()
+        peer_dir.joinpath('disk.vdi').write_bytes(self._data)
+        [_, peer_url] = self._serve(_RangeHandler, peer_dir)
+        peer = PeerFile(peer_url, peer_url.replace('disk.vdi', 'disk.download'))
+        md5 = download_in_segments(url, self._destination, workers=3, timeout_sec=60, peers=[peer])
+        self.assertEqual(md5, hashlib.md5(self._data).hexdigest())
+        self.assertEqual(self._destination.read_bytes(), self._data)
+        self.assertEqual(origin.requested_ranges, [(0, 0)])
+
+    def test_partial_on_peer(self):
+        [origin, url] = self._serve(_RangeHandler)
+        peer_dir = Path(self._root.name, 'peer')
+        peer_dir.mkdir()
+        peer_dir.joinpath('disk.download').write_bytes(bytes(_segment_size) + self._data[_segment_size:])
+        self._write_state(peer_dir.joinpath('disk.download.segments'), url, [1, 2])
+        [_, peer_url] = self._serve(_RangeHandler, peer_dir)
+        peer = PeerFile(peer_url, peer_url.replace('disk.vdi', 'disk.download'))
+        md5 = download_in_segments(url, self._destination, workers=3, timeout_sec=60, peers=[peer])
+        self.assertEqual(md5, hashlib.md5(self._data).hexdigest())
+        self.assertEqual(self._destination.read_bytes(), self._data)
+        self.assertEqual(origin.requested_ranges, [(0, 0), (0, _segment_size - 1)])
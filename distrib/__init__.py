@@ -20,6 +20,8 @@ from distrib._distrib import Distrib
 from distrib._distrib import OSNotSupported
 from distrib._distrib import SpecificFeatureNotSupported
 from distrib._distrib import UpdatesNotSupported
+from distrib._distrib_metadata import DistribMetadata
+from distrib._distrib_metadata import fetch_distrib_metadata
 from distrib._installer_name import InstallerArch
 from distrib._installer_name import InstallerComponent
 from distrib._installer_name import InstallerKey
@@ -53,6 +55,7 @@ __all__ = [
     'BuildRegistry',
     'Customization',
     'Distrib',
+    'DistribMetadata',
     'DistribUrlBuildInfo',
     'InstallerArch',
     'InstallerComponent',
@@ -79,6 +82,7 @@ __all__ = [
     'WINDOWS_BUNDLE',
     'WINDOWS_CLIENT',
     'WINDOWS_SERVER',
+    'fetch_distrib_metadata',
     'known_customizations',
     'list_distrib_files',
     'list_installers_url',
@@ -2,15 +2,15 @@
 import logging
 import re
 from typing import Collection
+from typing import Optional
 from typing import Tuple
-from urllib.error import HTTPError
-from urllib.error import URLError
-from urllib.request import urlopen
 
 from distrib._build_info import DistribUrlBuildInfo
 from distrib._ci_info import _CIInfo
 from distrib._ci_info import _UpdatesUrlEmpty
 from distrib._customizations import Customization
+from distrib._distrib_metadata import DistribMetadata
+from distrib._distrib_metadata import fetch_distrib_metadata
 from distrib._installer_name import InstallerKey
 from distrib._installer_name import InstallerName
 from distrib._installer_name import LINUX_CLIENT
@@ -19,7 +19,6 @@ from distrib._installer_name import WINDOWS_BUNDLE
 from distrib._installer_name import WINDOWS_CLIENT
 from distrib._installer_name import WINDOWS_SERVER
 from distrib._installer_set import InstallerSet
-from distrib._link_parser import parse_links
 from distrib._specific_features import SpecificFeatures
 from distrib._url_packer import compress_url
 from distrib._version import Version
@@ -245,60 +244,22 @@ class _RawDistrib:
 
 class Distrib(_RawDistrib):
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, metadata: Optional[DistribMetadata] = None):
         url = url.rstrip('/')
-        try:
-            distrib_files = _list(url)
-        except URLError as e:
-            raise RuntimeError(
-                "Installers not found or inaccessible, "
-                "use new installers as old builds are periodically deleted, "
-                "check credentials, access rights and domain name: "
-                f"{e}")
+        if metadata is None:
+            metadata = fetch_distrib_metadata(url)
         super().__init__(
             url,
-            distrib_files,
-            _read_or_empty(url + '/build_info.txt'),
-            _read_or_empty(url + '/ci_info.txt'),
-            _read_or_empty(url + '/specific_features.txt'),
+            metadata.file_names(),
+            metadata.content('build_info.txt'),
+            metadata.content('ci_info.txt'),
+            metadata.content('specific_features.txt'),
             )
 
     def __repr__(self):
         return f'{self.__class__.__name__}({self._url!r})'
 
 
-def _read_or_empty(url: str) -> bytes:
-    try:
-        response = urlopen(url, timeout=10)
-    except HTTPError as e:
-        if e.code != 404:
-            raise
-        result = b''
-    else:
-        result = response.read()
-    return result
-
-
-def _list(url: str) -> Collection[str]:
-    response = urlopen(url, timeout=10)
-    all_links = parse_links(response.url, response)
-    names = []
-    for link in all_links:
-        if not link.startswith(url):
-            _logger.debug("Skip: Not within root URL: %s", link)
-            continue
-        if link.endswith('/'):
-            _logger.debug("Skip: Not a file URL: %s", link)
-            continue
-        path = link[len(url):].lstrip('/')
-        if '/' in path:
-            _logger.debug("Skip: In a subdir: %s", link)
-            continue
-        _logger.debug("Take: File %s from: %s", path, link)
-        names.append(path)
-    return names
-
-
 class OSNotSupported(Exception):
     pass
 
@@ -0,0 +1,177 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import base64
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Collection
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from urllib.error import HTTPError
+from urllib.error import URLError
+from urllib.request import Request
+from urllib.request import urlopen
+
+from distrib._link_parser import parse_links
+
+_logger = logging.getLogger(__name__)
+
+_metadata_file_names = ['build_info.txt', 'ci_info.txt', 'specific_features.txt']
+
+
+class _Validators(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class _Resource(NamedTuple):
+    content: bytes
+    validators: _Validators
+
+
+class _Listing(NamedTuple):
+    file_names: Collection[str]
+    validators: _Validators
+
+
+class DistribMetadata:
+    """Directory listing and metadata files of a distrib dir.
+
+    Files, which are not found, are empty. ETag and Last-Modified of every
+    resource are kept to make conditional requests when it's fetched again.
+    """
+
+    def __init__(self, url: str, listing: _Listing, files: Mapping[str, _Resource], validated_at: float):
+        self.url = url
+        self._listing = listing
+        self._files = files
+        self.validated_at = validated_at
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.url}>'
+
+    def file_names(self) -> Collection[str]:
+        return self._listing.file_names
+
+    def content(self, name: str) -> bytes:
+        return self._files[name].content
+
+    def age_sec(self) -> float:
+        return time.time() - self.validated_at
+
+    def serialize(self) -> bytes:
+        return json.dumps({
+            'url': self.url,
+            'validated_at': self.validated_at,
+            'listing': {
+                'file_names': [*self._listing.file_names],
+                'validators': self._listing.validators._asdict(),
+                },
+            'files': {
+                name: {
+                    'content': base64.b64encode(resource.content).decode('ascii'),
+                    'validators': resource.validators._asdict(),
+                    }
+                for name, resource in self._files.items()
+                },
+            }).encode()
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> 'DistribMetadata':
+        raw = json.loads(data)
+        listing = _Listing(raw['listing']['file_names'], _Validators(**raw['listing']['validators']))
+        files = {
+            name: _Resource(base64.b64decode(raw_file['content']), _Validators(**raw_file['validators']))
+            for name, raw_file in raw['files'].items()
+            }
+        return cls(raw['url'], listing, files, raw['validated_at'])
+
+
+def fetch_distrib_metadata(url: str, cached: Optional[DistribMetadata] = None) -> DistribMetadata:
+    """Fetch the listing and the metadata files concurrently.
+
+    If cached metadata is given, the requests are conditional: resources,
+    which are not modified, are taken from the cache. If the distrib dir
+    is not accessible, RuntimeError with a hint for a user is raised.
+    """
+    url = url.rstrip('/')
+    validated_at = time.time()
+    with ThreadPoolExecutor(max_workers=1 + len(_metadata_file_names)) as executor:
+        listing_future = executor.submit(_fetch_listing, url, cached._listing if cached is not None else None)
+        file_futures = {
+            name: executor.submit(_fetch_file, url + '/' + name, cached._files.get(name) if cached is not None else None)
+            for name in _metadata_file_names
+            }
+        try:
+            listing = listing_future.result()
+            files = {name: future.result() for name, future in file_futures.items()}
+        except URLError as e:
+            raise RuntimeError(
+                "Installers not found or inaccessible, "
+                "use new installers as old builds are periodically deleted, "
+                "check credentials, access rights and domain name: "
+                f"{e}")
+    return DistribMetadata(url, listing, files, validated_at)
+
+
+def _fetch_listing(url: str, cached: Optional[_Listing]) -> _Listing:
+    request = _make_conditional_request(url, cached.validators if cached is not None else None)
+    try:
+        response = urlopen(request, timeout=10)
+    except HTTPError as e:
+        if e.code == 304 and cached is not None:
+            _logger.debug("Not modified: %s", url)
+            return cached
+        raise
+    with response:
+        validators = _get_validators(response)
+        return _Listing(_parse_file_names(url, response), validators)
+
+
+def _fetch_file(url: str, cached: Optional[_Resource]) -> _Resource:
+    request = _make_conditional_request(url, cached.validators if cached is not None else None)
+    try:
+        response = urlopen(request, timeout=10)
+    except HTTPError as e:
+        if e.code == 304 and cached is not None:
+            _logger.debug("Not modified: %s", url)
+            return cached
+        if e.code != 404:
+            raise
+        return _Resource(b'', _Validators(None, None))
+    with response:
+        return _Resource(response.read(), _get_validators(response))
+
+
+def _make_conditional_request(url: str, validators: Optional[_Validators]) -> Request:
+    request = Request(url)
+    if validators is not None:
+        if validators.etag is not None:
+            request.add_header('If-None-Match', validators.etag)
+        if validators.last_modified is not None:
+            request.add_header('If-Modified-Since', validators.last_modified)
+    return request
+
+
+def _get_validators(response) -> _Validators:
+    return _Validators(response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+
+def _parse_file_names(url: str, response) -> Collection[str]:
+    all_links = parse_links(response.url, response)
+    names = []
+    for link in all_links:
+        if not link.startswith(url):
+            _logger.debug("Skip: Not within root URL: %s", link)
+            continue
+        if link.endswith('/'):
+            _logger.debug("Skip: Not a file URL: %s", link)
+            continue
+        path = link[len(url):].lstrip('/')
+        if '/' in path:
+            _logger.debug("Skip: In a subdir: %s", link)
+            continue
+        _logger.debug("Take: File %s from: %s", path, link)
+        names.append(path)
+    return names
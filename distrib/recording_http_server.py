@@ -0,0 +1,39 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+from functools import partial
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Thread
+from typing import List
+from typing import Tuple
+
+
+class RecordingHTTPServer(ThreadingHTTPServer):
+    """Serve a local directory in a thread, record response statuses.
+
+    Used in tests to check which files are requested and which of them
+    are not modified.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__(('127.0.0.1', 0), partial(_RecordingHandler, directory=directory))
+        self.responses: List[Tuple[str, int]] = []
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, path: str) -> str:
+        [address, port] = self.server_address
+        return f'http://{address}:{port}{path}'
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+class _RecordingHandler(SimpleHTTPRequestHandler):
+
+    def log_request(self, code='-', size='-'):
+        self.server.responses.append((self.path, int(code)))
+
+    def log_message(self, format, *args):
+        pass
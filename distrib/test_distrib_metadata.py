@@ -0,0 +1,63 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from distrib._distrib_metadata import DistribMetadata
+from distrib._distrib_metadata import fetch_distrib_metadata
+from distrib.recording_http_server import RecordingHTTPServer
+
+
+class DistribMetadataTest(unittest.TestCase):
+
+    def setUp(self):
+        self._root = TemporaryDirectory()
+        self._distrib_dir = Path(self._root.name, 'distrib')
+        self._distrib_dir.mkdir()
+        self._distrib_dir.joinpath('build_info.txt').write_text('version=6.1.0.1\n')
+        self._distrib_dir.joinpath('specific_features.txt').write_text('supports_ubuntu22=1\n')
+        self._distrib_dir.joinpath('nxwitness-server-6.1.0.1-linux_x64.deb').write_bytes(b'')
+        self._distrib_dir.joinpath('subdir').mkdir()
+        self._server = RecordingHTTPServer(self._root.name)
+        self.addCleanup(self._server.close)
+        self._url = self._server.url('/distrib')
+
+    def tearDown(self):
+        self._root.cleanup()
+
+    def test_fetch(self):
+        metadata = fetch_distrib_metadata(self._url + '/')
+        self.assertEqual(metadata.url, self._url)
+        self.assertEqual(
+            sorted(metadata.file_names()),
+            ['build_info.txt', 'nxwitness-server-6.1.0.1-linux_x64.deb', 'specific_features.txt'])
+        self.assertEqual(metadata.content('build_info.txt'), b'version=6.1.0.1\n')
+        self.assertEqual(metadata.content('ci_info.txt'), b'')
+
+    def test_serialize(self):
+        metadata = fetch_distrib_metadata(self._url)
+        restored = DistribMetadata.deserialize(metadata.serialize())
+        self.assertEqual(restored.url, metadata.url)
+        self.assertEqual(restored.validated_at, metadata.validated_at)
+        self.assertEqual(sorted(restored.file_names()), sorted(metadata.file_names()))
+        for name in 'build_info.txt', 'ci_info.txt', 'specific_features.txt':
+            self.assertEqual(restored.content(name), metadata.content(name))
+
+    def test_conditional_refetch(self):
+        cached = DistribMetadata.deserialize(fetch_distrib_metadata(self._url).serialize())
+        changed_file = self._distrib_dir.joinpath('specific_features.txt')
+        changed_file.write_text('supports_ubuntu24=1\n')
+        # Last-Modified has the precision of a second.
+        os.utime(changed_file, (changed_file.stat().st_atime, changed_file.stat().st_mtime + 10))
+        self._server.responses.clear()
+        metadata = fetch_distrib_metadata(self._url, cached)
+        statuses = dict(self._server.responses)
+        self.assertEqual(statuses['/distrib/build_info.txt'], 304)
+        self.assertEqual(statuses['/distrib/specific_features.txt'], 200)
+        self.assertEqual(metadata.content('build_info.txt'), b'version=6.1.0.1\n')
+        self.assertEqual(metadata.content('specific_features.txt'), b'supports_ubuntu24=1\n')
+
+    def test_not_found(self):
+        with self.assertRaisesRegex(RuntimeError, "Installers not found or inaccessible"):
+            fetch_distrib_metadata(self._url + '-missing')
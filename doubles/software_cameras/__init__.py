@@ -7,6 +7,8 @@ from doubles.software_cameras._motion_jpeg import JPEGSequence
 from doubles.software_cameras._motion_jpeg import MotionJpegStream
 from doubles.software_cameras._motion_jpeg import mjpeg_fps
 from doubles.software_cameras._multi_part_jpeg import MultiPartJpegCameraServer
+from doubles.software_cameras._multi_process import find_free_port
+from doubles.software_cameras._multi_process import serve_in_processes
 from doubles.software_cameras._rtsp import H264RtspCameraServer
 from doubles.software_cameras._rtsp import MjpegRtspCameraServer
 
@@ -21,5 +23,7 @@ __all__ = [
     'MotionJpegStream',
     'MultiPartJpegCameraServer',
     'data_is_jpeg_image',
+    'find_free_port',
     'mjpeg_fps',
+    'serve_in_processes',
     ]
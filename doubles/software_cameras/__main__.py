@@ -6,6 +6,7 @@ from pathlib import Path
 from doubles.software_cameras import H264RtspCameraServer
 from doubles.software_cameras import MjpegRtspCameraServer
 from doubles.software_cameras import MultiPartJpegCameraServer
+from doubles.software_cameras import serve_in_processes
 
 server_classes = {
     'http_mjpeg': MultiPartJpegCameraServer,
@@ -41,6 +42,10 @@ arg_parser.add_argument(
     '--h264-file',
     type=Path,
     help="H264-coded video file to stream")
+arg_parser.add_argument(
+    '--processes',
+    type=int, default=1,
+    help="Serve the port from several processes (Linux only); default: %(default)s")
 
 if __name__ == '__main__':
     args = arg_parser.parse_args()
@@ -57,8 +62,11 @@ if __name__ == '__main__':
     logging.basicConfig(level=args.logging_level)
     logging.info("Press Ctrl+C to exit")
     try:
-        with server_classes[args.type](**server_args) as server:
-            server.serve()
+        if args.processes > 1:
+            serve_in_processes(server_classes[args.type], server_args, args.processes)
+        else:
+            with server_classes[args.type](**server_args) as server:
+                server.serve()
     except KeyboardInterrupt:
         logging.info("Exit: Ctrl+C pressed")
         exit()
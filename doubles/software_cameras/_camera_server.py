@@ -1,4 +1,5 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import heapq
 import logging
 import socket
 import threading
@@ -6,11 +7,15 @@ import time
 from abc import ABCMeta
 from abc import abstractmethod
 from base64 import b64encode
+from collections import deque
 from concurrent.futures.thread import ThreadPoolExecutor
 from contextlib import contextmanager
 from itertools import chain
+from itertools import count
 from selectors import DefaultSelector
 from selectors import EVENT_READ
+from selectors import EVENT_WRITE
+from typing import Deque
 from typing import List
 from typing import Literal
 from typing import Optional
@@ -23,6 +28,7 @@ from doubles.software_cameras._jpeg import JpegImage
 _logger = logging.getLogger(__name__)
 
 rate_hz = 90000  # Ticks per second.
+_lateness_samples_limit = 100000
 
 
 class PeerDisconnected(Exception):
@@ -58,6 +64,10 @@ class Connection(metaclass=ABCMeta):
         self.password = password
         self.realm = "DoesNotMatter"
         self._frame_was_sent = False
+        # Encapsulated frames are sent straight from the buffers they are
+        # made of. A frame which doesn't fit into the socket buffer stays
+        # here until the socket is writable again.
+        self._outbound: Deque[memoryview] = deque()
         self._pts_ticks: int  # Initialized later
         self.sent_frames: List[bytes]  # Initialized later
         self.path: str  # Initialized later
@@ -86,6 +96,9 @@ class Connection(metaclass=ABCMeta):
     def fileno(self):
         return self._sock.fileno()
 
+    def is_closed(self):
+        return self._sock.fileno() == -1
+
     def _read_request_line(self):
         try:
             headline = self._file.readline(200)
@@ -174,7 +187,7 @@ class Connection(metaclass=ABCMeta):
         self.sent_frames = []
 
     @abstractmethod
-    def _encapsulate_frame(self, encoded_frame: bytes, pts_ms: int) -> bytes:
+    def _encapsulate_frame(self, encoded_frame: bytes, pts_ms: int) -> Sequence[bytes]:
         pass
 
     @abstractmethod
@@ -189,20 +202,38 @@ class Connection(metaclass=ABCMeta):
     def _try_increase_pts(self):
         pass
 
+    def next_frame_at_ticks(self) -> int:
+        return self._pts_ticks
+
+    def has_pending_output(self):
+        return bool(self._outbound)
+
     def stream(self) -> Literal['disconnect', 'continue']:
-        if not self._ready_to_send_frame():
-            self._frame_was_sent = False
-            return 'continue'
-        self._try_increase_pts()
-        pts_ms = self._pts_ticks * 1000 // rate_hz
-        encoded_frame = self._get_next_frame()
-        encapsulated_frame = self._encapsulate_frame(encoded_frame, pts_ms)
-        _logger.debug(
-            "%r: Send frame, PTS %d ms, size %d B",
-            self, pts_ms, len(encapsulated_frame))
+        # Service data and fragments are sent back to back within one call;
+        # the call ends once the next frame isn't due yet or the socket
+        # buffer is full.
+        while not self._outbound:
+            if not self._ready_to_send_frame():
+                self._frame_was_sent = False
+                return 'continue'
+            self._try_increase_pts()
+            pts_ms = self._pts_ticks * 1000 // rate_hz
+            encoded_frame = self._get_next_frame()
+            buffers = self._encapsulate_frame(encoded_frame, pts_ms)
+            _logger.debug(
+                "%r: Send frame, PTS %d ms, size %d B",
+                self, pts_ms, sum(len(buffer) for buffer in buffers))
+            self._outbound.extend(memoryview(buffer) for buffer in buffers)
+            self._save_current_frame()
+            self._frame_was_sent = True
+            if self.send_pending() == 'disconnect':
+                return 'disconnect'
+        return 'continue'
+
+    def send_pending(self) -> Literal['disconnect', 'continue']:
         try:
-            self._file.write(encapsulated_frame)
-            self._file.flush()
+            while self._outbound:
+                self._discard_sent(_send_buffers(self._sock, self._outbound))
         except (
                 ConnectionResetError,
                 ConnectionAbortedError,  # Seen only on Windows.
@@ -215,29 +246,45 @@ class Connection(metaclass=ABCMeta):
             self.close()
             return 'disconnect'
         except BlockingIOError:
-            _logger.warning("%r: Outbound buffer is overloaded; Wait for clearing", self)
-            self._frame_was_sent = False
-            return 'continue'
-        self._save_current_frame()
-        self._frame_was_sent = True
+            _logger.debug("%r: Outbound buffer is full; Wait until writable", self)
         return 'continue'
 
+    def _discard_sent(self, sent_bytes):
+        while sent_bytes > 0:
+            head = self._outbound[0]
+            if sent_bytes < len(head):
+                self._outbound[0] = head[sent_bytes:]
+                return
+            sent_bytes -= len(head)
+            self._outbound.popleft()
+
     def get_streamed_seconds(self):
         return len(self.sent_frames) / self._video_stream.fps
 
 
+def _send_buffers(sock: socket.socket, buffers: Deque[memoryview]) -> int:
+    if hasattr(sock, 'sendmsg'):
+        return sock.sendmsg(buffers)
+    # There is no sendmsg() on Windows.
+    return sock.send(buffers[0])
+
+
 class CameraServer(metaclass=ABCMeta):
 
     protocol: str
     codec: str
 
-    def __init__(self, address='0.0.0.0', port=0, user=None, password=None):
+    def __init__(self, address='0.0.0.0', port=0, user=None, password=None, reuse_port=False):
         self._user = user
         self._password = password
         self._server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         # .accept() is used with select/poll and never blocks.
         self._server_sock.setblocking(False)
         self._server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            # Several processes listen on the same port, Linux spreads
+            # incoming connections between them.
+            self._server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self._server_sock.bind((address, port))
         self._server_sock.listen(100)
         [self._host, self.port] = self._server_sock.getsockname()
@@ -245,6 +292,13 @@ class CameraServer(metaclass=ABCMeta):
         self._poll.register(self._server_sock, EVENT_READ)
         self._stream_to: List[Connection] = []
         self._disconnected_clients: List[Connection] = []
+        # Streaming connections, which can take the next frame, ordered by
+        # its deadline. Cameras of the same FPS share the deadlines, so they
+        # are served in one wakeup. A connection waiting for its socket to
+        # become writable is not here.
+        self._frame_schedule: List[Tuple[int, int, Connection]] = []
+        self._schedule_order = count()
+        self._frame_lateness_sec: Deque[float] = deque(maxlen=_lateness_samples_limit)
         self._stop_event = threading.Event()
         _logger.info("Start camera server at %s:%d", self._host, self.port)
 
@@ -264,6 +318,7 @@ class CameraServer(metaclass=ABCMeta):
             self._disconnected_clients.append(sock)
             if time.monotonic() - started_at > 30:
                 raise RuntimeError("Couldn't close all sockets after timeout")
+        self._frame_schedule.clear()
         _logger.info("Unregister file objects")
         for selector_key in list(self._poll.get_map().values()):
             if selector_key.fileobj is self._server_sock:
@@ -296,6 +351,13 @@ class CameraServer(metaclass=ABCMeta):
                 seconds[client.path] += client.get_streamed_seconds()
         return [seconds[path] for path in path_list]
 
+    def get_frame_lateness_sec(self) -> Sequence[float]:
+        """Get how late frames were sent relative to their deadlines.
+
+        Only the most recent samples are kept.
+        """
+        return list(self._frame_lateness_sec)
+
     @abstractmethod
     def _get_connection(self, new_sock: socket.socket, addr: Tuple[str, int]) -> Connection:
         pass
@@ -322,11 +384,57 @@ class CameraServer(metaclass=ABCMeta):
             if connection not in self._stream_to:
                 _logger.debug("%r: Start streaming", connection)
                 self._stream_to.append(connection)
+                self._schedule_frame(connection)
             else:
                 _logger.debug("%r: Stream already requested", connection)
         else:
             _logger.debug("%r: Continue handling", connection)
 
+    def _schedule_frame(self, connection: Connection):
+        heapq.heappush(
+            self._frame_schedule,
+            (connection.next_frame_at_ticks(), next(self._schedule_order), connection))
+
+    def _sec_to_next_frame(self):
+        if not self._frame_schedule:
+            # All streaming connections wait for their sockets to become writable.
+            return 1
+        [next_frame_at_ticks, _, _] = self._frame_schedule[0]
+        sec_to_next_frame = (next_frame_at_ticks - time.monotonic() * rate_hz) / rate_hz
+        return min(max(sec_to_next_frame, 0), 1)
+
+    def _stop_streaming(self, connection: Connection):
+        self._poll.unregister(connection)
+        self._stream_to.remove(connection)
+        self._disconnected_clients.append(connection)
+
+    def _continue_streaming(self, connection: Connection):
+        if connection.has_pending_output():
+            # Requests are not read until the frame is sent completely:
+            # responses must not get into the middle of it.
+            self._poll.modify(connection, EVENT_WRITE)
+        else:
+            self._schedule_frame(connection)
+
+    def _stream_due_frames(self):
+        now_ticks = int(time.monotonic() * rate_hz)
+        while self._frame_schedule and self._frame_schedule[0][0] <= now_ticks:
+            [frame_at_ticks, _, connection] = heapq.heappop(self._frame_schedule)
+            if connection.is_closed():
+                continue
+            self._frame_lateness_sec.append(time.monotonic() - frame_at_ticks / rate_hz)
+            if connection.stream() == 'disconnect':
+                self._stop_streaming(connection)
+            else:
+                self._continue_streaming(connection)
+
+    def _send_pending(self, connection: Connection):
+        if connection.send_pending() == 'disconnect':
+            self._stop_streaming(connection)
+        elif not connection.has_pending_output():
+            self._poll.modify(connection, EVENT_READ)
+            self._schedule_frame(connection)
+
     def serve(self, time_limit_sec=float('inf'), break_on_silence_sec=float('inf')):
         # TODO: Limit time without a connection (idle time).
         if time_limit_sec == float('inf'):
@@ -337,7 +445,7 @@ class CameraServer(metaclass=ABCMeta):
         started_at = time.monotonic()
         while True:  # At least one iteration should occur.
             if self._stream_to:
-                selector_result = self._poll.select(0.001)
+                selector_result = self._poll.select(self._sec_to_next_frame())
             else:
                 # If nothing is happening, don't poll/select frequently
                 # and limit how often it's reported that nothing is happening.
@@ -353,20 +461,18 @@ class CameraServer(metaclass=ABCMeta):
                     _logger.info(
                         "No streaming, no incoming requests for %.1f sec",
                         time.monotonic() - silence_since)
-            for [selector_key, _] in selector_result:
+            for [selector_key, events] in selector_result:
                 if selector_key.fileobj is self._server_sock:
                     self._accept_new_connection()
-                    continue
-                self._handle_connection(selector_key.fileobj)
-            for connection in self._stream_to:
-                transition = connection.stream()
-                if transition == 'disconnect':
-                    self._poll.unregister(connection)
-                    self._stream_to.remove(connection)
-                    self._disconnected_clients.append(connection)
+                elif events & EVENT_WRITE:
+                    self._send_pending(selector_key.fileobj)
+                else:
+                    self._handle_connection(selector_key.fileobj)
+            # Select may wake up a bit after the time limit; no frames are sent then.
             if time.monotonic() - started_at > time_limit_sec:
                 _logger.info("Break: time limit exceeded")
                 return
+            self._stream_due_frames()
             if self._stop_event.is_set():
                 return
 
@@ -1,7 +1,12 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import logging
+import mmap
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
 from typing import NamedTuple
+from typing import Sequence
+from typing import Union
 
 _logger = logging.getLogger(__name__)
 
@@ -14,7 +19,7 @@ class _NalUnitType:
 
 
 class _NalUnit(NamedTuple):
-    raw: bytes
+    raw: Union[bytes, memoryview]
     nri: int
     type: int
     is_fragment: bool = False
@@ -24,18 +29,6 @@ class _NalUnit(NamedTuple):
     requires_rtp_marker: bool = False
 
 
-def _find_delimiter(data: bytes):
-    nal_unit_delimiter = b'\x00\x00\x01'
-    delimiter_len = len(nal_unit_delimiter)
-    delimiter_at = data.find(nal_unit_delimiter)
-    if delimiter_at == -1:
-        return None, None
-    if data[delimiter_at - 1] == 0:  # NAL delimiter can be '00 00 00 01'
-        delimiter_at -= 1
-        delimiter_len += 1
-    return delimiter_at, delimiter_len
-
-
 def _make_nal_unit(data):
     type_ = (data[0] & 0b00011111)
     return _NalUnit(
@@ -74,6 +67,43 @@ def _fragment_nal_unit(nal_unit: _NalUnit, size_bytes):
     return fu_list
 
 
+def _split_nal_units(data: mmap.mmap) -> Iterator[memoryview]:
+    view = memoryview(data)
+    start = 4  # Skip \x00\x00\x00\x01
+    while True:
+        delimiter_at = data.find(b'\x00\x00\x01', start)
+        if delimiter_at == -1:
+            yield view[start:]
+            return
+        if data[delimiter_at - 1] == 0:  # NAL delimiter can be '00 00 00 01'
+            yield view[start:delimiter_at - 1]
+        else:
+            yield view[start:delimiter_at]
+        start = delimiter_at + 3
+
+
+@lru_cache(maxsize=16)
+def _load_nal_units(file_path: Path, _mtime_ns: int, _size: int) -> Sequence[_NalUnit]:
+    # The file is mapped and split once, all connections streaming it share
+    # the result. Unfragmented NAL units are views of the mapped file,
+    # so the memory is shared by the processes serving the same file too.
+    max_bytes = 10000  # Higher frame size for fewer fragmentation and better performance
+    with open(file_path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:4] != b'\x00\x00\x00\x01':
+        data.close()
+        raise RuntimeError("H264 coded video file must start with '00 00 00 01'")
+    nal_units = []
+    for raw in _split_nal_units(data):
+        nal_unit = _make_nal_unit(raw)
+        if len(nal_unit.raw) > max_bytes:
+            nal_units.extend(_fragment_nal_unit(nal_unit, max_bytes))
+        else:
+            nal_units.append(nal_unit)
+    _logger.info("%s: %d NAL units and fragments indexed", file_path, len(nal_units))
+    return nal_units
+
+
 class H264Stream:
 
     payload_type = 96
@@ -81,58 +111,16 @@ class H264Stream:
 
     def __init__(self, file_path: Path, fps: int):
         self._file_path = file_path
-        self._file = open(self._file_path, 'rb')
-        if self._file.read(4) != b'\x00\x00\x00\x01':
-            raise RuntimeError("H264 coded video file must start with '00 00 00 01'")
-        self._nal_units = self._get_nal_units()
+        stat = file_path.stat()
+        self._nal_units = _load_nal_units(file_path.resolve(), stat.st_mtime_ns, stat.st_size)
+        self._next_index = 0
         self.fps = fps
 
     def close(self):
-        self._file.close()
-
-    def _get_unfragmented_nal_units(self):
-        to_read_bytes = 5000
-        buffer = self._file.read(to_read_bytes)
-        while True:
-            [delimiter_at, delimiter_len] = _find_delimiter(buffer)
-            if delimiter_at is not None:
-                nal_unit = _make_nal_unit(buffer[:delimiter_at])
-                buffer = buffer[delimiter_at + delimiter_len:]
-                yield nal_unit
-                continue
-            bytes_read = self._file.read(to_read_bytes)
-            if not bytes_read:
-                if buffer:
-                    nal_unit = _make_nal_unit(buffer[:delimiter_at])
-                    buffer = b''
-                    yield nal_unit
-                else:
-                    return None
-            buffer += bytes_read
-
-    def _get_nal_units(self):
-        max_bytes = 10000  # Higher frame size for fewer fragmentation and better performance
-        fu_list = []
-        unfragmented_nal_units = self._get_unfragmented_nal_units()
-        while True:
-            try:
-                yield fu_list.pop(0)
-            except IndexError:
-                try:
-                    unfragmented_nal_unit = next(unfragmented_nal_units)
-                except StopIteration:
-                    return None
-                if len(unfragmented_nal_unit.raw) > max_bytes:
-                    fu_list = _fragment_nal_unit(unfragmented_nal_unit, max_bytes)
-                    yield fu_list.pop(0)
-                else:
-                    yield unfragmented_nal_unit
+        # NAL units are shared with other streams of the same file.
+        pass
 
     def get_next_frame(self):
-        try:
-            nal_unit = next(self._nal_units)
-        except StopIteration:
-            self._file.seek(4)  # Skip \x00\x00\x00\x01
-            self._nal_units = self._get_nal_units()
-            nal_unit = next(self._nal_units)
+        nal_unit = self._nal_units[self._next_index]
+        self._next_index = (self._next_index + 1) % len(self._nal_units)
         return nal_unit
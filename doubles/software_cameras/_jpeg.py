@@ -1,12 +1,17 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import hashlib
 import io
 import logging
 import struct
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import as_completed
+from functools import lru_cache
+from typing import List
 from typing import NamedTuple
+from typing import Optional
 from typing import Tuple
+from typing import Union
 
 from PIL import Image
 from PIL import ImageDraw
@@ -86,6 +91,13 @@ class FrameSize(NamedTuple):
     height: int
 
 
+class _Segments(NamedTuple):
+    fields: List[Tuple[bytes, memoryview]]
+    scan: memoryview
+    frame_size: FrameSize
+    quantization_tables: bytes
+
+
 class JpegImage:
 
     _start_of_image = b'\xff\xd8'
@@ -96,21 +108,36 @@ class JpegImage:
     _start_of_scan = b'\xff\xda'
     _end_of_image = b'\xff\xd9'
 
-    def __init__(self, raw: bytes):
+    def __init__(self, raw: Union[bytes, memoryview]):
         # See: https://www.ccoderun.ca/programming/2017-01-31_jpeg/
-        buffer = io.BytesIO(raw)
-        self.raw: bytes = raw
-        if buffer.read(2) != self._start_of_image:
+        # Segments are parsed on first access; they are views of the raw data.
+        # A memoryview is kept as is and copied only if the raw bytes are read.
+        self._view = memoryview(raw)
+        self._raw: Optional[bytes] = raw if isinstance(raw, bytes) else None
+        if self._view[:2] != self._start_of_image:
             raise _CorruptedFile("This is not a JPEG image")
-        self._fields = []
+        self._segments: Optional[_Segments] = None
+        self._digest: Optional[bytes] = None
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            self._raw = bytes(self._view)
+        return self._raw
+
+    def _parse_segments(self) -> '_Segments':
+        view = self._view
+        fields = []
         frame_size = None
+        offset = len(self._start_of_image)
         while True:
-            marker = buffer.read(2)
+            marker = bytes(view[offset:offset + 2])
             if not marker.startswith(b'\xff'):
                 raise _CorruptedFile(
                     f"Corrupted image file; marker must start with '\\xff'; marker: {marker}")
-            [length] = struct.unpack('>H', buffer.read(2))
-            value = buffer.read(length - 2)
+            [length] = struct.unpack_from('>H', view, offset + 2)
+            value = view[offset + 4:offset + 2 + length]
+            offset += 2 + length
             if marker == self._app0:
                 # APP0 header can be absent if the image was extracted from the RTSP stream.
                 # It doesn't affect the ability to view this image, so it can be omitted.
@@ -119,30 +146,63 @@ class JpegImage:
                 height, width = struct.unpack_from('>HH', value, offset=1)
                 frame_size = FrameSize(width, height)
                 continue
-            self._fields.append((marker, value))
+            fields.append((marker, value))
             if marker == self._start_of_scan:
-                scan_with_end_of_image = buffer.read()
-                self.scan = scan_with_end_of_image[:-2]
-                end_of_image = scan_with_end_of_image[-2:]
-                if end_of_image != self._end_of_image:
+                if view[-2:] != self._end_of_image:
                     raise _CorruptedFile(
                         f"Corrupted image file; image must end with {self._end_of_image!r}")
+                scan = view[offset:-2]
                 break
         if frame_size is None:
             raise RuntimeError("Can't find JPEG Start of Frame tag")
-        self.frame_size = frame_size
-        self.quantization_tables = b''
-        for marker, value in self._fields:
-            if marker == self._define_quantization_table:
-                self.quantization_tables += value[1:]
+        quantization_tables = b''.join(
+            value[1:]
+            for marker, value in fields
+            if marker == self._define_quantization_table)
+        return _Segments(fields, scan, frame_size, quantization_tables)
+
+    def _get_segments(self) -> '_Segments':
+        if self._segments is None:
+            self._segments = self._parse_segments()
+        return self._segments
+
+    @property
+    def scan(self) -> memoryview:
+        return self._get_segments().scan
+
+    @property
+    def frame_size(self) -> FrameSize:
+        return self._get_segments().frame_size
+
+    @property
+    def quantization_tables(self) -> bytes:
+        return self._get_segments().quantization_tables
+
+    def digest(self) -> bytes:
+        """Hash the content which makes images equal.
+
+        APP0 and SOF segments are not included, as they are not compared.
+        """
+        if self._digest is None:
+            content_hash = hashlib.sha256()
+            segments = self._get_segments()
+            for marker, value in segments.fields:
+                content_hash.update(marker + struct.pack('>H', len(value)))
+                content_hash.update(value)
+            content_hash.update(segments.scan)
+            self._digest = content_hash.digest()
+        return self._digest
 
     def __len__(self):
-        return len(self.raw)
+        return self._view.nbytes
 
     def __eq__(self, other):
         if not isinstance(other, JpegImage):
             return NotImplemented
-        return self._fields == other._fields and self.scan == other.scan
+        return self.digest() == other.digest()
+
+    def __hash__(self):
+        return hash(self.digest())
 
     def __repr__(self):
         return f"<{self.__class__.__name__}, size: {len(self)} bytes>"
@@ -196,9 +256,19 @@ class JpegImage:
         sos_header += spectral_selection_start + spectral_selection_end + approximate_bit_positions
         return sos_header
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _make_huffman_tables_and_sos_header(cls):
+        return b''.join([
+            cls._make_huffman_table(lum_dc_codelens, lum_dc_symbols, b'\x00'),
+            cls._make_huffman_table(lum_ac_codelens, lum_ac_symbols, b'\x10'),
+            cls._make_huffman_table(chm_dc_codelens, chm_dc_symbols, b'\x01'),
+            cls._make_huffman_table(chm_ac_codelens, chm_ac_symbols, b'\x11'),
+            cls._make_sos_header(),
+            ])
+
     @classmethod
     def from_data(cls, quantization_tables, width, height, scan):
-        raw = cls._start_of_image
         # The only type of quantization tables data supported is: two 64-byte
         # quantization tables, one for the luminance component and one for the
         # chrominance component.
@@ -207,21 +277,21 @@ class JpegImage:
         quantization_table_length = 64
         luminance_table = quantization_tables[:quantization_table_length]
         chrominance_table = quantization_tables[quantization_table_length:]
-        raw += cls._make_quantization_table(luminance_table, b'\x00')
-        raw += cls._make_quantization_table(chrominance_table, b'\x01')
-        raw += cls._make_sof_header(height, width)
-        raw += cls._make_huffman_table(lum_dc_codelens, lum_dc_symbols, b'\x00')
-        raw += cls._make_huffman_table(lum_ac_codelens, lum_ac_symbols, b'\x10')
-        raw += cls._make_huffman_table(chm_dc_codelens, chm_dc_symbols, b'\x01')
-        raw += cls._make_huffman_table(chm_ac_codelens, chm_ac_symbols, b'\x11')
-        raw += cls._make_sos_header()
-        raw += scan + cls._end_of_image
-        return cls(raw)
+        return cls(b''.join([
+            cls._start_of_image,
+            cls._make_quantization_table(luminance_table, b'\x00'),
+            cls._make_quantization_table(chrominance_table, b'\x01'),
+            cls._make_sof_header(height, width),
+            # Huffman tables are the same for all images.
+            cls._make_huffman_tables_and_sos_header(),
+            scan,
+            cls._end_of_image,
+            ]))
 
 
 def data_is_jpeg_image(data):
     try:
-        JpegImage(data)
+        JpegImage(data).digest()
     except _CorruptedFile:
         return False
     else:
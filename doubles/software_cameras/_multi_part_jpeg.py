@@ -4,6 +4,7 @@ import os
 import socket
 from typing import Literal
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from urllib.request import Request
 
@@ -118,7 +119,7 @@ class _MultiPartJpegConnection(Connection):
     def _get_next_frame(self):
         return self._video_stream.get_frame().raw
 
-    def _encapsulate_frame(self, encoded_frame, pts_ms):
+    def _encapsulate_frame(self, encoded_frame, pts_ms) -> Sequence[bytes]:
         # All PTSes seen in traffic captures were multiples of 1000.
         headers = (
             b'Content-Type: image/jpeg\r\n'
@@ -127,14 +128,9 @@ class _MultiPartJpegConnection(Connection):
             b'\r\n'
             % {b'ts': pts_ms, b'length': len(encoded_frame)}
             )
-        encapsulated_frame = (
-            b'--%s\r\n'
-            b'%s'
-            b'%s\r\n'
-            % (_boundary, headers, encoded_frame)
-            )
-        self._adjust_buffer_size(len(encapsulated_frame))
-        return encapsulated_frame
+        part_headers = b'--%s\r\n%s' % (_boundary, headers)
+        self._adjust_buffer_size(len(part_headers) + len(encoded_frame) + 2)
+        return [part_headers, encoded_frame, b'\r\n']
 
     def _save_current_frame(self):
         self.sent_frames.append(self._video_stream.current_frame)
@@ -171,8 +167,9 @@ class MultiPartJpegCameraServer(CameraServer):
             video_source: Optional[JPEGSequence] = None,
             user=None,
             password=None,
+            reuse_port=False,
             ):
-        super().__init__(address, port, user, password)
+        super().__init__(address, port, user, password, reuse_port)
         if video_source is not None:
             self.video_source = video_source
         else:
@@ -0,0 +1,68 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import logging
+import multiprocessing
+import socket
+from typing import Any
+from typing import Mapping
+from typing import Sequence
+from typing import Type
+
+from doubles.software_cameras._camera_server import CameraServer
+
+_logger = logging.getLogger(__name__)
+
+
+def serve_in_processes(
+        server_type: Type[CameraServer],
+        server_kwargs: Mapping[str, Any],
+        process_count: int,
+        time_limit_sec: float = float('inf'),
+        ) -> Sequence[float]:
+    """Serve the same port from several processes.
+
+    The listening sockets are bound with SO_REUSEPORT, Linux spreads
+    incoming connections between them evenly. The current process is one
+    of the serving processes. Frame lateness samples from all of them are
+    returned.
+    """
+    if process_count > 1 and not hasattr(socket, 'SO_REUSEPORT'):
+        raise RuntimeError("Serving from several processes requires SO_REUSEPORT")
+    result_queue = multiprocessing.Queue()
+    with server_type(**{**server_kwargs, 'reuse_port': process_count > 1}) as server:
+        children = []
+        for _ in range(process_count - 1):
+            child = multiprocessing.Process(
+                target=_serve_in_child,
+                args=(server_type, {**server_kwargs, 'port': server.port}, time_limit_sec, result_queue),
+                daemon=True)
+            child.start()
+            children.append(child)
+        _logger.info("Serve port %d from %d processes", server.port, process_count)
+        try:
+            server.serve(time_limit_sec)
+            lateness_sec = list(server.get_frame_lateness_sec())
+            for _ in children:
+                lateness_sec.extend(result_queue.get(timeout=30))
+        finally:
+            for child in children:
+                child.join(timeout=5)
+                if child.is_alive():
+                    child.terminate()
+    return lateness_sec
+
+
+def find_free_port() -> int:
+    """Pick a port for servers, which are started in other processes."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        [_, port] = sock.getsockname()
+        return port
+
+
+def _serve_in_child(server_type, server_kwargs, time_limit_sec, result_queue):
+    with server_type(**{**server_kwargs, 'reuse_port': True}) as server:
+        try:
+            server.serve(time_limit_sec)
+        except KeyboardInterrupt:
+            return
+        result_queue.put(server.get_frame_lateness_sec())
@@ -13,6 +13,7 @@ from abc import abstractmethod
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from typing import Sequence
 
 from doubles.software_cameras._camera_server import CameraServer
 from doubles.software_cameras._camera_server import Connection
@@ -182,11 +183,10 @@ class _RtspConnection(Connection, metaclass=ABCMeta):
     def _get_next_frame(self):
         pass
 
-    def _encapsulate_frame(self, encoded_frame, pts_ms) -> bytes:
+    def _encapsulate_frame(self, encoded_frame, pts_ms) -> Sequence[bytes]:
         rtp_header = self._make_rtp_header(pts_ms)
-        rtp_payload = rtp_header + encoded_frame
-        interleaved_frame = self._rtsp_interleaved_frame(len(rtp_payload))
-        return interleaved_frame + rtp_payload
+        interleaved_frame = self._rtsp_interleaved_frame(len(rtp_header) + len(encoded_frame))
+        return [interleaved_frame + rtp_header, encoded_frame]
 
     @abstractmethod
     def _save_current_frame(self):
@@ -349,8 +349,9 @@ class MjpegRtspCameraServer(CameraServer):
             port=0,
             user=None,
             password=None,
+            reuse_port=False,
             ):
-        super().__init__(address, port, user, password)
+        super().__init__(address, port, user, password, reuse_port)
         if video_source is not None:
             self.video_source = video_source
         else:
@@ -374,8 +375,9 @@ class H264RtspCameraServer(CameraServer):
             port=0,
             user=None,
             password=None,
+            reuse_port=False,
             ):
-        super().__init__(address, port, user, password)
+        super().__init__(address, port, user, password, reuse_port)
         self._source_video_file = source_video_file
         self._fps = fps
 
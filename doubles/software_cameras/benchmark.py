@@ -0,0 +1,187 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+"""Find how many cameras a software camera server streams to without falling behind.
+
+The server runs in separate processes, the clients read and discard
+the streams here. A camera count is sustained if every client stays
+connected and 99% of frames are sent less than one frame period late.
+"""
+import argparse
+import logging
+import multiprocessing
+import socket
+import time
+from pathlib import Path
+from selectors import DefaultSelector
+from selectors import EVENT_READ
+
+from doubles.software_cameras import H264RtspCameraServer
+from doubles.software_cameras import MjpegRtspCameraServer
+from doubles.software_cameras import MultiPartJpegCameraServer
+from doubles.software_cameras import find_free_port
+from doubles.software_cameras import mjpeg_fps
+from doubles.software_cameras import serve_in_processes
+
+_logger = logging.getLogger(__name__)
+
+_server_classes = {
+    'http_mjpeg': MultiPartJpegCameraServer,
+    'rtsp_mjpeg': MjpegRtspCameraServer,
+    'rtsp_h264': H264RtspCameraServer,
+    }
+_connect_budget_sec = 30
+
+
+def _serve(server_type, server_kwargs, process_count, time_limit_sec, result_queue):
+    result_queue.put(serve_in_processes(server_type, server_kwargs, process_count, time_limit_sec))
+
+
+def _rtsp_request(sock, request):
+    sock.sendall(request)
+    response = b''
+    while not response.endswith(b'\r\n\r\n'):
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise RuntimeError(f"Connection closed after {request!r}")
+        response += chunk
+    if not response.startswith(b'RTSP/1.0 200 '):
+        raise RuntimeError(f"Unexpected response to {request!r}: {response!r}")
+
+
+def _connect(stream_type, port, index):
+    sock = socket.create_connection(('127.0.0.1', port), timeout=10)
+    if stream_type == 'http_mjpeg':
+        sock.sendall(b'GET /%d.mjpeg HTTP/1.1\r\n\r\n' % index)
+    else:
+        url = b'rtsp://127.0.0.1:%d/%d' % (port, index)
+        setup_request = (
+                b'SETUP %s RTSP/1.0\r\n'
+                b'CSeq: 1\r\n'
+                b'Transport: RTP/AVP/TCP;unicast;interleaved=0-1\r\n'
+                b'\r\n')
+        _rtsp_request(sock, setup_request % url)
+        # Interleaved frames follow the PLAY response; they are not parsed.
+        sock.sendall(b'PLAY %s RTSP/1.0\r\nCSeq: 2\r\n\r\n' % url)
+    sock.setblocking(False)
+    return sock
+
+
+def _read_streams(sockets, duration_sec):
+    selector = DefaultSelector()
+    for sock in sockets:
+        selector.register(sock, EVENT_READ)
+    buffer = bytearray(1024 * 1024)
+    received_bytes = 0
+    disconnected = 0
+    started_at = time.monotonic()
+    while selector.get_map() and time.monotonic() - started_at < duration_sec:
+        for [key, _] in selector.select(0.1):
+            try:
+                size = key.fileobj.recv_into(buffer)
+            except BlockingIOError:
+                continue
+            except ConnectionError:
+                size = 0
+            if size == 0:
+                selector.unregister(key.fileobj)
+                disconnected += 1
+            received_bytes += size
+    selector.close()
+    return received_bytes, disconnected
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def _run_step(args, server_kwargs, camera_count):
+    port = find_free_port()
+    result_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(
+        target=_serve,
+        args=(
+            _server_classes[args.type],
+            {**server_kwargs, 'port': port},
+            args.processes,
+            _connect_budget_sec + args.duration_sec,
+            result_queue,
+            ))
+    server_process.start()
+    sockets = []
+    try:
+        time.sleep(1)  # Let the server processes start listening.
+        for index in range(camera_count):
+            sockets.append(_connect(args.type, port, index))
+        [received_bytes, disconnected] = _read_streams(sockets, args.duration_sec)
+    finally:
+        for sock in sockets:
+            sock.close()
+    lateness_sec = sorted(result_queue.get(timeout=_connect_budget_sec + args.duration_sec + 30))
+    server_process.join()
+    if not lateness_sec:
+        lateness_sec = [float('inf')]
+    return {
+        'cameras': camera_count,
+        'disconnected': disconnected,
+        'mbit_per_sec': received_bytes * 8 / args.duration_sec / 10**6,
+        'p50_ms': _percentile(lateness_sec, 0.5) * 1000,
+        'p99_ms': _percentile(lateness_sec, 0.99) * 1000,
+        'max_ms': lateness_sec[-1] * 1000,
+        }
+
+
+def main(args):
+    server_kwargs = {'address': '127.0.0.1'}
+    fps = mjpeg_fps
+    if args.type == 'rtsp_h264':
+        server_kwargs['source_video_file'] = args.h264_file
+        server_kwargs['fps'] = fps = args.fps
+    frame_period_ms = 1000 / fps
+    max_sustained = 0
+    print("cameras disconnected Mbit/s p50_ms p99_ms max_ms")
+    for camera_count in range(args.step, args.max_cameras + 1, args.step):
+        step = _run_step(args, server_kwargs, camera_count)
+        print(
+            "{cameras:7d} {disconnected:12d} {mbit_per_sec:6.1f} "
+            "{p50_ms:6.1f} {p99_ms:6.1f} {max_ms:6.1f}".format(**step))
+        if step['disconnected'] or step['p99_ms'] >= frame_period_ms:
+            break
+        max_sustained = camera_count
+    print(f"Max sustained camera count: {max_sustained}")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        '--type',
+        choices=_server_classes.keys(),
+        default='http_mjpeg',
+        help="Protocol; default: %(default)s")
+    arg_parser.add_argument(
+        '--h264-file',
+        type=Path,
+        help="H264-coded video file to stream")
+    arg_parser.add_argument(
+        '--fps',
+        type=int, default=30,
+        help="Frame rate of the H264 file; default: %(default)s")
+    arg_parser.add_argument(
+        '--processes',
+        type=int, default=1,
+        help="Server processes; default: %(default)s")
+    arg_parser.add_argument(
+        '--step',
+        type=int, default=50,
+        help="Cameras added at each step; default: %(default)s")
+    arg_parser.add_argument(
+        '--max-cameras',
+        type=int, default=1000,
+        help="Stop at this camera count; default: %(default)s")
+    arg_parser.add_argument(
+        '--duration-sec',
+        type=float, default=10,
+        help="Streaming time at each step; default: %(default)s")
+    parsed_args = arg_parser.parse_args()
+    if parsed_args.type == 'rtsp_h264' and parsed_args.h264_file is None:
+        arg_parser.error("Option --h264-file must be specified if --type is rtsp_h264")
+    logging.basicConfig(level=logging.WARNING)
+    main(parsed_args)
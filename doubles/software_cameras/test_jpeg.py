@@ -0,0 +1,28 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+from doubles.software_cameras._jpeg import JpegImage
+from doubles.software_cameras._jpeg import _make_frame
+
+
+def test_image_from_memoryview():
+    frame = _make_frame((320, 240), 'test')
+    image = JpegImage(memoryview(frame.raw))
+    assert image.frame_size == (320, 240)
+    assert image.quantization_tables == frame.quantization_tables
+    assert image == frame
+
+
+def test_image_from_data():
+    frame = _make_frame((320, 240), 'test')
+    image = JpegImage.from_data(frame.quantization_tables, 320, 240, frame.scan)
+    assert image.frame_size == (320, 240)
+    assert image == frame
+
+
+def test_memoryview_not_copied():
+    frame = _make_frame((320, 240), 'test')
+    data = bytearray(frame.raw)
+    image = JpegImage(memoryview(data))
+    data[-3] ^= 0xff
+    assert len(image) == len(data)
+    assert image.raw == data
+    assert image != frame
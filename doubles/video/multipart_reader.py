@@ -1,12 +1,18 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import base64
 import cgi
-import io
 import logging
 import pathlib
 import socket
+import time
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Iterator
+from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Tuple
 from urllib.parse import urlparse
 
 from ca import default_ca
@@ -29,6 +35,14 @@ def _parse_status(fp):
     return proto, code, message
 
 
+def _parse_header(header, headers):
+    header = header.decode('iso-8859-1')
+    field, value = header.split(':', 1)
+    field = field.strip().title()
+    value, params = cgi.parse_header(value)
+    headers[field] = value, params
+
+
 def _parse_headers(fp):
     headers = {}
     while True:
@@ -36,14 +50,7 @@ def _parse_headers(fp):
         header = header.rstrip()
         if not header:
             break
-        header = header.decode('iso-8859-1')
-        field, value = header.split(':', 1)
-        field = field.strip().title()
-        value, params = cgi.parse_header(value)
-        if field in headers:
-            pass
-            # raise RuntimeError("Duplicate header {}".format(field))
-        headers[field] = value, params
+        _parse_header(header, headers)
     return headers
 
 
@@ -94,15 +101,22 @@ class _ChunkedReader:
 
 
 class _BufferedReader:
+    """Read from a raw stream, return memoryviews of the internal buffer.
+
+    Returned views stay valid: data is never overwritten in place,
+    the unread tail is moved to a new buffer instead. Old buffers are freed
+    as soon as the caller drops the views, so memory does not grow
+    with the stream length.
+    """
 
     def __init__(self, fp):
         self._fp = fp
-        self._buffer = bytearray(65535)
+        self._buffer = bytearray(256 * 1024)
         self._start, self._end = 0, 0
         self.closed = False
 
-    def _find(self, substring):
-        return self._buffer.index(substring, self._start, self._end)
+    def _find(self, substring, start):
+        return self._buffer.index(substring, start, self._end)
 
     def _cut(self, end):
         assert self._start <= end <= self._end
@@ -128,10 +142,13 @@ class _BufferedReader:
     def readuntil(self, delim):  # Mimic readline name.
         if self.closed:
             return b''
+        # Don't scan the same bytes again after each load.
+        scanned = 0
         while True:
             try:
-                found_at = self._find(delim)
+                found_at = self._find(delim, self._start + scanned)
             except ValueError:
+                scanned = max(0, self._end - self._start - len(delim) + 1)
                 loaded = self._load()
                 if loaded == 0:  # Underlying stream is closed.
                     self.closed = True
@@ -166,6 +183,7 @@ class MultiPartReader:
         parsed_url = urlparse(url)
         sock = socket.socket()
         sock = default_ca().wrap_client_socket(sock)
+        self._sock = sock
         sock.settimeout(20)
         sock.connect((parsed_url.hostname, parsed_url.port or 80))
         sock.send(b'GET ' + url.encode('iso-8859-1') + b' HTTP/1.1\r\n')
@@ -198,6 +216,16 @@ class MultiPartReader:
             self.preamble += line
         self.closed = False
 
+    def close(self):
+        self.closed = True
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
     def __iter__(self):
         return self
 
@@ -205,55 +233,152 @@ class MultiPartReader:
         if self.closed:
             raise StopIteration()
         # Don't trust Content-Length, VLC messes up with it.
-        # Also, the epilogue doesn't contain headers, so the headers cannot be
-        # parsed before the boundary is reached.
+        # The epilogue doesn't contain headers: if the stream ends before
+        # the next boundary, the headers read so far are the epilogue too.
         delim = b'\r\n--' + self.boundary.encode('iso-8859-1') + b'\r\n'
+        header_lines = []
         try:
-            chunk = self._data_io.readuntil(delim)
+            while True:
+                line = bytes(self._data_io.readuntil(b'\r\n'))
+                header_lines.append(line)
+                if not line.endswith(b'\r\n'):
+                    self._finish(b''.join(header_lines))
+                if line == b'\r\n':
+                    break
+            contents = self._data_io.readuntil(delim)
         except _SourceClosed:
             _logger.debug("Stop: source buffer is closed")
             self.epilogue = None
             self.closed = True
             raise ConnectionClosed()
-        if chunk[-len(delim):] != delim:  # No endswith in memoryview.
-            _logger.debug("Stop: finished successfully")
-            self.epilogue = bytes(chunk)
-            self.closed = True
-            raise StopIteration()
-        part = chunk[:-len(delim)]
-        part_io = io.BytesIO(part)
-        headers = _parse_headers(part_io)
-        contents = part[part_io.tell():]
-        return headers, contents
+        if contents[-len(delim):] != delim:  # No endswith in memoryview.
+            self._finish(b''.join(header_lines) + bytes(contents))
+        headers = {}
+        for line in header_lines[:-1]:
+            _parse_header(line.rstrip(), headers)
+        return headers, contents[:-len(delim)]
+
+    def _finish(self, epilogue):
+        _logger.debug("Stop: finished successfully")
+        self.epilogue = bytes(epilogue)
+        self.closed = True
+        raise StopIteration()
+
+
+def iter_frames(url: str, auth_header: Optional[str] = None) -> Iterator[memoryview]:
+    """Yield frames as they arrive; keep nothing after a frame is yielded.
+
+    Frames are views of the receive buffer: copy or wrap a frame
+    to keep it. The connection is closed when the generator is closed.
+    """
+    _logger.info("Get frames: %s", url)
+    with MultiPartReader(url, auth_header=auth_header) as stream:
+        _logger.debug("Preamble: %r", stream.preamble)
+        boundary_in_header = stream.headers['Content-Type'][1]['boundary']
+        if stream.boundary != boundary_in_header:
+            raise RuntimeError(
+                "Content-Type boundary differs from actual: "
+                f"{boundary_in_header} != {stream.boundary}")
+        for headers, frame in stream:
+            if 'Content-Length' in headers:
+                content_len_in_header = int(headers['Content-Length'][0])
+                if content_len_in_header != len(frame):
+                    _logger.error(
+                        "Content-Length differs from actual: %d != %d",
+                        content_len_in_header, len(frame))
+            yield frame
+        if stream.epilogue is None:
+            _logger.error("Epilogue: N/A; stream timed out")
+        elif len(stream.epilogue) < 2000:
+            _logger.debug("Epilogue: %r", stream.epilogue)
+        else:
+            _logger.error(
+                "Epilogue too big: %r and %d bytes more",
+                stream.epilogue[:100], len(stream.epilogue) - 100)
 
 
 def get_frames(url: str, auth_header: Optional[str] = None) -> Sequence[JpegImage]:
-    _logger.info("Get frames: %s", url)
-    stream = MultiPartReader(url, auth_header=auth_header)
-    _logger.debug("Preamble: %r", stream.preamble)
-    boundary_in_header = stream.headers['Content-Type'][1]['boundary']
-    if stream.boundary != boundary_in_header:
-        raise RuntimeError(
-            "Content-Type boundary differs from actual: "
-            f"{boundary_in_header} != {stream.boundary}")
-    result = []
-    for headers, frame in stream:
-        if 'Content-Length' in headers:
-            content_len_in_header = int(headers['Content-Length'][0])
-            if content_len_in_header != len(frame):
-                _logger.error(
-                    "Content-Length differs from actual: %d != %d",
-                    content_len_in_header, len(frame))
-        result.append(JpegImage(frame))
-    if stream.epilogue is None:
-        _logger.error("Epilogue: N/A; stream timed out")
-    elif len(stream.epilogue) < 2000:
-        _logger.debug("Epilogue: %r", stream.epilogue)
-    else:
-        _logger.error(
-            "Epilogue too big: %r and %d bytes more",
-            stream.epilogue[:100], len(stream.epilogue) - 100)
-    return result
+    return [JpegImage(bytes(frame)) for frame in iter_frames(url, auth_header=auth_header)]
+
+
+class FrameStatistics:
+    """Frame rate, gaps and repeats of a stream, updated frame by frame.
+
+    Only the last frames are kept, so memory use doesn't depend on
+    how long the stream is watched.
+    """
+
+    def __init__(self, keep_last: int = 0, long_gap_sec: float = 1):
+        self.frame_count = 0
+        self.byte_count = 0
+        self.max_gap_sec = 0.
+        # Gaps are rare, their (started_at, duration_sec) are kept.
+        self.long_gaps: List[Tuple[float, float]] = []
+        # Identical consecutive frames mean the picture is frozen.
+        self.repeated_frame_count = 0
+        self.last_frames: Deque[JpegImage] = deque(maxlen=keep_last)
+        self._long_gap_sec = long_gap_sec
+        self._first_frame_at: Optional[float] = None
+        self._last_frame_at: Optional[float] = None
+        self._last_digest: Optional[bytes] = None
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__} '
+            f'{self.frame_count} frames, {self.fps():.1f} FPS, '
+            f'max gap {self.max_gap_sec:.3f} sec, {len(self.long_gaps)} long gaps>')
+
+    def add(self, frame: JpegImage, received_at: float):
+        digest = frame.digest()
+        if digest == self._last_digest:
+            self.repeated_frame_count += 1
+        self._last_digest = digest
+        if self._last_frame_at is None:
+            self._first_frame_at = received_at
+        else:
+            gap_sec = received_at - self._last_frame_at
+            self.max_gap_sec = max(self.max_gap_sec, gap_sec)
+            if gap_sec >= self._long_gap_sec:
+                self.long_gaps.append((self._last_frame_at, gap_sec))
+        self._last_frame_at = received_at
+        self.frame_count += 1
+        self.byte_count += len(frame)
+        self.last_frames.append(frame)
+
+    def fps(self) -> float:
+        if self.frame_count < 2:
+            return 0
+        return (self.frame_count - 1) / (self._last_frame_at - self._first_frame_at)
+
+
+def watch_frames(
+        url: str,
+        on_frame: Optional[Callable[[JpegImage], None]] = None,
+        auth_header: Optional[str] = None,
+        time_limit_sec: float = float('inf'),
+        keep_last: int = 0,
+        ) -> FrameStatistics:
+    """Receive a stream for a long time without accumulating frames.
+
+    Each frame is passed to the callback, if any, and to the statistics,
+    which keep only the last frames. The stream ends when the server
+    finishes it or when the time limit is reached.
+    """
+    statistics = FrameStatistics(keep_last=keep_last)
+    started_at = time.monotonic()
+    frames = iter_frames(url, auth_header=auth_header)
+    try:
+        for data in frames:
+            frame = JpegImage(bytes(data))
+            statistics.add(frame, time.monotonic())
+            if on_frame is not None:
+                on_frame(frame)
+            if time.monotonic() - started_at >= time_limit_sec:
+                break
+    finally:
+        frames.close()
+    _logger.info("Stream %s: %r", url, statistics)
+    return statistics
 
 
 if __name__ == '__main__':
@@ -1,19 +1,18 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import asyncio
 import hashlib
 import io
 import logging
-import socket
 import ssl
 import struct
 import time
 from abc import ABCMeta
 from abc import abstractmethod
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import as_completed
+from collections import deque
 from email.message import Message
 from email.parser import FeedParser
 from typing import Any
-from typing import BinaryIO
+from typing import Deque
 from typing import List
 from typing import Mapping
 from typing import NamedTuple
@@ -29,6 +28,10 @@ _logger = logging.getLogger(__name__)
 
 _rtsp_default_port = 554
 _payload_type_mjpeg = 26
+# Expect server to reply or send the stream without longer pauses.
+_timeout_sec = 5
+_receive_buffer_size = 128 * 1024
+_min_receive_size = 32 * 1024
 
 
 class _JpegMainHeader(NamedTuple):
@@ -130,13 +133,6 @@ class _StatusLine(NamedTuple):
     status: bytes
 
 
-def _read_buffered(stream: BinaryIO, to_read: int) -> bytes:
-    received_bytes = stream.read(to_read)
-    if len(received_bytes) < to_read:
-        raise _StreamClosed("Connection is closed by the remote host")
-    return received_bytes
-
-
 class _RtspResponse:
 
     def __init__(self, status_line: _StatusLine, headers: Message, data: bytes):
@@ -152,17 +148,13 @@ class _RtspResponse:
                 f"Unexpected RTSP status: {self.status_line.code} {self.status_line.status}")
 
     @classmethod
-    def read_from(cls, stream: BinaryIO, status_line_prefix: bytes = b''):
-        status_line_rest = stream.readline().strip()
-        status_line_raw = status_line_prefix + status_line_rest
+    def parse_head(cls, head: bytes) -> Tuple[_StatusLine, Message]:
+        [status_line_raw, headers_raw] = head.split(b'\r\n', 1)
         [protocol, code, status] = status_line_raw.split(maxsplit=2)
         status_line = _StatusLine(protocol, int(code), status)
-        headers = _read_headers(stream)
-        data = b''
-        content_length = int(headers.get('Content-Length', 0))
-        if content_length > 0:
-            data = _read_buffered(stream, content_length)
-        return _RtspResponse(status_line, headers, data)
+        parser = FeedParser()
+        parser.feed(headers_raw.decode('ascii', errors='surrogateescape'))
+        return status_line, parser.close()
 
 
 class _UnauthorizedError(_RtspUnexpectedStatus):
@@ -171,12 +163,6 @@ class _UnauthorizedError(_RtspUnexpectedStatus):
         self.response = response
 
 
-class _RtspInterleavedFrameHeader(NamedTuple):
-    magic_number: bytes
-    channel: bytes
-    data_length: int
-
-
 class _RtpHeader(NamedTuple):
     rtp_version: int
     marker: bool
@@ -195,18 +181,11 @@ def _parse_rtp_header(rtp_header_raw: bytes) -> _RtpHeader:
     return _RtpHeader(rtp_version, bool(marker), payload_type, sequence_number, timestamp, ssrc)
 
 
-def _wrap_ssl_socket(sock: socket.socket) -> ssl.SSLSocket:
+def _make_ssl_context() -> ssl.SSLContext:
     ssl_context = ssl.SSLContext(protocol=ssl.PROTOCOL_TLS_CLIENT)
     ssl_context.check_hostname = False
     ssl_context.verify_mode = ssl.VerifyMode.CERT_NONE  # To prevent self-signed certificate verification error
-    return ssl_context.wrap_socket(sock)
-
-
-def _read_headers(stream: BinaryIO) -> Message:
-    headers_raw = b''.join(iter(stream.readline, b'\r\n'))
-    parser = FeedParser()
-    parser.feed(headers_raw.decode('ascii', errors='surrogateescape'))
-    return parser.close()
+    return ssl_context
 
 
 class _MJPEGStreamInfo(NamedTuple):
@@ -224,6 +203,7 @@ class _RTPJPEGChannel:
         self._video_stream = _MotionJpegStream()
         self._first_received: float = 0.0
         self._last_received: float = 0.0
+        self._received_bytes = 0
 
     def get_stream_info(self) -> _MJPEGStreamInfo:
         fps = self._get_actual_fps()
@@ -243,6 +223,13 @@ class _RTPJPEGChannel:
             raise RuntimeError("Stream is not started, can't find any frames")
         return first_frame.frame_size
 
+    def get_throughput(self) -> Tuple[float, float]:
+        """Get frames and kilobits per second; zeros if nothing was received."""
+        delta_seconds = self._last_received - self._first_received
+        if delta_seconds <= 0 or not self._frames:
+            return 0.0, 0.0
+        return (len(self._frames) - 1) / delta_seconds, self._received_bytes * 8 / 1000 / delta_seconds
+
     def _update_frame_arrival_times(self):
         now = time.monotonic()
         if not self._first_received:
@@ -250,6 +237,7 @@ class _RTPJPEGChannel:
         self._last_received = now
 
     def put_raw(self, raw: bytes):
+        self._received_bytes += len(raw)
         rtp_header_length = 12
         rtp_header_raw = raw[:rtp_header_length]
         video_data_raw = raw[rtp_header_length:]
@@ -308,6 +296,9 @@ class _RTSPSession:
     def is_idle(self) -> bool:
         return self._next_activity < time.monotonic()
 
+    def sec_until_idle(self) -> float:
+        return max(self._next_activity - time.monotonic(), 0)
+
     def get_request(self, method: str) -> _RtspRequest:
         request = _RtspRequest(method, self._url)
         request.update_headers({'Session': self._id})
@@ -420,25 +411,131 @@ class _DigestAuth(_RtspAuth):
             self._realm, self._nonce, response, self._user_digest)
 
 
+class _RtspProtocol(asyncio.BufferedProtocol):
+    """Parse RTSP responses and interleaved frames as soon as they arrive.
+
+    Data is received into one buffer; complete messages are parsed in place,
+    a partial one is moved to the beginning when the buffer gets full.
+    """
+
+    def __init__(self, rtp_channel: _RTPJPEGChannel, rtcp_channel_id: int):
+        self._rtp_channel = rtp_channel
+        self._rtcp_channel_id = rtcp_channel_id
+        self._buffer = bytearray(_receive_buffer_size)
+        self._parsed_up_to = 0
+        self._received_up_to = 0
+        self._transport: Optional[asyncio.Transport] = None
+        self._response_futures: Deque[asyncio.Future] = deque()
+        self.closed = asyncio.get_running_loop().create_future()
+        self.last_received_at = time.monotonic()
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def send(self, data: bytes):
+        self._transport.write(data)
+
+    def expect_response(self) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        if self.closed.done():
+            future.set_exception(_StreamClosed("Connection is closed"))
+        else:
+            self._response_futures.append(future)
+        return future
+
+    def get_buffer(self, sizehint):
+        if len(self._buffer) - self._received_up_to < _min_receive_size:
+            pending = self._buffer[self._parsed_up_to:self._received_up_to]
+            if len(pending) + _min_receive_size > len(self._buffer):
+                self._buffer = bytearray(len(self._buffer) * 2)
+            self._buffer[:len(pending)] = pending
+            self._parsed_up_to = 0
+            self._received_up_to = len(pending)
+        return memoryview(self._buffer)[self._received_up_to:]
+
+    def buffer_updated(self, nbytes):
+        self._received_up_to += nbytes
+        self.last_received_at = time.monotonic()
+        try:
+            self._parse()
+        except Exception as e:
+            self._fail(e)
+
+    def _parse(self):
+        while self._received_up_to - self._parsed_up_to >= 4:
+            start = self._parsed_up_to
+            if self._buffer.startswith(b'$', start):
+                [channel, data_length] = struct.unpack_from('>BH', self._buffer, start + 1)
+                frame_end = start + 4 + data_length
+                if frame_end > self._received_up_to:
+                    return
+                _logger.debug("Read %d bytes frame", data_length)
+                if channel == self._rtp_channel.id:
+                    self._rtp_channel.put_raw(memoryview(self._buffer)[start + 4:frame_end])
+                elif channel == self._rtcp_channel_id:
+                    _logger.debug("Got RTCP frame; Ignore it")
+                else:
+                    raise RuntimeError(f"Unknown RTSP channel: {channel}")
+                self._parsed_up_to = frame_end
+            elif self._buffer.startswith(b'RTSP', start):
+                head_end = self._buffer.find(b'\r\n\r\n', start, self._received_up_to)
+                if head_end == -1:
+                    return
+                [status_line, headers] = _RtspResponse.parse_head(bytes(self._buffer[start:head_end]))
+                data_end = head_end + 4 + int(headers.get('Content-Length', 0))
+                if data_end > self._received_up_to:
+                    return
+                data = bytes(self._buffer[head_end + 4:data_end])
+                self._parsed_up_to = data_end
+                self._put_response(_RtspResponse(status_line, headers, data))
+            else:
+                raise RuntimeError(
+                    f"Magic number mismatch: {bytes(self._buffer[start:start + 4])!r}")
+
+    def _put_response(self, response: _RtspResponse):
+        while self._response_futures:
+            future = self._response_futures.popleft()
+            if not future.done():  # Not cancelled by timeout
+                future.set_result(response)
+                return
+        logging.info("Got unexpected response: %s  Probably is teardown", response)
+        response.raise_for_status()
+
+    def _fail(self, exception: Exception):
+        if not self.closed.done():
+            self.closed.set_exception(exception)
+        self._transport.close()
+
+    def eof_received(self):
+        return False  # Close the transport
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            _logger.debug("Connection lost: %r", exc)
+        while self._response_futures:
+            future = self._response_futures.popleft()
+            if not future.done():
+                future.set_exception(_StreamClosed("Connection is closed by the remote host"))
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+
 class _RtspClient:
 
     def __init__(self, url: str, auth_header: Optional[str] = None):
         parsed_url = urlparse(url)
         _, _, host_info = parsed_url.netloc.rpartition('@')
         self._url = parsed_url._replace(netloc=host_info).geturl()
-        sock = socket.socket()
         if parsed_url.scheme == 'rtsp':
-            self._sock = sock
+            self._ssl_context = None
         elif parsed_url.scheme == 'rtsps':
-            self._sock = _wrap_ssl_socket(sock)
+            self._ssl_context = _make_ssl_context()
         else:
             raise RuntimeError(
                 f"Only 'rtsp' or 'rtsps' schemes are supported. Received: {parsed_url.scheme}")
-        self._sock.settimeout(5)  # Expect server to reply
-        server_address = (parsed_url.hostname, parsed_url.port or _rtsp_default_port)
-        self._sock.connect(server_address)
-        _logger.info("New connection to %r", server_address)
-        self._stream = self._sock.makefile('rwb')
+        self._server_address = (parsed_url.hostname, parsed_url.port or _rtsp_default_port)
+        self._transport: Optional[asyncio.Transport] = None
+        self._protocol: _RtspProtocol
         self._cseq = 0
         self._rtp_channel = _RTPJPEGChannel(0)
         self._rtcp_channel_id = 1
@@ -452,15 +549,18 @@ class _RtspClient:
         else:
             self._auth_handler = _BearerAuth(auth_header)
 
-    def __enter__(self):
-        return self
+    async def _connect(self):
+        [host, port] = self._server_address
+        [self._transport, self._protocol] = await asyncio.wait_for(
+            asyncio.get_running_loop().create_connection(
+                lambda: _RtspProtocol(self._rtp_channel, self._rtcp_channel_id),
+                host, port, ssl=self._ssl_context),
+            _timeout_sec)
+        _logger.info("New connection to %r", self._server_address)
 
-    def __exit__(self, *args, **kwargs):
-        self._stream.close()
-        self._sock.close()
-
-    def _read_buffered(self, to_read: int) -> bytes:
-        return _read_buffered(self._stream, to_read)
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
 
     @staticmethod
     def _parse_sdp(sdp_description: str) -> Mapping[str, Any]:
@@ -482,11 +582,15 @@ class _RtspClient:
         _logger.debug("Make RTSP request:")
         for line in request_raw.splitlines():
             _logger.debug("  %r", line)
-        self._stream.write(request_raw)
-        self._stream.flush()
+        self._protocol.send(request_raw)
         self._cseq += 1
 
-    def _make_request(
+    async def _exchange(self, request: _RtspRequest) -> _RtspResponse:
+        response_future = self._protocol.expect_response()
+        self._send_request(request)
+        return await asyncio.wait_for(response_future, _timeout_sec)
+
+    async def _make_request(
             self,
             method: str,
             url: str,
@@ -496,33 +600,26 @@ class _RtspClient:
         if headers is not None:
             request.update_headers(headers)
         self._auth_handler.set_auth_info(request)
-        self._send_request(request)
-        response = _RtspResponse.read_from(self._stream)
+        response = await self._exchange(request)
         try:
             response.raise_for_status()
         except _UnauthorizedError as e:
             self._auth_handler.handle_unauthorised(e.response)
             self._auth_handler.set_auth_info(request)
-            self._send_request(request)
-            response = _RtspResponse.read_from(self._stream)
+            response = await self._exchange(request)
             response.raise_for_status()
         return response
 
-    def _options(self):
-        response = self._make_request('OPTIONS', self._url)
+    async def _options(self):
+        response = await self._make_request('OPTIONS', self._url)
         options = response.headers['Public'].split(', ')
         for option in ['DESCRIBE', 'SETUP', 'PLAY', 'TEARDOWN']:
             if option not in options:
                 raise RuntimeError(
                     f"Option {option} is not available; Available options: {options}")
 
-    def _get_rtsp_response(self) -> _RtspResponse:
-        response = _RtspResponse.read_from(self._stream)
-        response.raise_for_status()
-        return response
-
-    def _open_session(self) -> _RTSPSession:
-        response = self._make_request('DESCRIBE', self._url, headers={'Accept': 'application/sdp'})
+    async def _open_session(self) -> _RTSPSession:
+        response = await self._make_request('DESCRIBE', self._url, headers={'Accept': 'application/sdp'})
         content_type = response.headers.get('Content-Type')
         if content_type is None:  # Some servers return lower-case 'type'
             content_type = response.headers.get('Content-type')
@@ -547,89 +644,74 @@ class _RtspClient:
             session_id, session_url, timeout)
         return _RTSPSession(session_id, session_url, int(timeout))
 
-    def _setup(self, session: _RTSPSession):
+    async def _setup(self, session: _RTSPSession):
         setup_request = session.get_request('SETUP')
         channels = f'interleaved={self._rtp_channel.id}-{self._rtcp_channel_id}'
         setup_headers = {'Transport': f'RTP/AVP/TCP;unicast;{channels}'}  # Only TCP is supported
         setup_request.update_headers(setup_headers)
-        self._send_request(setup_request)
-        self._get_rtsp_response()
+        response = await self._exchange(setup_request)
+        response.raise_for_status()
 
-    def _play(self, session: _RTSPSession):
+    async def _play(self, session: _RTSPSession):
         play_request = session.get_request('PLAY')
-        self._send_request(play_request)
-        self._get_rtsp_response()
+        response = await self._exchange(play_request)
+        response.raise_for_status()
 
     def _send_teardown(self, session: _RTSPSession):
         teardown_request = session.get_request('TEARDOWN')
         self._send_request(teardown_request)
 
-    def _collect_stream_residue(self):
+    async def _keep_alive(self, session: _RTSPSession):
         while True:
-            try:
-                first_four_bytes = self._read_buffered(4)
-            except TimeoutError:
-                logging.warning(
-                    "Stream finished, but TCP connection is not closed. "
-                    "It is OK with Mediaserver")
-                break
-            except _StreamClosed:
-                logging.info("Stream is closed")
-                break
-            if first_four_bytes == b'RTSP':
-                response = _RtspResponse.read_from(self._stream, first_four_bytes)
-                logging.info("Got unexpected response: %s  Probably is teardown", response)
-                response.raise_for_status()
-            else:
-                self._read_interleaved_frame(first_four_bytes)
-
-    def _read_interleaved_frame(self, frame_header: bytes):
-        interleaved_frame_header = _RtspInterleavedFrameHeader(
-            *struct.unpack('>cBH', frame_header))
-        if interleaved_frame_header.magic_number != b'$':
-            raise RuntimeError(f"Magic number mismatch: {interleaved_frame_header}")
-        _logger.debug("Read %d bytes frame", interleaved_frame_header.data_length)
-        if interleaved_frame_header.channel == self._rtcp_channel_id:
-            _logger.debug("Got RTCP frame; Ignore it")
-            self._read_buffered(interleaved_frame_header.data_length)
-        elif interleaved_frame_header.channel == self._rtp_channel.id:
-            interleaved_frame_raw = self._read_buffered(interleaved_frame_header.data_length)
-            self._rtp_channel.put_raw(interleaved_frame_raw)
+            await asyncio.sleep(session.sec_until_idle())
+            if session.is_idle():
+                logging.info("%r: Keep alive with OPTIONS", session)
+                options_request = session.get_request('OPTIONS')
+                self._send_request(options_request)
+
+    async def _wait_closed(self, deadline: float) -> bool:
+        """Wait until closed, the deadline or a silence longer than timeout."""
+        while True:
+            silence_deadline = self._protocol.last_received_at + _timeout_sec
+            timeout_sec = min(deadline, silence_deadline) - time.monotonic()
+            [done, _] = await asyncio.wait([self._protocol.closed], timeout=max(timeout_sec, 0))
+            if done:
+                self._protocol.closed.result()  # Raise a parsing error, if any
+                return True
+            now = time.monotonic()
+            if now >= deadline or now - self._protocol.last_received_at >= _timeout_sec:
+                return False
+
+    async def _collect_stream_residue(self):
+        if await self._wait_closed(float('inf')):
+            logging.info("Stream is closed")
         else:
-            raise RuntimeError(f"Unknown RTSP channel: {interleaved_frame_header.channel}")
+            logging.warning(
+                "Stream finished, but TCP connection is not closed. "
+                "It is OK with Mediaserver")
 
-    def _read_stream(self, session: _RTSPSession, time_limit_sec: float):
+    async def _read_stream(self, time_limit_sec: float):
         _logger.info("Start getting stream")
         started_at = time.monotonic()
+        wake_up_at = started_at + time_limit_sec
         while True:
-            # Some servers (like Nx FT camera server) doesn't close the TCP connection after
-            # stream is over. In that case TimeoutError raised on sock.recv().
-            try:
-                first_four_bytes = self._read_buffered(4)
-            except TimeoutError:
-                sock_timeout = self._sock.gettimeout()
-                _logger.warning("Reading from socket timed out: %.1f sec", sock_timeout)
-                stream_duration_sec = time.monotonic() - started_at - sock_timeout
-                break
             # Some servers (like Nx mediaserver) closes the TCP connection after stream is over.
-            except _StreamClosed:
+            if await self._wait_closed(wake_up_at):
                 _logger.info("TCP stream closed on remote side")
                 stream_duration_sec = time.monotonic() - started_at
                 break
-            if first_four_bytes == b'RTSP':
-                response = _RtspResponse.read_from(self._stream, first_four_bytes)
-                logging.info("Got unexpected response: %s  Probably is teardown", response)
-                response.raise_for_status()
-            else:
-                self._read_interleaved_frame(first_four_bytes)
-            stream_duration_sec = time.monotonic() - started_at
+            # Some servers (like Nx FT camera server) doesn't close the TCP connection after
+            # stream is over. In that case nothing is received for a while.
+            if time.monotonic() - self._protocol.last_received_at >= _timeout_sec:
+                _logger.warning("Reading from socket timed out: %.1f sec", _timeout_sec)
+                stream_duration_sec = self._protocol.last_received_at - started_at
+                break
+            # The stream is long enough if something is received after the time limit.
+            stream_duration_sec = self._protocol.last_received_at - started_at
             if stream_duration_sec >= time_limit_sec:
                 _logger.info("Got %.2f seconds of stream; Stop getting stream", stream_duration_sec)
                 raise _GotEnough()
-            if session.is_idle():
-                logging.info("%r: Keep alive with OPTIONS", session)
-                options_request = session.get_request('OPTIONS')
-                self._send_request(options_request)
+            wake_up_at = time.monotonic() + 0.05
         duration_tolerance = 1
         if time_limit_sec - stream_duration_sec > duration_tolerance:
             raise ConnectionClosedByServer(
@@ -637,16 +719,27 @@ class _RtspClient:
                 f"Duration expected: {time_limit_sec}; "
                 f"Actual duration: {stream_duration_sec:.2f}")
 
-    def receive_stream(self, time_limit_sec):
-        self._options()
-        session = self._open_session()
-        self._setup(session)
-        self._play(session)
+    async def receive_stream(self, time_limit_sec):
+        await self._connect()
         try:
-            self._read_stream(session, time_limit_sec)
-        except _GotEnough:
-            self._send_teardown(session)
-            self._collect_stream_residue()
+            await self._options()
+            session = await self._open_session()
+            await self._setup(session)
+            await self._play(session)
+            keep_alive = asyncio.create_task(self._keep_alive(session))
+            try:
+                await self._read_stream(time_limit_sec)
+            except _GotEnough:
+                self._send_teardown(session)
+                await self._collect_stream_residue()
+            finally:
+                keep_alive.cancel()
+        finally:
+            self.close()
+            [fps, kbps] = self._rtp_channel.get_throughput()
+            _logger.info(
+                "%s: Received %d frames, %.1f FPS, %.0f kbit/s",
+                self._url, len(self._rtp_channel.get_full_stream()), fps, kbps)
 
     def get_stream(self) -> Sequence[JpegImage]:
         return self._rtp_channel.get_full_stream()
@@ -655,57 +748,71 @@ class _RtspClient:
         return self._rtp_channel.get_stream_info()
 
 
+async def _get_rtsp_stream(
+        url: str,
+        time_limit_sec: float,
+        auth_header: Optional[str]) -> Sequence[JpegImage]:
+    _logger.info("Get %.3f seconds of stream: %s", time_limit_sec, url)
+    client = _RtspClient(url, auth_header=auth_header)
+    try:
+        await client.receive_stream(time_limit_sec)
+    except ConnectionClosedByServer:
+        if time_limit_sec != float('inf'):
+            raise
+    except Exception:
+        _logger.exception('Unexpected exception')
+        raise
+    _logger.info("Finish getting %.3f seconds of stream: %s", time_limit_sec, url)
+    return client.get_stream()
+
+
 def get_rtsp_stream(
         url: str,
         time_limit_sec: float = float('inf'),
         auth_header: Optional[str] = None) -> Sequence[JpegImage]:
-    _logger.info("Get %.3f seconds of stream: %s", time_limit_sec, url)
-    with _RtspClient(url, auth_header=auth_header) as client:
-        try:
-            client.receive_stream(time_limit_sec)
-        except ConnectionClosedByServer:
-            if time_limit_sec != float('inf'):
-                raise
-        except Exception:
-            _logger.exception('Unexpected exception')
-            raise
-        _logger.info("Finish getting %.3f seconds of stream: %s", time_limit_sec, url)
-        return client.get_stream()
+    return asyncio.run(_get_rtsp_stream(url, time_limit_sec, auth_header))
 
 
-def get_mjpeg_stream_info(url: str, auth_header: Optional[str] = None) -> _MJPEGStreamInfo:
+async def _get_mjpeg_stream_info(url: str, auth_header: Optional[str]) -> _MJPEGStreamInfo:
     sample_duration_sec = 5
     _logger.info("Get %.3f seconds long sample of stream: %s", sample_duration_sec, url)
-    with _RtspClient(url, auth_header=auth_header) as client:
-        start_at = time.monotonic()
-        try:
-            client.receive_stream(sample_duration_sec)
-        except ConnectionClosedByServer:
-            stream_sample_duration = time.monotonic() - start_at
-            if stream_sample_duration < 1:
-                raise RuntimeError(
-                    f"A stream sample is shorter than {sample_duration_sec}: "
-                    f"{stream_sample_duration:.3f}. The result maybe incorrect.")
-        _logger.info("Finish getting %.3f seconds of stream: %s", sample_duration_sec, url)
-        return client.get_stream_info()
+    client = _RtspClient(url, auth_header=auth_header)
+    start_at = time.monotonic()
+    try:
+        await client.receive_stream(sample_duration_sec)
+    except ConnectionClosedByServer:
+        stream_sample_duration = time.monotonic() - start_at
+        if stream_sample_duration < 1:
+            raise RuntimeError(
+                f"A stream sample is shorter than {sample_duration_sec}: "
+                f"{stream_sample_duration:.3f}. The result maybe incorrect.")
+    _logger.info("Finish getting %.3f seconds of stream: %s", sample_duration_sec, url)
+    return client.get_stream_info()
+
+
+def get_mjpeg_stream_info(url: str, auth_header: Optional[str] = None) -> _MJPEGStreamInfo:
+    return asyncio.run(_get_mjpeg_stream_info(url, auth_header))
+
+
+async def _gather_rtsp_streams(
+        url_list: Sequence[str],
+        auth_header: Optional[str],
+        time_limit_sec: float) -> Sequence[Sequence[JpegImage]]:
+    return await asyncio.gather(*[
+        _get_rtsp_stream(url, time_limit_sec, auth_header)
+        for url in url_list
+        ])
 
 
 def get_multiple_rtsp_streams(
         url_list: Sequence[str],
-        auth_header: Optional[str] = None) -> Sequence[Sequence[JpegImage]]:
-    url_to_frames = {}
+        auth_header: Optional[str] = None,
+        time_limit_sec: float = float('inf'),
+        ) -> Sequence[Sequence[JpegImage]]:
+    """Get streams concurrently in one thread."""
     url_count = len(url_list)
     started_at = time.monotonic()
-    with ThreadPoolExecutor(max_workers=url_count) as executor:
-        get_stream_fut_to_url = {
-            executor.submit(get_rtsp_stream, url=url, auth_header=auth_header): url
-            for url
-            in url_list
-            }
-        for fut in as_completed(get_stream_fut_to_url):
-            url = get_stream_fut_to_url[fut]
-            frames = fut.result()
-            url_to_frames[url] = frames
+    streams = asyncio.run(_gather_rtsp_streams(url_list, auth_header, time_limit_sec))
     finished_at = time.monotonic() - started_at
     _logger.debug("Getting %d streams took %.2f seconds", url_count, finished_at)
-    return [url_to_frames[url] for url in url_list]
+    return streams
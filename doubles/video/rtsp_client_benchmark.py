@@ -0,0 +1,75 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+"""Measure how many RTSP MJPEG streams the client receives per CPU core.
+
+Software cameras are served by separate processes. The client receives
+all streams in this process; its CPU time is compared to the streaming time.
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+
+from doubles.software_cameras import MjpegRtspCameraServer
+from doubles.software_cameras import find_free_port
+from doubles.software_cameras import serve_in_processes
+from doubles.video.rtsp_client import get_multiple_rtsp_streams
+
+_serve_margin_sec = 10
+
+
+def _run_step(stream_count, duration_sec, server_processes):
+    port = find_free_port()
+    server_process = multiprocessing.Process(
+        target=serve_in_processes,
+        args=(
+            MjpegRtspCameraServer,
+            {'address': '127.0.0.1', 'port': port},
+            server_processes,
+            duration_sec + _serve_margin_sec,
+            ))
+    server_process.start()
+    try:
+        time.sleep(1)  # Let the server processes start listening.
+        url_list = [f'rtsp://127.0.0.1:{port}/{index}.mjpeg' for index in range(stream_count)]
+        cpu_started_at = time.process_time()
+        streams = get_multiple_rtsp_streams(url_list, time_limit_sec=duration_sec)
+        cpu_sec = time.process_time() - cpu_started_at
+    finally:
+        server_process.join()
+    frame_count = sum(len(frames) for frames in streams)
+    return {
+        'streams': stream_count,
+        'fps': frame_count / stream_count / duration_sec,
+        'cpu_load': cpu_sec / duration_sec,
+        'streams_per_core': stream_count * duration_sec / cpu_sec,
+        }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        '--step',
+        type=int, default=50,
+        help="Streams added at each step; default: %(default)s")
+    arg_parser.add_argument(
+        '--max-streams',
+        type=int, default=500,
+        help="Stop at this stream count; default: %(default)s")
+    arg_parser.add_argument(
+        '--duration-sec',
+        type=float, default=10,
+        help="Streaming time at each step; default: %(default)s")
+    arg_parser.add_argument(
+        '--server-processes',
+        type=int, default=multiprocessing.cpu_count(),
+        help="Camera server processes; default: CPU count")
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    print("streams fps/stream client_cpu streams/core")
+    for stream_count in range(args.step, args.max_streams + 1, args.step):
+        step = _run_step(stream_count, args.duration_sec, args.server_processes)
+        print("{streams:7d} {fps:10.1f} {cpu_load:10.2f} {streams_per_core:12.0f}".format(**step))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import io
+import threading
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Sequence
+
+from ca import default_ca
+from doubles.software_cameras._jpeg import _make_frame
+from doubles.video.multipart_reader import FrameStatistics
+from doubles.video.multipart_reader import _BufferedReader
+from doubles.video.multipart_reader import get_frames
+from doubles.video.multipart_reader import watch_frames
+
+
+def test_frames_are_counted_not_kept():
+    [first, second, third] = [_make_frame((320, 240), text) for text in 'abc']
+    frames = [first, first, second, third] * 50
+    with _serving_mpjpeg([frame.raw for frame in frames]) as url:
+        statistics = watch_frames(url, keep_last=3)
+    assert statistics.frame_count == len(frames)
+    assert statistics.byte_count == sum(len(frame) for frame in frames)
+    assert statistics.repeated_frame_count == 50
+    assert list(statistics.last_frames) == [first, second, third]
+
+
+def test_callback_gets_every_frame():
+    frames = [_make_frame((320, 240), str(i)) for i in range(10)]
+    received = []
+    with _serving_mpjpeg([frame.raw for frame in frames]) as url:
+        statistics = watch_frames(url, on_frame=received.append)
+    assert received == frames
+    assert not statistics.last_frames
+
+
+def test_get_frames():
+    frames = [_make_frame((320, 240), str(i)) for i in range(10)]
+    with _serving_mpjpeg([frame.raw for frame in frames]) as url:
+        assert get_frames(url) == frames
+
+
+def test_statistics_gaps():
+    frame = _make_frame((320, 240), 'test')
+    statistics = FrameStatistics(long_gap_sec=1)
+    for received_at in [10, 10.5, 11, 13, 13.5]:
+        statistics.add(frame, received_at)
+    assert statistics.frame_count == 5
+    assert statistics.repeated_frame_count == 4
+    assert statistics.max_gap_sec == 2
+    assert statistics.long_gaps == [(11, 2)]
+    assert statistics.fps() == 4 / 3.5
+
+
+def test_buffer_does_not_grow():
+    part = b'x' * 10000 + b'\r\n'
+    reader = _BufferedReader(io.BytesIO(part * 1000))
+    initial_size = len(reader._buffer)
+    first = reader.readuntil(b'\r\n')
+    for _ in range(999):
+        assert reader.readuntil(b'\r\n') == part
+        assert len(reader._buffer) == initial_size
+    assert first == part
+    assert reader.readuntil(b'\r\n') == b''
+
+
+@contextmanager
+def _serving_mpjpeg(frames: Sequence[bytes]):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_MpjpegHandler, frames))
+    server.socket = default_ca().wrap_server_socket(server.socket, ['127.0.0.1'])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'https://127.0.0.1:{server.server_port}/media/camera.mpjpeg'
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class _MpjpegHandler(BaseHTTPRequestHandler):
+
+    def __init__(self, frames: Sequence[bytes], *args, **kwargs):
+        self._frames = frames
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+        self.end_headers()
+        self.wfile.write(b'--frame\r\n')
+        for frame in self._frames:
+            self.wfile.write(
+                b'Content-Type: image/jpeg\r\n'
+                b'Content-Length: %d\r\n'
+                b'\r\n' % len(frame))
+            self.wfile.write(frame)
+            self.wfile.write(b'\r\n--frame\r\n')
+
+    def log_message(self, *args):
+        pass
@@ -1,5 +1,6 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import logging
+from collections import defaultdict
 from typing import Sequence
 from typing import Tuple
 
@@ -11,17 +12,33 @@ _logger = logging.getLogger(__name__)
 def match_frames(
         sent_frames: Sequence[JpegImage],
         received_frames: Sequence[JpegImage]) -> Tuple[Sequence[int], Sequence[int]]:
-    """Match frames, assuming that relative order is preserved."""
-    sent_i, received_i = 0, 0
+    """Match frames, assuming that relative order is preserved.
+
+    Each received frame is matched to the first equal sent frame after
+    the previous match. Sent frames are indexed by digest, and the position
+    in each index only moves forward, so matching is linear.
+    """
+    sent_positions = defaultdict(list)
+    for sent_i, frame in enumerate(sent_frames):
+        sent_positions[frame.digest()].append(sent_i)
+    cursors = defaultdict(int)
+    sent_i = 0
+    matched_count = 0
     skipped = []
-    while sent_i < len(sent_frames) and received_i < len(received_frames):
-        if sent_frames[sent_i] == received_frames[received_i]:
-            received_i += 1
-        else:
-            skipped.append(sent_i)
-        sent_i += 1
+    for frame in received_frames:
+        digest = frame.digest()
+        positions = sent_positions.get(digest, [])
+        cursor = cursors[digest]
+        while cursor < len(positions) and positions[cursor] < sent_i:
+            cursor += 1
+        cursors[digest] = cursor
+        if cursor == len(positions):
+            break
+        skipped.extend(range(sent_i, positions[cursor]))
+        sent_i = positions[cursor] + 1
+        matched_count += 1
     skipped.extend(range(sent_i, len(sent_frames)))
-    mismatched = range(received_i, len(received_frames))
+    mismatched = range(matched_count, len(received_frames))
     _logger.info(
         "Frames match: sent %d, received %d, mismatched %r, skipped %r",
         len(sent_frames), len(received_frames), mismatched, skipped)
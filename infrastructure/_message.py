@@ -22,6 +22,14 @@ class MessageInput(metaclass=ABCMeta):
     def read_message(self) -> Optional[str]:
         pass
 
+    @abstractmethod
+    def read_messages(self, max_count: int, timeout_sec: float) -> Sequence[str]:
+        """Read up to max_count messages waiting up to timeout_sec for any.
+
+        All messages read at once are acknowledged at once.
+        """
+        pass
+
     @abstractmethod
     def acknowledge(self):
         pass
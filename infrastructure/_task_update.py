@@ -16,11 +16,23 @@ class UpdateService:
         self._update_output_factory = update_output_factory
 
     def process_one_update(self):
-        retry_interval_sec = 5
-        retry_count = 12
         message_raw = self._update_input.read_message()
         if message_raw is None:
             return
+        self._send_report(message_raw)
+        self._update_input.acknowledge()  # Not acknowledged on unhandled exceptions.
+
+    def process_updates(self, max_count: int, timeout_sec: float):
+        messages_raw = self._update_input.read_messages(max_count, timeout_sec)
+        if not messages_raw:
+            return
+        for message_raw in messages_raw:
+            self._send_report(message_raw)
+        self._update_input.acknowledge()  # Not acknowledged on unhandled exceptions.
+
+    def _send_report(self, message_raw):
+        retry_interval_sec = 5
+        retry_count = 12
         for attempt in range(1, retry_count + 1):
             _logger.debug("Report attempt %s/%s: %s", attempt, retry_count, message_raw)
             try:
@@ -32,7 +44,6 @@ class UpdateService:
                 _logger.info("Permanent failure: %s: %s", e, message_raw)
                 break
             time.sleep(retry_interval_sec)
-        self._update_input.acknowledge()  # Not acknowledged on unhandled exceptions.
 
 
 class UpdateReportFactory(metaclass=ABCMeta):
@@ -5,18 +5,21 @@ from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
-from functools import lru_cache
 from http.client import HTTPException
 from pathlib import Path
 from typing import Any
 from typing import Collection
 from typing import Dict
+from typing import Mapping
 from urllib.error import HTTPError
 from urllib.error import URLError
 from urllib.parse import quote_plus
 from urllib.request import Request
 from urllib.request import urlopen
 
+from infrastructure.ft_view._memoized import CachedFailure
+from infrastructure.ft_view._memoized import memoized
+
 # Keep nightly runs from the same nights together in single day.
 # Respect those who work through midnight.
 # Consider 'midnight' to be set at 6 AM MSK.
@@ -34,6 +37,13 @@ def enrich(data):
     _enrich_with_url_prefixes(data, 'opt.--installers-url')
 
 
+def enrichment_cache_stats() -> Mapping[str, Mapping[str, int]]:
+    return {
+        'build_info': _get_text.stats(),
+        'gitlab': _gitlab_get.stats(),
+        }
+
+
 def enrich_with_ticket(data: Dict[str, str], message: str):
     """Find Jira ticket URL in run message to display it in Web UI.
 
@@ -106,7 +116,7 @@ def _enrich_with_build_info(data: Dict[str, Any], key: str):
     url = data[key].removesuffix('/') + '/' + 'build_info.txt'
     try:
         raw = _get_text(url)
-    except (URLError, HTTPException) as e:
+    except (URLError, HTTPException, TimeoutError) as e:
         data['build_info.' + key + '.error'] = _extract_error(e)
         return
     for line in raw.splitlines():
@@ -118,10 +128,10 @@ def _enrich_with_build_info(data: Dict[str, Any], key: str):
         data['build_info.' + key + '.' + k] = v
 
 
-@lru_cache(2000)
+@memoized(max_size=2000, ttl_sec=3600, error_ttl_sec=60)
 def _get_text(url: str) -> bytes:
     try:
-        with urlopen(url) as response:
+        with urlopen(url, timeout=10) as response:
             return response.read()
     except HTTPError as e:
         if e.code == 404:
@@ -135,7 +145,7 @@ def _enrich_with_git_info(data: Dict[str, Any], key: str, project: str):
     ref = data[key]
     try:
         commit = _gitlab_get('/projects/:id/repository/commits/:sha', project, ref)
-    except (URLError, HTTPException) as e:
+    except (URLError, HTTPException, TimeoutError) as e:
         data['git.' + key + '.error'] = _extract_error(e)
         return
     if not commit:
@@ -153,7 +163,7 @@ def _enrich_with_git_info(data: Dict[str, Any], key: str, project: str):
         data['pipeline.' + key + '.url'] = commit['last_pipeline']['web_url']
     try:
         mr = _gitlab_get('/projects/:id/repository/commits/:sha/merge_requests', project, ref)
-    except (URLError, HTTPException) as e:
+    except (URLError, HTTPException, TimeoutError) as e:
         data['mr.' + key + '.error'] = _extract_error(e)
         return
     if not mr:
@@ -165,7 +175,7 @@ def _enrich_with_git_info(data: Dict[str, Any], key: str, project: str):
         data['mr.' + key + '.ticket'] = m[0]
 
 
-@lru_cache(2000)
+@memoized(max_size=2000, ttl_sec=3600, error_ttl_sec=60)
 def _gitlab_get(path, project, *values):
     for arg in [project, *values]:
         path = re.sub(r'(?<=/):\w+(?=/|$)', quote_plus(arg), path, 1)
@@ -178,14 +188,18 @@ def _gitlab_get(path, project, *values):
         if e.code == 404:  # Not transient (e.g. removed VMS build). Cache it.
             return None
         raise
-    # Do not suppress exceptions here to avoid caching erroneous states.
+    # Transient errors are cached for a short time only.
     return json.loads(data)
 
 
-def _extract_error(e: URLError | HTTPException) -> str:
+def _extract_error(e: URLError | HTTPException | TimeoutError) -> str:
     """Extract and save errors to find them and try again later manually."""
+    if isinstance(e, CachedFailure):
+        return _extract_error(e.error)
     if isinstance(e, HTTPException):  # Example: BadStatusLine
         return e.__class__.__name__
+    elif isinstance(e, TimeoutError):  # Timed out while reading response
+        return e.__class__.__name__
     elif isinstance(e, HTTPError):  # Example: HTTP 403
         return str(e.code)
     elif e.__context__ is not None:  # Example: SSLError, PermissionError
@@ -0,0 +1,114 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import threading
+import time
+from collections import OrderedDict
+from http.client import HTTPException
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Mapping
+from typing import Tuple
+from urllib.error import URLError
+
+
+class _Memoized:
+    """Cache results and, for a shorter time, failures of a function.
+
+    Thousands of updates in a batch refer to the same few builds and commits.
+    If failures were not cached, a slow or unavailable server would stall
+    processing of every update. A cached failure is raised as a new
+    CachedFailure each time. Concurrent calls with the same arguments
+    wait for the first one instead of calling the function too.
+    """
+
+    def __init__(
+            self,
+            func: Callable[..., Any],
+            max_size: int,
+            ttl_sec: float,
+            error_ttl_sec: float,
+            ):
+        self._func = func
+        self._max_size = max_size
+        self._ttl_sec = ttl_sec
+        self._error_ttl_sec = error_ttl_sec
+        self._store: OrderedDict[Tuple, Tuple[float, bool, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._fill_locks: Dict[Tuple, threading.Lock] = {}
+        self._hits = 0
+        self._error_hits = 0
+        self._misses = 0
+
+    def __call__(self, *args):
+        with self._lock:
+            [found, value] = self._get(args)
+            if not found:
+                fill_lock = self._fill_locks.setdefault(args, threading.Lock())
+        if found:
+            return value
+        with fill_lock:
+            with self._lock:
+                [found, value] = self._get(args)
+                if not found:
+                    self._misses += 1
+            if found:
+                return value
+            now = time.monotonic()
+            try:
+                value = self._func(*args)
+            except (URLError, HTTPException, TimeoutError) as e:
+                with self._lock:
+                    self._put(args, now + self._error_ttl_sec, True, e)
+                raise
+            else:
+                with self._lock:
+                    self._put(args, now + self._ttl_sec, False, value)
+                return value
+            finally:
+                with self._lock:
+                    self._fill_locks.pop(args, None)
+
+    def _get(self, args):
+        try:
+            [expires_at, is_error, value] = self._store[args]
+        except KeyError:
+            return False, None
+        if time.monotonic() >= expires_at:
+            del self._store[args]
+            return False, None
+        self._store.move_to_end(args)
+        if is_error:
+            self._error_hits += 1
+            raise CachedFailure(value)
+        self._hits += 1
+        return True, value
+
+    def _put(self, args, expires_at, is_error, value):
+        self._store[args] = expires_at, is_error, value
+        while len(self._store) > self._max_size:
+            self._store.popitem(last=False)
+
+    def stats(self) -> Mapping[str, int]:
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'error_hits': self._error_hits,
+                'misses': self._misses,
+                'size': len(self._store),
+                }
+
+
+class CachedFailure(URLError):
+    """Failure of a previous call, raised anew to keep its traceback short."""
+
+    def __init__(self, error: URLError | HTTPException | TimeoutError):
+        super().__init__(f"Cached failure: {error!r}")
+        self.error = error
+
+
+def memoized(max_size: int, ttl_sec: float, error_ttl_sec: float):
+
+    def decorator(func):
+        return _Memoized(func, max_size, ttl_sec, error_ttl_sec)
+
+    return decorator
@@ -11,6 +11,7 @@ from infrastructure._uri import get_process_uri
 from infrastructure.ft_view import _db
 from infrastructure.ft_view._enrichment import enrich
 from infrastructure.ft_view._enrichment import enrich_with_ticket
+from infrastructure.ft_view._enrichment import enrichment_cache_stats
 
 _logger = logging.getLogger(__name__)
 
@@ -22,32 +23,43 @@ def main():
     _db.execute(Path(__file__).with_name('job_status_update.sql').read_text())
     _db.execute(Path(__file__).with_name('run_updates.sql').read_text())
     while True:
-        message_raw = consumer.read_message()
-        if message_raw is not None:
-            message = json.loads(message_raw)
-            _logger.info("Update stage: %r", message)
-            data = {
-                **message['run_cmdline'],
-                'proc.username': message['run_username'],
-                'proc.hostname': message['run_hostname'],
-                'proc.started_at': message['run_started_at_iso'],
-                'proc.pid': message['run_pid'],
-                'report.duration_sec': message.get('stage_duration_sec'),
-                'report.status': message['stage_status'],
-                'report.run_url': message.get('run_url'),
-                }
-            enrich(data)
-            enrich_with_ticket(data, message.get('stage_message'))
-            _db.perform('pg_temp.store_update', json.dumps({
-                'run_message': _avoid_zero_symbol(message.get('stage_message')),
-                'run_cmdline': message['run_cmdline'],
-                'artifact_urls': message.get('artifact_urls', []),
-                'run_args': _pytest_style_test_name(message['run_cmdline']['args']),
-                'run_data': data,
-                }))
-            # Message must not be acknowledged on unhandled exceptions.
-            consumer.acknowledge()
-        time.sleep(0.01)
+        messages_raw = consumer.read_messages(max_count=100, timeout_sec=5)
+        if not messages_raw:
+            continue
+        started_at = time.monotonic()
+        updates = [_make_update(json.loads(message_raw)) for message_raw in messages_raw]
+        # All updates are stored in a single transaction. If it fails, none
+        # of them are stored, and none of the messages are acknowledged.
+        _db.perform('pg_temp.store_updates', json.dumps(updates))
+        consumer.acknowledge()
+        duration_sec = time.monotonic() - started_at
+        _logger.info(
+            "Stored %d updates in %.3f sec, %.1f updates/sec; enrichment cache: %r",
+            len(updates), duration_sec, len(updates) / max(duration_sec, 1e-6),
+            enrichment_cache_stats())
+
+
+def _make_update(message):
+    _logger.info("Update stage: %r", message)
+    data = {
+        **message['run_cmdline'],
+        'proc.username': message['run_username'],
+        'proc.hostname': message['run_hostname'],
+        'proc.started_at': message['run_started_at_iso'],
+        'proc.pid': message['run_pid'],
+        'report.duration_sec': message.get('stage_duration_sec'),
+        'report.status': message['stage_status'],
+        'report.run_url': message.get('run_url'),
+        }
+    enrich(data)
+    enrich_with_ticket(data, message.get('stage_message'))
+    return {
+        'run_message': _avoid_zero_symbol(message.get('stage_message')),
+        'run_cmdline': message['run_cmdline'],
+        'artifact_urls': message.get('artifact_urls', []),
+        'run_args': _pytest_style_test_name(message['run_cmdline']['args']),
+        'run_data': data,
+        }
 
 
 def _pytest_style_test_name(args):
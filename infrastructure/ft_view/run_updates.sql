@@ -64,3 +64,16 @@ BEGIN ATOMIC
         run_artifacts = array_cat(run.run_artifacts, excluded.run_artifacts),
         run_ticket = coalesce(run.run_ticket, excluded.run_ticket);
 END;
+
+CREATE FUNCTION pg_temp.store_updates(raws jsonb) RETURNS integer AS $func$
+DECLARE
+    raw jsonb;
+BEGIN
+    -- Updates of the same run may come in one batch. They are applied one by
+    -- one in order, like when they are stored separately.
+    FOR raw IN SELECT value FROM jsonb_array_elements(raws) WITH ORDINALITY ORDER BY ordinality LOOP
+        PERFORM pg_temp.store_update(raw);
+    END LOOP;
+    RETURN jsonb_array_length(raws);
+END;
+$func$ LANGUAGE plpgsql;
@@ -1,6 +1,4 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
-import time
-
 from infrastructure._logging import init_logging
 from infrastructure._message_broker_config import get_service_client
 from infrastructure._task_update import UpdateService
@@ -16,8 +14,7 @@ def main():
         FTViewJobReportFactory(),
         )
     while True:
-        update_service.process_one_update()
-        time.sleep(0.01)
+        update_service.process_updates(max_count=100, timeout_sec=5)
 
 
 if __name__ == '__main__':
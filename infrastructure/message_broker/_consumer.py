@@ -1,5 +1,6 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 
 from redis import Redis
@@ -21,7 +22,8 @@ class RedisConsumer(MessageInput):
         self._stream_name = stream_name
         self._group_name = group_name
         self._consumer_name = consumer_name
-        self._current_message_id: Optional[str] = None
+        self._unacknowledged_ids: Sequence[str] = []
+        self._pending_drained = False
         try:
             # Consumer group will read messages that arrives after group creation. To force
             # consumers to read messages from specific offset use XGROUP SETID command.
@@ -42,49 +44,52 @@ class RedisConsumer(MessageInput):
         return self._stream_name
 
     def read_message(self):
-        if self._current_message_id is not None:
-            raise RuntimeError("Refuse to read new message: unacknowledged message exists")
-        unacknowledged_message = self._get_unacknowledged_message()
-        if unacknowledged_message is not None:
-            [message_id, message_body] = unacknowledged_message
-            self._current_message_id = message_id
-            return message_body
-        unprocessed_message = self._get_unprocessed_message()
-        if unprocessed_message is not None:
-            [message_id, message_body] = unprocessed_message
-            self._current_message_id = message_id
-            return message_body
-        return None
+        messages = self.read_messages(1, timeout_sec=0.1)
+        if not messages:
+            return None
+        [message_body] = messages
+        return message_body
+
+    def read_messages(self, max_count, timeout_sec):
+        if self._unacknowledged_ids:
+            raise RuntimeError("Refuse to read new messages: unacknowledged messages exist")
+        messages = []
+        if not self._pending_drained:
+            # Messages, which were read but not acknowledged by a previous
+            # incarnation of this consumer, go first.
+            messages = self._read_group('0-0', max_count, block_ms=None)
+            # Since then, only this object reads for this consumer,
+            # and it refuses to read until messages are acknowledged.
+            self._pending_drained = not messages
+        if not messages:
+            block_ms = max(1, round(timeout_sec * 1000))
+            messages = self._read_group('>', max_count, block_ms=block_ms)
+        self._unacknowledged_ids = [message_id for message_id, _ in messages]
+        return [message_body for _, message_body in messages]
 
     def acknowledge(self):
-        if self._current_message_id is None:
+        if not self._unacknowledged_ids:
             return
-        self._redis.xack(self._stream_name, self._group_name, self._current_message_id)
-        self._current_message_id = None
+        self._redis.xack(self._stream_name, self._group_name, *self._unacknowledged_ids)
+        self._unacknowledged_ids = []
 
-    def _get_unacknowledged_message(self) -> Optional[Tuple[str, str]]:
-        response = self._redis.xreadgroup(
-            self._group_name,
-            self._consumer_name,
-            streams={self._stream_name: '0-0'},
-            block=5000,
-            count=1,
-            )
-        [[_stream_id, messages]] = response
-        if not messages:
-            return None
-        [[message_id, message_data]] = messages
-        return message_id, message_data['message_body']
-
-    def _get_unprocessed_message(self) -> Optional[Tuple[str, str]]:
+    def _read_group(
+            self,
+            start_id: str,
+            count: int,
+            block_ms: Optional[int],
+            ) -> Sequence[Tuple[str, str]]:
         response = self._redis.xreadgroup(
             self._group_name,
             self._consumer_name,
-            streams={self._stream_name: '>'},
-            block=100,  # milliseconds
-            count=1,
+            streams={self._stream_name: start_id},
+            block=block_ms,
+            count=count,
             )
         if not response:
-            return None
-        [[_stream_id, [[message_id, message_data]]]] = response
-        return message_id, message_data['message_body']
+            return []
+        [[_stream_id, messages]] = response
+        return [
+            (message_id, message_data['message_body'])
+            for message_id, message_data in messages
+            ]
@@ -46,6 +46,16 @@ class _FakeMessageInput(MessageInput):
         self._acknowledged = False
         return value
 
+    def read_messages(self, max_count, timeout_sec):
+        if not self._messages:
+            return []
+        if not self._acknowledged:
+            raise RuntimeError("Not acknowledged")
+        values = self._messages[:max_count]
+        del self._messages[:max_count]
+        self._acknowledged = False
+        return values
+
     def acknowledge(self):
         if self._acknowledged:
             raise RuntimeError("Already acknowledged")
@@ -15,6 +15,7 @@ from infrastructure.ft_view_job_requester._task import ft_task_db_to_redis
 from infrastructure.ft_view_job_updater._update_serializarion import ft_view_update_serialize
 from infrastructure.tests._fake_git import FakeGitRepo
 from infrastructure.tests._fake_task import make_fake_queue
+from infrastructure.worker import StopRequest
 from infrastructure.worker import Worker
 
 
@@ -45,6 +46,19 @@ class TestFTViewJobLifeCycle(unittest.TestCase):
     def test_job_failure_lifecycle(self):
         self._test_job_lifecycle('_failure_script.py', 'failed_with_code_11')
 
+    def test_persistent_worker(self):
+        self._fake_git_repo.add_file_to_stable(
+            'run_single_test.py', Path(__file__).with_name('_success_script.py').read_text())
+        self._task_ingress.process_one_task()
+        self._task_ingress.process_one_task()
+        self._worker.run_tasks(_StopWhenIdle(), idle_interval_sec=10)
+        statuses = []
+        while (message := self._update_input.read_message()) is not None:
+            self._update_input.acknowledge()
+            if 'output' not in json.loads(message):
+                statuses.append(json.loads(message)['status'])
+        self.assertEqual(statuses, ['enqueued', 'enqueued', 'running', 'succeed', 'running', 'succeed'])
+
     def _test_job_lifecycle(self, job_script: str, final_status: str):
         ft_view_job = _FakeFTViewJobInput.job
         self._fake_git_repo.add_file_to_stable(
@@ -83,6 +97,12 @@ class TestFTViewJobLifeCycle(unittest.TestCase):
         self._update_input.shutdown()
 
 
+class _StopWhenIdle(StopRequest):
+
+    def wait(self, timeout_sec):
+        self.set()
+
+
 class _FakeFTViewJobInput(TaskInput):
 
     _job_raw = Path(__file__).with_name('ft_view_job.json').read_bytes()
@@ -0,0 +1,101 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+
+from infrastructure.ft_view._memoized import CachedFailure
+from infrastructure.ft_view._memoized import memoized
+
+
+class TestMemoized(unittest.TestCase):
+
+    def test_result_is_cached(self):
+        calls = []
+
+        @memoized(max_size=10, ttl_sec=60, error_ttl_sec=60)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(double(1), 2)
+        self.assertEqual(double(1), 2)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(double.stats(), {'hits': 1, 'error_hits': 0, 'misses': 2, 'size': 2})
+
+    def test_result_expires(self):
+        calls = []
+
+        @memoized(max_size=10, ttl_sec=0.1, error_ttl_sec=0.1)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        double(1)
+        time.sleep(0.2)
+        double(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_least_recently_used_is_evicted(self):
+        calls = []
+
+        @memoized(max_size=2, ttl_sec=60, error_ttl_sec=60)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        for value in 1, 2, 1, 3, 1, 2:
+            double(value)
+        self.assertEqual(calls, [1, 2, 3, 2])
+
+    def test_failure_is_cached(self):
+        calls = []
+
+        @memoized(max_size=10, ttl_sec=60, error_ttl_sec=60)
+        def fail(value):
+            calls.append(value)
+            raise URLError("Connection refused")
+
+        with self.assertRaises(URLError) as first:
+            fail(1)
+        traceback_depth = _traceback_depth(first.exception)
+        with self.assertRaises(CachedFailure) as second:
+            fail(1)
+        with self.assertRaises(CachedFailure) as third:
+            fail(1)
+        self.assertEqual(calls, [1])
+        self.assertIs(second.exception.error, first.exception)
+        self.assertIsNot(third.exception, second.exception)
+        # Every raise of the same instance would add frames to its traceback.
+        self.assertEqual(_traceback_depth(first.exception), traceback_depth)
+
+    def test_concurrent_calls_are_made_once(self):
+        calls = []
+        started = threading.Event()
+        proceed = threading.Event()
+
+        @memoized(max_size=10, ttl_sec=60, error_ttl_sec=60)
+        def slow(value):
+            calls.append(value)
+            started.set()
+            proceed.wait(10)
+            return value
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(slow, 1) for _ in range(4)]
+            started.wait(10)
+            proceed.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(results, [1, 1, 1, 1])
+        self.assertEqual(calls, [1])
+
+
+def _traceback_depth(exception):
+    depth = 0
+    traceback = exception.__traceback__
+    while traceback is not None:
+        depth += 1
+        traceback = traceback.tb_next
+    return depth
@@ -0,0 +1,49 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import unittest
+
+from infrastructure._task_update import PermanentReportError
+from infrastructure._task_update import UpdateReportFactory
+from infrastructure._task_update import UpdateService
+from infrastructure.tests._fake_task import make_fake_queue
+
+
+class TestUpdateService(unittest.TestCase):
+
+    def test_process_updates_batch(self):
+        update_output, update_input = make_fake_queue('fake_updates')
+        for i in range(5):
+            update_output.write_message(f'update {i}')
+        report_factory = _FakeReportFactory()
+        service = UpdateService(update_input, report_factory)
+        service.process_updates(max_count=3, timeout_sec=0)
+        self.assertEqual(report_factory.store, ['update 0', 'update 1', 'update 2'])
+        service.process_updates(max_count=3, timeout_sec=0)
+        self.assertEqual(report_factory.store, [f'update {i}' for i in range(5)])
+        service.process_updates(max_count=3, timeout_sec=0)
+        self.assertEqual(len(report_factory.store), 5)
+        update_input.shutdown()
+
+    def test_permanent_failure_is_acknowledged(self):
+        update_output, update_input = make_fake_queue('fake_updates')
+        update_output.write_message('invalid')
+        update_output.write_message('update')
+        report_factory = _FakeReportFactory()
+        service = UpdateService(update_input, report_factory)
+        service.process_updates(max_count=10, timeout_sec=0)
+        self.assertEqual(report_factory.store, ['update'])
+        update_input.shutdown()
+
+
+class _FakeReportFactory(UpdateReportFactory):
+
+    def __init__(self):
+        self.store = []
+
+    def send_report(self, message_raw):
+        if message_raw == 'invalid':
+            raise PermanentReportError("Invalid update")
+        self.store.append(message_raw)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+from infrastructure.worker._worker import StopRequest
 from infrastructure.worker._worker import Worker
 
 __all__ = [
+    'StopRequest',
     'Worker',
     ]
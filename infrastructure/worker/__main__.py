@@ -1,5 +1,7 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import argparse
+import logging
+import signal
 import sys
 import time
 from typing import Sequence
@@ -8,36 +10,52 @@ from infrastructure._logging import init_logging
 from infrastructure._message_broker_config import get_default_client
 from infrastructure._uri import get_group_uri
 from infrastructure._uri import get_process_uri
+from infrastructure.worker._worker import StopRequest
 from infrastructure.worker._worker import Worker
 
+_logger = logging.getLogger(__name__)
+
 
 def main(args: Sequence[str]):
     parsed_args = _parse_args(args)
     worker_uri = get_process_uri()
     started_at = time.monotonic()
+    worker = _make_worker(worker_uri, parsed_args.input_stream, parsed_args.output_stream)
+    if parsed_args.persistent:
+        stop_requested = StopRequest()
+        # A running task is finished before exit. The unit must send SIGTERM
+        # only to the main process (KillMode=mixed) and wait long enough.
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: stop_requested.set())
+        worker.run_tasks(stop_requested, idle_interval_sec=10)
+        return
     try:
-        _run_single_task(worker_uri, parsed_args.input_stream, parsed_args.output_stream)
+        worker.run_single_task()
     finally:
+        _logger.info("Worker process finished in %.1f sec", time.monotonic() - started_at)
         # Limit worker restart rate. When queue is empty - workers are restarting too fast
         # and are reaching systemd internal restart limits.
         time.sleep(max(0., started_at + 10 - time.monotonic()))
 
 
-def _run_single_task(worker_uri: str, input_stream: str, output_stream: str):
+def _make_worker(worker_uri: str, input_stream: str, output_stream: str) -> Worker:
     message_broker = get_default_client()
-    worker = Worker(
+    return Worker(
         worker_uri,
         message_broker.get_consumer(input_stream, get_group_uri(), worker_uri),
         message_broker.get_producer(output_stream),
         message_broker.get_producer('ft:worker_state_updates'),
         )
-    worker.run_single_task()
 
 
 def _parse_args(args: Sequence[str]):
     parser = argparse.ArgumentParser()
     parser.add_argument('input_stream', help="Stream name to consume tasks from.")
     parser.add_argument('output_stream', help="Stream name to report task updates to.")
+    parser.add_argument(
+        '--persistent',
+        action='store_true',
+        help="Run tasks one after another until SIGTERM instead of a single task.",
+        )
     return parser.parse_args(args)
 
 
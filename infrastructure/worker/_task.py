@@ -1,14 +1,18 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import logging
 import os
+import queue
 import subprocess
 import sys
+import threading
 import time
 from contextlib import ExitStack
 from contextlib import contextmanager
 from pathlib import Path
+from typing import BinaryIO
 from typing import Generator
 from typing import Mapping
+from typing import Optional
 from typing import Protocol
 from typing import Sequence
 
@@ -26,6 +30,7 @@ class LocalTask:
         self._script = script
         self._args = args
         self._env = {**os.environ, **env}
+        self._idle_interval_sec = 1
 
     def run(
             self,
@@ -41,39 +46,24 @@ class LocalTask:
         with ExitStack() as es:
             console = es.enter_context(self._console(task_artifacts_root))
             console.log(f"Run args={self._args} cwd={run_dir}")
-            stdout_file = task_artifacts_root / 'stdout.txt'
-            with open(stdout_file, mode='wb') as stdout_output:
-                # Opened file descriptor for stdout file is inherited by the child process.
-                # Keeping it in this process is unnecessary.
-                process = subprocess.Popen(
-                    [sys.executable, *self._args[1:]],
-                    cwd=run_dir,
-                    stdin=subprocess.PIPE,
-                    stdout=stdout_output.fileno(),
-                    stderr=console.fileno(),
-                    env=self._env,
-                    )
+            stdout_output = es.enter_context(open(task_artifacts_root / 'stdout.txt', mode='wb'))
+            process = subprocess.Popen(
+                [sys.executable, *self._args[1:]],
+                cwd=run_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=console.fileno(),
+                env=self._env,
+                )
+            events = _ProcessEvents(process)
             input_bytes = self._script.encode('utf8')
             written_size = process.stdin.write(input_bytes)
             assert written_size == len(input_bytes)
             process.stdin.close()
-            stdout_input = es.enter_context(open(stdout_file, mode='rb'))
-            started_at = time.monotonic()
-            while True:
-                try:
-                    exit_code = process.wait(1)
-                except subprocess.TimeoutExpired:
-                    _logger.debug("Process pid=%d still running", process.pid)
-                    exit_code = None
-                stdout = stdout_input.read()
-                if stdout:
-                    yield stdout
-                if exit_code is not None:
-                    _logger.info("Script finished with exit code %d", exit_code)
-                    console.log(f"Command finished with {exit_code=}")
-                    task_status = 'succeed' if exit_code == 0 else f'failed_with_code_{exit_code}'
-                    break
-                elif time.monotonic() - started_at > timeout_sec:
+            deadline = time.monotonic() + timeout_sec
+            while not events.finished():
+                time_left = deadline - time.monotonic()
+                if time_left <= 0:
                     task_status = 'failed_timed_out'
                     process.kill()
                     # Avoid ResourceWarning from subprocess that process is still running,
@@ -83,6 +73,23 @@ class LocalTask:
                     except subprocess.TimeoutExpired:
                         _logger.warning("Process pid=%d is running after kill", process.pid)
                     break
+                chunk = events.wait_output(min(time_left, self._idle_interval_sec))
+                if chunk is not None:
+                    stdout_output.write(chunk)
+                    stdout_output.flush()
+                    yield chunk
+                elif not events.finished():
+                    _logger.debug("Process pid=%d still running", process.pid)
+                    # Let the consumer flush what it has buffered.
+                    yield b''
+            else:
+                exit_code = events.exit_code()
+                _logger.info("Script finished with exit code %d", exit_code)
+                console.log(f"Command finished with {exit_code=}")
+                task_status = 'succeed' if exit_code == 0 else f'failed_with_code_{exit_code}'
+            for chunk in events.take_remaining_output():
+                stdout_output.write(chunk)
+                yield chunk
             return task_status
 
     @contextmanager
@@ -93,6 +100,96 @@ class LocalTask:
             yield _Console(log_file)
 
 
+class _ProcessEvents:
+    """Receive output and exit code of a process as soon as they are available.
+
+    Blocking reads and waits are done in threads: selectors do not support
+    pipes on Windows. The process exit is noticed immediately, even if its
+    children keep the output pipe open.
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self._events = queue.SimpleQueue()
+        self._exit_code: Optional[int] = None
+        self._exited_at: Optional[float] = None
+        self._output_closed = False
+        self._output_grace_period_sec = 2
+        self._output_latency_sec = 0.1
+        self._output_size_limit = 64 * 1024
+        threading.Thread(target=self._read, args=[process.stdout], daemon=True).start()
+        threading.Thread(target=self._wait, args=[process], daemon=True).start()
+
+    def _read(self, pipe: BinaryIO):
+        with pipe:
+            while True:
+                chunk = pipe.read1(64 * 1024)
+                if not chunk:
+                    break
+                self._events.put(chunk)
+        self._events.put(_OutputClosed())
+
+    def _wait(self, process: subprocess.Popen):
+        self._events.put(_Exited(process.wait()))
+
+    def finished(self) -> bool:
+        if self._exit_code is None:
+            return False
+        if self._output_closed:
+            return True
+        # Children of the process may keep the output open.
+        return time.monotonic() - self._exited_at > self._output_grace_period_sec
+
+    def exit_code(self) -> int:
+        return self._exit_code
+
+    def wait_output(self, timeout_sec: float) -> Optional[bytes]:
+        """Wait for output and collect what comes shortly after it.
+
+        Output is returned when it reaches the size limit, when it's been
+        collected for longer than the latency limit or when the process
+        finishes.
+        """
+        output = bytearray()
+        deadline = time.monotonic() + timeout_sec
+        while not self.finished() and len(output) < self._output_size_limit:
+            if self._exit_code is not None:
+                deadline = min(deadline, self._exited_at + self._output_grace_period_sec)
+            try:
+                event = self._events.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if isinstance(event, bytes):
+                if not output:
+                    deadline = min(deadline, time.monotonic() + self._output_latency_sec)
+                output.extend(event)
+            elif isinstance(event, _Exited):
+                self._exit_code = event.exit_code
+                self._exited_at = time.monotonic()
+            else:
+                self._output_closed = True
+        return bytes(output) if output else None
+
+    def take_remaining_output(self) -> Sequence[bytes]:
+        chunks = []
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return chunks
+            if isinstance(event, bytes):
+                chunks.append(event)
+
+
+class _Exited:
+
+    def __init__(self, exit_code: int):
+        self.exit_code = exit_code
+
+
+class _OutputClosed:
+    pass
+
+
 class _Console:
 
     def __init__(self, buffer: '_ConsoleBuffer'):
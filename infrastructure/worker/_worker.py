@@ -41,15 +41,34 @@ class Worker:
     def __repr__(self):
         return f"<{self.__class__.__name__} {self._uri}>"
 
-    def run_single_task(self):
+    def run_tasks(self, stop_requested: 'StopRequest', idle_interval_sec: float):
+        """Run tasks back to back until stop is requested.
+
+        A running task is finished before return. Connections to the message
+        broker and caches of this object are kept between tasks.
+        """
+        throughput = _Throughput()
+        while not stop_requested.is_set():
+            started_at = time.monotonic()
+            if self.run_single_task():
+                throughput.add_task(time.monotonic() - started_at)
+                _logger.info("%r: %s", self, throughput)
+            else:
+                stop_requested.wait(idle_interval_sec)
+        _logger.info("%r: Stopped: %s", self, throughput)
+
+    def run_single_task(self) -> bool:
         _logger.info(
             "Worker %r started, task will be taken from %r, results will be reported to %r",
             self, self._input_stream, self._output_stream)
-        with self._get_raw_task() as task_raw:
-            if task_raw is None:
+        with self._get_raw_task() as [message, task_raw]:
+            if message is None:
                 _logger.info("Task queue is empty")
                 self._state_updates.send_idle()
-                return
+                return False
+            if task_raw is None:
+                # The message is acknowledged, other tasks may be in the queue.
+                return True
             clean_up_artifacts()
             run_id = f"{datetime.utcnow():%Y%m%d%H%M%S%f}-{os.getpid()}"
             artifacts_root = _ArtifactsRoot(run_id)
@@ -63,7 +82,7 @@ class Worker:
                 worker_log = artifacts_root.path() / 'worker.log'
                 worker_log.write_text(error)
                 task_update.send_extraction_failed(self._uri)
-                return
+                return True
             task_update.send_running(self._uri)
             self._state_updates.send_running_task(task_raw, artifacts_root.url())
             stdout = local_task.run(self._run_dir(), artifacts_root.path(), timeout_sec=3600)
@@ -76,6 +95,7 @@ class Worker:
                 task_update.send_output(chunk)
             _logger.info("%r finished; result %s", local_task, run_status)
             task_update.send_finished(run_status)
+            return True
 
     @contextmanager
     def _get_raw_task(self):
@@ -93,8 +113,9 @@ class Worker:
         else:
             task_raw = None
         # On unhandled exception message must not be acknowledged.
-        yield task_raw
-        self._input_stream.acknowledge()
+        yield message, task_raw
+        if message is not None:
+            self._input_stream.acknowledge()
 
     @lru_cache(1)
     def _run_dir(self) -> Path:
@@ -105,6 +126,28 @@ class Worker:
         return run_dir
 
 
+class StopRequest:
+    """Stop flag, which is set from a signal handler.
+
+    A threading.Event cannot be set there: the handler runs in the main
+    thread, which may hold the lock of the Event in wait() at the moment.
+    """
+
+    def __init__(self):
+        self._requested = False
+
+    def set(self):
+        self._requested = True
+
+    def is_set(self) -> bool:
+        return self._requested
+
+    def wait(self, timeout_sec: float):
+        finish_at = time.monotonic() + timeout_sec
+        while not self._requested and time.monotonic() < finish_at:
+            time.sleep(max(0, min(0.5, finish_at - time.monotonic())))
+
+
 class _ArtifactsRoot:
     _artifacts_root_absolute_path = get_ft_artifacts_root() / 'task-artifacts'
     _artifacts_root_relative_path = _artifacts_root_absolute_path.relative_to(Path('~/').expanduser())
@@ -125,6 +168,25 @@ class _ArtifactsRoot:
         return path
 
 
+class _Throughput:
+
+    def __init__(self):
+        self._started_at = time.monotonic()
+        self._task_count = 0
+        self._busy_sec = 0.
+
+    def add_task(self, duration_sec: float):
+        self._task_count += 1
+        self._busy_sec += duration_sec
+
+    def __str__(self):
+        uptime_sec = time.monotonic() - self._started_at
+        return (
+            f"{self._task_count} tasks in {uptime_sec:.0f} sec, "
+            f"busy {self._busy_sec:.0f} sec, "
+            f"{self._task_count / uptime_sec * 3600:.1f} tasks/hour")
+
+
 class CannotMakeLocalTask(Exception):
     pass
 
@@ -172,14 +234,22 @@ class TaskUpdate:
         self._output_total_size = 0
         self._output_buffer = bytearray()
         self._output_sent_at = float('-inf')
-        self._output_update_interval = 5
+        self._output_update_interval = 1
+        self._output_update_size = 16 * 1024
 
     def send_output(self, output_raw: bytes):
+        """Buffer output; send it when it's big enough or waited long enough.
+
+        Empty output_raw only lets buffered output be sent on time.
+        """
         if self._output_total_size > self._output_total_size_limit:
             return
         self._output_buffer.extend(output_raw)
-        if time.monotonic() - self._output_sent_at < self._output_update_interval:
+        if not self._output_buffer:
             return
+        if len(self._output_buffer) < self._output_update_size:
+            if time.monotonic() - self._output_sent_at < self._output_update_interval:
+                return
         cached_output_size = len(self._output_buffer)
         if self._output_total_size + cached_output_size > self._output_total_size_limit:
             _logger.debug("Output size limit exceeded. No more output updates will be sent")
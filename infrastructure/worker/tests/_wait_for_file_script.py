@@ -0,0 +1,9 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import os
+import time
+from pathlib import Path
+
+print("message to stdout", flush=True)
+file = Path(os.environ['WAIT_FOR_FILE'])
+while not file.exists():
+    time.sleep(0.1)
@@ -50,6 +50,20 @@ class LocalTaskScenarios(unittest.TestCase):
         logged_stdout = self._stdout_file.read_bytes().splitlines()
         self.assertTrue(expected_stdout_line in logged_stdout, logged_stdout)
 
+    def test_output_is_streamed(self):
+        # The script exits only after its output is received.
+        script = Path(__file__).with_name('_wait_for_file_script.py').read_text()
+        file = self._artifacts_root / 'output_received'
+        task = LocalTask(script, ['python3', '-'], {'WAIT_FOR_FILE': str(file)})
+        stdout_gen = task.run(Path(__file__).parent, self._artifacts_root, timeout_sec=30)
+        first_chunk = b''
+        while not first_chunk:
+            first_chunk = next(stdout_gen)
+        self.assertEqual(first_chunk.splitlines(), [b'message to stdout'])
+        file.touch()
+        [_stdout, run_status] = _get_script_result(stdout_gen)
+        self.assertEqual(run_status, 'succeed')
+
     def test_task_with_empty_script(self):
         task = LocalTask('', ['python3', '_success_script.py'], {})
         stdout_gen = task.run(Path(__file__).parent, self._artifacts_root, timeout_sec=1)
@@ -0,0 +1,61 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from directories import get_ft_artifacts_root
+from directories.filelocker import wait_locked_exclusively
+from distrib import Distrib
+from distrib import DistribMetadata
+from distrib import fetch_distrib_metadata
+
+_logger = logging.getLogger(__name__)
+
+# Metadata of a distrib dir rarely changes. Within this period, it's used
+# without requests; after it, it's validated with conditional requests.
+_fresh_sec = 300
+_lock_timeout_sec = 60
+
+
+def get_cached_distrib(url: str) -> Distrib:
+    """Make a Distrib from the metadata shared by all processes on the host."""
+    cache = _DistribMetadataCache(get_ft_artifacts_root() / 'distrib-metadata')
+    return Distrib(url, cache.get(url.rstrip('/')))
+
+
+class _DistribMetadataCache:
+
+    def __init__(self, root: Path):
+        root.mkdir(exist_ok=True)
+        self._root = root
+
+    def get(self, url: str) -> DistribMetadata:
+        path = self._root / (hashlib.sha256(url.encode()).hexdigest() + '.json')
+        cached = self._read(path)
+        if cached is not None and cached.age_sec() < _fresh_sec:
+            return cached
+        # A single process fetches while others wait and then take its result.
+        with wait_locked_exclusively(path.with_suffix('.lock'), _lock_timeout_sec):
+            cached = self._read(path)
+            if cached is not None and cached.age_sec() < _fresh_sec:
+                return cached
+            _logger.info("Fetch distrib metadata: %s, cached: %r", url, cached)
+            metadata = fetch_distrib_metadata(url, cached)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_bytes(metadata.serialize())
+            os.replace(tmp_path, path)
+        return metadata
+
+    @staticmethod
+    def _read(path: Path) -> Optional[DistribMetadata]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            return DistribMetadata.deserialize(data)
+        except (ValueError, KeyError, TypeError) as e:
+            _logger.warning("Corrupted distrib metadata cache %s: %s", path, e)
+            return None
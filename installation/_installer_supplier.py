@@ -16,6 +16,7 @@ from distrib import InstallerKey
 from distrib import InstallerName
 from distrib import InstallerOs
 from installation._arch import _arch_aliases
+from installation._distrib_cache import get_cached_distrib
 from installation._updates import LocalUpdateArchive
 from mediaserver_scenarios.prerequisite_upload import DirectUploadSupplier
 from mediaserver_scenarios.prerequisite_upload import Supplier
@@ -86,7 +87,7 @@ class ClassicInstallerSupplier(InstallerSupplier):
     def __init__(self, url: str):
         self._url = url
         store = make_prerequisite_store(url, get_ft_artifacts_root() / 'vms-installers')
-        distrib = Distrib(url)
+        distrib = get_cached_distrib(url)
         super().__init__(store, distrib, DirectUploadSupplier(store))
 
     def __repr__(self):
@@ -2,6 +2,7 @@
 import base64
 import io
 import ipaddress
+import json
 import logging
 import socket
 import tempfile
@@ -15,6 +16,7 @@ from collections.abc import Container
 from collections.abc import Iterable
 from collections.abc import Mapping
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractContextManager
 from contextlib import contextmanager
 from datetime import datetime
@@ -42,6 +44,7 @@ from mediaserver_api import MediaserverApiConnectionError
 from mediaserver_api import MediaserverApiHttpError
 from mediaserver_api import Testcamera
 from os_access import OsAccess
+from os_access import PosixAccess
 from os_access import RemotePath
 from os_access import Service
 from os_access import ServiceFailedDuringStop
@@ -569,12 +572,13 @@ class Mediaserver(BaseInstallation, metaclass=ABCMeta):
         for file in self.os_access.tmp().glob("*Nx_Witness_Server*.log"):
             file.unlink()
 
-    def collect_artifacts(self, artifacts_dir):
-        for file in self.list_log_files():
-            if file.exists():
-                self._copy_to_artifacts(file, artifacts_dir)
-        for backtrace in self.list_backtraces():
-            self._copy_to_artifacts(backtrace, artifacts_dir)
+    def collect_artifacts(self, artifacts_dir, bundle: bool = False):
+        """Copy logs, databases and settings to the artifacts.
+
+        Several files are copied at once. If a bundle is requested and
+        the OS can make it, the files are streamed as a single compressed
+        archive instead. Time spent on each file is saved as an artifact too.
+        """
         for core_dump in self.list_core_dumps():
             backtrace_path = self._make_artifact_path(
                 artifacts_dir, core_dump.name + '.backtrace.txt')
@@ -584,33 +588,68 @@ class Mediaserver(BaseInstallation, metaclass=ABCMeta):
                 backtrace_path.write_bytes(backtrace)
             except Exception:
                 _logger.exception("Cannot parse core dump: %s.", core_dump)
-        self._copy_to_artifacts(self.ecs_db, artifacts_dir)
-        self._copy_to_artifacts(self.mserver_db, artifacts_dir)
-        self._copy_to_artifacts(self._key_pair_file, artifacts_dir)
+        copies = self._list_artifact_copies(artifacts_dir)
+        if bundle and isinstance(self.os_access, PosixAccess):
+            try:
+                durations = self._bundle_artifacts([file for file, _ in copies], artifacts_dir)
+            except (CalledProcessError, TimeoutExpired):
+                _logger.exception("Cannot bundle artifacts; copy them one by one")
+            else:
+                self._save_artifact_durations(durations, artifacts_dir)
+                return
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix='collect_artifacts') as executor:
+            futures = {
+                str(file): executor.submit(self._copy_to_artifacts, file, target_dir)
+                for file, target_dir in copies
+                }
+        durations = {file: future.result() for file, future in futures.items()}
+        self._save_artifact_durations(durations, artifacts_dir)
+
+    def _list_artifact_copies(self, artifacts_dir):
+        copies = []
+        for file in self.list_log_files():
+            if file.exists():
+                copies.append((file, artifacts_dir))
+        for backtrace in self.list_backtraces():
+            copies.append((backtrace, artifacts_dir))
+        copies.append((self.ecs_db, artifacts_dir))
+        copies.append((self.mserver_db, artifacts_dir))
+        copies.append((self._key_pair_file, artifacts_dir))
         for customization in known_customizations.values():
-            self._collect_installation_logs(customization, artifacts_dir)
-        self._collect_ini_files(artifacts_dir)
+            for file in self.list_installer_log_files(customization):
+                copies.append((file, artifacts_dir))
+        for file in self._list_ini_files():
+            copies.append((file, artifacts_dir))
         for server_id, db_file in self.list_object_detection_db().items():
             db_dir = artifacts_dir / str(server_id)
             db_dir.mkdir(exist_ok=True)
-            self._copy_to_artifacts(db_file, db_dir)
+            copies.append((db_file, db_dir))
+        return copies
 
-    def _collect_ini_files(self, artifacts_dir: RemotePath):
+    def _list_ini_files(self):
         ini_dir = self._get_ini_dir()
         try:
-            ini_files = list(ini_dir.iterdir())
+            return list(ini_dir.iterdir())
         except FileNotFoundError:
             logging.info("INI dir %s does not exist. Skip INI collection", ini_dir)
-            return
-        for file in ini_files:
-            self._copy_to_artifacts(file, artifacts_dir)
+            return []
+
+    def _bundle_artifacts(self, files, artifacts_dir):
+        bundle_file = self._make_artifact_path(artifacts_dir, 'artifacts.tar.zst')
+        try:
+            with bundle_file.open('wb') as f:
+                return self.os_access.download_tar_zstd(files, f)
+        except Exception:
+            bundle_file.unlink(missing_ok=True)
+            raise
 
-    def _collect_installation_logs(self, customization, artifacts_dir):
-        for file in self.list_installer_log_files(customization):
-            self._copy_to_artifacts(file, artifacts_dir)
+    def _save_artifact_durations(self, durations, artifacts_dir):
+        durations_file = self._make_artifact_path(artifacts_dir, 'artifact_durations.json')
+        durations_file.write_text(json.dumps(durations, indent=4))
 
-    def _copy_to_artifacts(self, file, artifacts_dir):
+    def _copy_to_artifacts(self, file, artifacts_dir) -> float:
         artifact_file = self._make_artifact_path(artifacts_dir, file.name)
+        started_at = time.monotonic()
         attempt = 1
         while True:
             # noinspection PyBroadException
@@ -628,6 +667,7 @@ class Mediaserver(BaseInstallation, metaclass=ABCMeta):
                 error_file = artifact_file.with_name(artifact_file.name + '.exception.txt')
                 error_file.write_text(traceback.format_exc())
                 break
+        return time.monotonic() - started_at
 
     def _make_artifact_path(self, artifacts_dir, file_name):
         prefix = self.os_access.netloc().replace(':', '-')
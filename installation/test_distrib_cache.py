@@ -0,0 +1,53 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from distrib import DistribMetadata
+from distrib.recording_http_server import RecordingHTTPServer
+from installation._distrib_cache import _DistribMetadataCache
+
+
+class DistribMetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._root = TemporaryDirectory()
+        distrib_dir = Path(self._root.name, 'distrib')
+        distrib_dir.mkdir()
+        distrib_dir.joinpath('build_info.txt').write_text('version=6.1.0.1\n')
+        self._server = RecordingHTTPServer(self._root.name)
+        self.addCleanup(self._server.close)
+        self._url = self._server.url('/distrib')
+        self._cache_dir = Path(self._root.name, 'cache')
+        self._cache_dir.mkdir()
+
+    def tearDown(self):
+        self._root.cleanup()
+
+    def test_fresh_metadata_is_not_fetched(self):
+        first = _DistribMetadataCache(self._cache_dir).get(self._url)
+        self._server.responses.clear()
+        second = _DistribMetadataCache(self._cache_dir).get(self._url)
+        self.assertEqual(self._server.responses, [])
+        self.assertEqual(second.content('build_info.txt'), first.content('build_info.txt'))
+        self.assertEqual(second.validated_at, first.validated_at)
+
+    def test_stale_metadata_is_validated(self):
+        _DistribMetadataCache(self._cache_dir).get(self._url)
+        [cache_file] = self._cache_dir.glob('*.json')
+        stale = DistribMetadata.deserialize(cache_file.read_bytes())
+        stale.validated_at -= 3600
+        cache_file.write_bytes(stale.serialize())
+        self._server.responses.clear()
+        metadata = _DistribMetadataCache(self._cache_dir).get(self._url)
+        self.assertIn(('/distrib/build_info.txt', 304), self._server.responses)
+        self.assertEqual(metadata.content('build_info.txt'), b'version=6.1.0.1\n')
+        self.assertGreater(DistribMetadata.deserialize(cache_file.read_bytes()).validated_at, stale.validated_at)
+
+    def test_corrupted_cache_is_replaced(self):
+        _DistribMetadataCache(self._cache_dir).get(self._url)
+        [cache_file] = self._cache_dir.glob('*.json')
+        cache_file.write_bytes(b'{"url": ')
+        metadata = _DistribMetadataCache(self._cache_dir).get(self._url)
+        self.assertEqual(metadata.content('build_info.txt'), b'version=6.1.0.1\n')
+        DistribMetadata.deserialize(cache_file.read_bytes())
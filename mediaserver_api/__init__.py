@@ -44,6 +44,7 @@ from mediaserver_api._groups import Groups
 from mediaserver_api._http import CannotHandleRequest
 from mediaserver_api._http import CannotObtainToken
 from mediaserver_api._http import HttpBearerAuthHandler
+from mediaserver_api._http import http_connection_pool_stats
 from mediaserver_api._http_auth import calculate_digest
 from mediaserver_api._http_exceptions import BadRequest
 from mediaserver_api._http_exceptions import Forbidden
@@ -94,6 +95,7 @@ from mediaserver_api._storage import StorageUnavailable
 from mediaserver_api._storage import WrongPathError
 from mediaserver_api._testcamera_data import Testcamera
 from mediaserver_api._time_period import TimePeriod
+from mediaserver_api._time_period import TimePeriodSet
 from mediaserver_api._users import Permissions
 from mediaserver_api._users import PermissionsV3
 from mediaserver_api._users import ResourceGroups
@@ -164,6 +166,7 @@ __all__ = [
     'StorageUnavailable',
     'Testcamera',
     'TimePeriod',
+    'TimePeriodSet',
     'Transaction',
     'TransactionBusSocket',
     'TransactionBusSocketError',
@@ -187,6 +190,7 @@ __all__ = [
     'generate_storage',
     'generate_videowall',
     'generate_videowall_with_items',
+    'http_connection_pool_stats',
     'log_diff_list',
     'log_full_info_diff',
     'raw_differ',
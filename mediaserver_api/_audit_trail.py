@@ -15,8 +15,8 @@ class AuditTrail(BaseQueue):
     """Event queue for `api/auditLog`."""
 
     def __init__(self, api, skip_initial_records=True):
-        super().__init__()
-        self._api = api
+        # A transaction bus connection would add its own records.
+        super().__init__(api, wake_on_transactions=False)
         if skip_initial_records:
             self.wait_for_sequence()
 
@@ -56,9 +56,14 @@ class AuditTrail(BaseQueue):
                 return NotImplemented
             return self._identity == other_record._identity
 
-    def _load_events(self):
+    def _load_events(self, since_sec):
+        # Audit log requests are not filtered by time on the Server side:
+        # only the records not older than since_sec are compared.
         return self._api.list_audit_trail_records()
 
+    def _get_time_sec(self, record):
+        return record.created_time_sec
+
     def _ensure_no_records_follow(self, timeout_sec=5):
         if timeout_sec > 0:
             try:
@@ -7,6 +7,9 @@ from abc import ABCMeta
 from abc import abstractmethod
 from pprint import pformat
 
+from websocket import WebSocketException
+from websocket import WebSocketTimeoutException
+
 _logger = logging.getLogger(__name__)
 
 
@@ -17,51 +20,109 @@ class BaseQueue(metaclass=ABCMeta):
 
     Mediaserver doesn't contain event id in api/getEvents and api/auditLog.
     createdTimeSec is quite coarse - the second precision.
+    Hence, events are loaded starting from the time of the last loaded one,
+    and the events of that time, which are loaded again, are compared with
+    the ones loaded before.
+
+    Events are reloaded once a second. If the queue wakes on transactions,
+    a transaction makes it reload earlier, but not more often than
+    _min_reload_interval_sec. The transaction bus is only connected while
+    waiting.
     """
 
-    def __init__(self):
+    _reload_interval_sec = 1
+    _min_reload_interval_sec = 0.2
+
+    def __init__(self, api, wake_on_transactions=False):
+        self._api = api
         self._events = []
         self._returned_event_count = 0
+        self._wake_on_transactions = wake_on_transactions
+        self._transaction_bus = None
 
     @abstractmethod
-    def _load_events(self):
+    def _load_events(self, since_sec: float):
+        """Load events not older than since_sec; older ones may be returned too."""
         pass
 
     @abstractmethod
     def _make_record(self, record_data):
         return record_data
 
+    @abstractmethod
+    def _get_time_sec(self, record) -> float:
+        pass
+
     def _reload_events(self):
-        new_events = self._load_events()
+        since_sec = self._get_time_sec(self._events[-1]) if self._events else 0
+        new_events = self._load_events(since_sec)
         _logger.debug(
             'Loaded events:\n%s',
             pformat(new_events),
             )
         # Convert new events into named tuples list.
         new_events = [self._make_record(event) for event in new_events]
-
-        for i, (old_event, new_event) in enumerate(zip(self._events, new_events)):
+        new_events = [event for event in new_events if self._get_time_sec(event) >= since_sec]
+        reloaded_start = len(self._events)
+        while reloaded_start > 0 and self._get_time_sec(self._events[reloaded_start - 1]) >= since_sec:
+            reloaded_start -= 1
+        reloaded_events = self._events[reloaded_start:]
+        for i, (old_event, new_event) in enumerate(zip(reloaded_events, new_events), reloaded_start):
             if old_event != new_event:
                 raise RuntimeError(
                     "Event sequence failure #{}: {} != {}".format(
                         i, old_event, new_event))
-        self._events = new_events
+        self._events.extend(new_events[len(reloaded_events):])
+
+    def _sleep_until_reload(self, reloaded_at: float):
+        min_reload_at = reloaded_at + self._min_reload_interval_sec
+        reload_at = reloaded_at + self._reload_interval_sec
+        if self._wake_on_transactions:
+            try:
+                self._wait_for_transaction(reload_at - time.monotonic())
+            except (WebSocketException, ConnectionError) as e:
+                _logger.info("Transaction bus failed, keep waiting for events without it: %s", e)
+                self._close_transaction_bus()
+                self._wake_on_transactions = False
+            else:
+                reload_at = min_reload_at
+        time.sleep(max(0, reload_at - time.monotonic()))
+
+    def _wait_for_transaction(self, timeout_sec: float):
+        if self._transaction_bus is None:
+            if self._api.auth_type == 'bearer':
+                # As in TransactionBusSocket: the websocket doesn't refresh an expired token.
+                self._api.refresh_session()
+            self._transaction_bus = self._api.open_transaction_bus_websocket()
+        self._transaction_bus.settimeout(max(timeout_sec, 0.01))
+        try:
+            self._transaction_bus.recv()
+        except WebSocketTimeoutException:
+            pass
+
+    def _close_transaction_bus(self):
+        if self._transaction_bus is not None:
+            self._transaction_bus.close()
+            self._transaction_bus = None
 
     def wait_for_next(self, timeout_sec: float = 30):
         if self._returned_event_count == len(self._events):
             started_at = time.monotonic()
+            try:
+                while True:
+                    reloaded_at = time.monotonic()
+                    self._reload_events()
 
-            while True:
-                self._reload_events()
-
-                if self._returned_event_count < len(self._events):
-                    break
+                    if self._returned_event_count < len(self._events):
+                        break
 
-                if time.monotonic() > started_at + timeout_sec:
-                    raise EventNotOccurred(
-                        f"Timed out ({timeout_sec} seconds) waiting for event")
+                    if time.monotonic() > started_at + timeout_sec:
+                        raise EventNotOccurred(
+                            f"Timed out ({timeout_sec} seconds) waiting for event")
 
-                time.sleep(1)
+                    self._sleep_until_reload(reloaded_at)
+            finally:
+                self._close_transaction_bus()
 
         event = self._events[self._returned_event_count]
         self._returned_event_count += 1
@@ -55,6 +55,7 @@ import fnmatch
 import json
 import logging
 import math
+import re
 from collections import namedtuple
 from itertools import zip_longest
 from uuid import UUID
@@ -146,11 +147,110 @@ class PathPattern:
         return True
 
 
+class _PatternTrie:
+    """Find the first pattern matching a path, walking the path only once.
+
+    >>> trie = _PatternTrie([
+    ...     (PathPattern('abc/*/xyz'), 1),
+    ...     (PathPattern('abc/d*'), 2),
+    ...     (PathPattern('abc/**'), 3),
+    ...     (PathPattern(''), 4),
+    ...     ])
+    >>> [trie.find(path) for path in [['abc', 'def', 'xyz'], ['abc', 'def'], ['abc'], [], ['xyz'], ['abc', 0]]]
+    [1, 2, 3, 4, None, 3]
+    """
+
+    def __init__(self, patterns_values):
+        self._end = None  # (index, value) of a pattern ending here
+        self._any_tail = None  # (index, value) of a pattern ending with '**'
+        self._literal = {}
+        self._wildcards = {}  # Compiled segment with '*', '?' or '[': trie
+        for index, (pattern, value) in enumerate(patterns_values):
+            self._add(pattern._pattern, (index, value))
+
+    def _add(self, segments, indexed_value):
+        node = self
+        for segment in segments:
+            if segment == '**':
+                if node._any_tail is None:
+                    node._any_tail = indexed_value
+                return
+            if any(c in segment for c in '*?['):
+                children = node._wildcards
+            else:
+                children = node._literal
+            if segment not in children:
+                children[segment] = _PatternTrie([])
+            node = children[segment]
+        if node._end is None:
+            node._end = indexed_value
+
+    def find(self, path):
+        best = self._find(path, 0)
+        return None if best is None else best[1]
+
+    def _find(self, path, depth):
+        candidates = [self._any_tail]
+        if depth == len(path):
+            candidates.append(self._end)
+        else:
+            key = path[depth]
+            if isinstance(key, int):
+                # Non-keyed list items are never matched by index in pattern
+                matching = [self._wildcards['*']] if '*' in self._wildcards else []
+            else:
+                matching = [
+                    node for segment, node in self._wildcards.items()
+                    if _compiled_segment(segment).match(key)
+                    ]
+                if key in self._literal:
+                    matching.append(self._literal[key])
+            candidates.extend(node._find(path, depth + 1) for node in matching)
+        candidates = [c for c in candidates if c is not None]
+        return min(candidates, key=lambda c: c[0]) if candidates else None
+
+
+_compiled_segments = {}
+
+
+def _compiled_segment(segment):
+    try:
+        return _compiled_segments[segment]
+    except KeyError:
+        compiled = _compiled_segments[segment] = re.compile(fnmatch.translate(segment))
+        return compiled
+
+
+def _have_same_types(x, y):
+    # Values are known to be equal. Types are checked, since 1 == 1.0 == True
+    # and an approximate value is equal to a number, but the differ reports those.
+    if type(x) is not type(y):
+        return False
+    if type(x) is dict:
+        pairs = ((value, y[key]) for key, value in x.items())
+    elif type(x) in (list, tuple):
+        pairs = zip(x, y)
+    else:
+        return True
+    for x_value, y_value in pairs:
+        if type(x_value) is not type(y_value):
+            return False
+        if type(x_value) in (dict, list, tuple) and not _have_same_types(x_value, y_value):
+            return False
+    return True
+
+
 class DataDiffer:
+    """Compare nested structures, skipping equal subtrees.
+
+    Before a dict or a list is compared element by element, it's compared
+    as a whole, which is done in C, and only types are checked then.
+    """
 
     def __init__(self, name, key_map=None):
         self.name = name
         self._key_map = key_map or []  # (PathPattern, KeyInfo) list
+        self._key_trie = _PatternTrie(self._key_map)
 
     def __str__(self):
         return self.name
@@ -174,11 +274,15 @@ class DataDiffer:
             y_type_name = type(y).__name__
             message = 'Different element types: x has %s, y has %s' % (x_type_name, y_type_name)
             return [Diff(path, None, 'changed', x, y, message)]
+        if isinstance(x, (list, tuple, dict)) and x == y and _have_same_types(x, y):
+            return []
         if isinstance(x, (list, tuple)):
             return self._diff_seq(path, x, y)
         if isinstance(x, dict):
             return self._diff_dict(path, x, y)
         if isinstance(x, str):
+            if x == y:
+                return []
             # Some values in the mediaserver DB may be JSON-encoded structures,
             # which may differ in formatting (spaces between keys and values).
             try:
@@ -205,10 +309,7 @@ class DataDiffer:
             return []
 
     def _find_key_info(self, path):
-        for pattern, key_info in self._key_map:
-            if pattern.match(path):
-                return key_info
-        return None
+        return self._key_trie.find(path)
 
     def _diff_seq(self, path, x, y):
         key_info = self._find_key_info(path)
@@ -20,9 +20,9 @@ class EventQueue(BaseQueue):
             self,
             api,
             wait_for_start_server=True,
+            wake_on_transactions=True,
             ):
-        super().__init__()
-        self._api = api
+        super().__init__(api, wake_on_transactions)
         if wait_for_start_server:
             # 5 seconds is enough for waiting start event, usually the mediaserver sends
             # the event immediately after start, but on ARM devices it can take 3-4 seconds.
@@ -62,9 +62,12 @@ class EventQueue(BaseQueue):
             aggregation_count=record_data['aggregationCount'],
             )
 
-    def _load_events(self):
+    def _load_events(self, since_sec):
         # `from` is mandatory parameter
-        return self._api.http_get('api/getEvents', {'from': 0})
+        return self._api.http_get('api/getEvents', {'from': int(since_sec * 1000)})
+
+    def _get_time_sec(self, record):
+        return record.event_date.timestamp()
 
 
 class Rule(BaseResource):
@@ -1,12 +1,15 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import base64
+import functools
 import json
+import select
 import ssl
+import threading
+import time
 import urllib.parse
 import urllib.request
 from abc import ABCMeta
 from abc import abstractmethod
-from contextlib import closing
 from http.client import HTTPResponse as BaseHttpResponse
 from http.client import HTTPSConnection as BaseHttpsConnection
 from typing import Any
@@ -38,23 +41,114 @@ def http_request(
     headers = {'Connection': 'Keep-Alive', **headers}
     request = _HttpRequest(method, url, content, headers)
     parsed_url = urllib.parse.urlparse(url)
+    key = (parsed_url.hostname, parsed_url.port, ca_cert)
+    connection, reused = _connection_pool.take(key, timeout)
+    try:
+        try:
+            response = connection.send_request(request, auth_handler)
+        except _STALE_CONNECTION_ERRORS:
+            if not reused or method.upper() not in _IDEMPOTENT_METHODS:
+                raise
+            # Server closed the idle keep-alive connection. Nothing has
+            # been received, but the server might have processed the request.
+            # Only requests, which may be repeated, are sent again.
+            connection.close()
+            _connection_pool.count_reconnect()
+            connection = _connection_pool.make_connection(key, timeout)
+            response = connection.send_request(request, auth_handler)
+    except (ConnectionError, ssl.SSLEOFError, ssl.SSLZeroReturnError):
+        connection.close()
+        raise HttpConnectionError()
+    except TimeoutError:
+        connection.close()
+        raise HttpReadTimeout()
+    except BaseException:
+        connection.close()
+        raise
+    _connection_pool.give_back(key, connection)
+    return response
+
+
+def http_connection_pool_stats() -> Mapping[str, int]:
+    return _connection_pool.stats()
+
+
+class _ConnectionPool:
+    """Keep idle keep-alive connections to reuse them in subsequent requests.
+
+    Each request pays a TCP and TLS handshake otherwise. Connections are
+    pooled per host, port and CA certificate. A connection is checked out
+    exclusively; it's returned after the response is read completely.
+    """
+
+    def __init__(self, max_idle_per_key: int, max_idle_sec: float):
+        self._max_idle_per_key = max_idle_per_key
+        self._max_idle_sec = max_idle_sec
+        self._idle: dict[tuple, list[tuple[float, _HttpsConnection]]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._reconnects = 0
+        self._evicted = 0
+
+    def take(self, key: tuple, timeout: float) -> tuple['_HttpsConnection', bool]:
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    self._misses += 1
+                    break
+                released_at, connection = idle.pop()
+            if time.monotonic() - released_at > self._max_idle_sec or connection.is_dropped():
+                with self._lock:
+                    self._evicted += 1
+                connection.close()
+                continue
+            with self._lock:
+                self._hits += 1
+            connection.set_timeout(timeout)
+            return connection, True
+        return self.make_connection(key, timeout), False
+
+    def make_connection(self, key: tuple, timeout: float) -> '_HttpsConnection':
+        [host, port, ca_cert] = key
+        return _HttpsConnection(host, port, _get_ssl_context(ca_cert), timeout=timeout)
+
+    def give_back(self, key: tuple, connection: '_HttpsConnection'):
+        if connection.sock is None:
+            # The server asked to close the connection.
+            return
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            idle.append((time.monotonic(), connection))
+            if len(idle) <= self._max_idle_per_key:
+                return
+            [_released_at, oldest] = idle.pop(0)
+            self._evicted += 1
+        oldest.close()
+
+    def count_reconnect(self):
+        with self._lock:
+            self._reconnects += 1
+
+    def stats(self) -> Mapping[str, int]:
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'reconnects': self._reconnects,
+                'evicted': self._evicted,
+                'idle': sum(len(idle) for idle in self._idle.values()),
+                }
+
+
+@functools.lru_cache()
+def _get_ssl_context(ca_cert: Optional[str]) -> ssl.SSLContext:
+    # Loading of the CA certificates takes a while, especially the system ones.
     ssl_context = ssl.create_default_context()
     if ca_cert is not None:
         ssl_context.load_verify_locations(ca_cert)
-    with closing(
-            _HttpsConnection(
-                parsed_url.hostname,
-                parsed_url.port,
-                ssl_context,
-                auth_handler,
-                timeout=timeout,
-                )) as connection:  # type: _HttpsConnection
-        try:
-            return connection.send_request(request)
-        except (ConnectionError, ssl.SSLEOFError, ssl.SSLZeroReturnError):
-            raise HttpConnectionError()
-        except TimeoutError:
-            raise HttpReadTimeout()
+    return ssl_context
 
 
 class _HttpRequest:
@@ -106,23 +200,41 @@ class _HttpsConnection(BaseHttpsConnection):
             host: str,
             port: int,
             ssl_context: ssl.SSLContext,
-            auth_handler: Optional['AuthHandler'] = None,
             timeout: Optional[float] = None,
             ):
         super().__init__(host, port, timeout=timeout, context=ssl_context)
-        self._auth_handler = auth_handler
 
-    def send_request(self, request: _HttpRequest) -> _HttpResponse:
-        if self._auth_handler is not None:
+    def set_timeout(self, timeout: float):
+        self.timeout = timeout
+        if self.sock is not None:
+            self.sock.settimeout(timeout)
+
+    def is_dropped(self) -> bool:
+        """Tell if an idle connection is closed (or broken) by the server.
+
+        An idle connection must not have anything to read. If it's readable,
+        the server either closed it or sent something unexpected.
+        """
+        if self.sock is None:
+            return False
+        [readable, _, _] = select.select([self.sock], [], [], 0)
+        return bool(readable)
+
+    def send_request(
+            self,
+            request: _HttpRequest,
+            auth_handler: Optional['AuthHandler'] = None,
+            ) -> _HttpResponse:
+        if auth_handler is not None:
             try:
-                self._auth_handler.authorize_request(request)
+                auth_handler.authorize_request(request)
             except _CannotAuthorizeRequest:
                 pass
         super().request(request.method, request.url, request.content, request.headers)
         response = _HttpResponse(super().getresponse(), request.method, request.url)
-        if response.status_code in (401, 403) and self._auth_handler is not None:
+        if response.status_code in (401, 403) and auth_handler is not None:
             try:
-                self._auth_handler.handle_failed_request(request, response)
+                auth_handler.handle_failed_request(request, response)
             except CannotHandleRequest:
                 return response
             super().request(request.method, request.url, request.content, request.headers)
@@ -347,3 +459,14 @@ class HttpReadTimeout(Exception):
 
 class HttpConnectionError(Exception):
     pass
+
+
+_STALE_CONNECTION_ERRORS = (
+    BrokenPipeError,
+    ConnectionResetError,  # Also http.client.RemoteDisconnected.
+    ConnectionAbortedError,
+    ssl.SSLEOFError,
+    ssl.SSLZeroReturnError,
+    )
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+_connection_pool = _ConnectionPool(max_idle_per_key=4, max_idle_sec=10)
@@ -2286,11 +2286,8 @@ class MediaserverApi(metaclass=ABCMeta):
     def _skip_recorded_periods(listed, to_skip):
         result = []
         for camera_periods, camera_skip_periods in zip(listed, to_skip):
-            new_camera_periods = []
-            for period in camera_periods:
-                if period not in camera_skip_periods:
-                    new_camera_periods.append(period)
-            result.append(new_camera_periods)
+            camera_skip_periods = set(camera_skip_periods)
+            result.append([period for period in camera_periods if period not in camera_skip_periods])
         return result
 
     @staticmethod
@@ -2874,8 +2871,8 @@ class MediaserverApi(metaclass=ABCMeta):
             raise RuntimeError(
                 f"Timed out ({timeout_sec} seconds) waiting for servers time synchronized.")
 
-    def event_queue(self, wait_for_start_server=True):
-        return EventQueue(self, wait_for_start_server)
+    def event_queue(self, wait_for_start_server=True, wake_on_transactions=True):
+        return EventQueue(self, wait_for_start_server, wake_on_transactions)
 
     def audit_trail(self, skip_initial_records=True):
         return AuditTrail(self, skip_initial_records=skip_initial_records)
@@ -2,15 +2,18 @@
 """Wait for mediaservers to synchronize between themselves."""
 import json
 import logging
+import threading
 import time
 
 from mediaserver_api._diff_schemes import transaction_log_differ
 from mediaserver_api._mediaserver import log_full_info_diff
-from mediaserver_api._message_bus import wait_until_no_transactions
+from mediaserver_api._message_bus import TransactionBusSocket
+from mediaserver_api._message_bus import TransactionBusSocketError
 
 _logger = logging.getLogger(__name__)
 
 MEDIASERVER_MERGE_TIMEOUT_SEC: float = 5 * 60
+_recheck_sec = 10
 
 
 def _servers_info_synced(servers):
@@ -42,51 +45,139 @@ def _save_json_artifact(artifacts_dir, name, data):
     file_path.write_text(json.dumps(data, indent=4))
 
 
-def _wait_for_transaction_logs_synced(servers, timeout_sec, artifacts_dir):
+def _find_transaction_logs_diff(servers):
     [first_server, *other_servers] = servers
-    started_at = time.monotonic()
-    while True:
-        first_server_logs = first_server.api.get_transaction_log()
-        for other_server in other_servers:
-            other_server_logs = other_server.api.get_transaction_log()
-            diff_list = transaction_log_differ.diff(first_server_logs, other_server_logs)
-            if diff_list:
-                _logger.info(
-                    "Transaction logs from %r and %r are different",
-                    first_server,
-                    other_server,
-                    )
-                for log_line in diff_list:
-                    _logger.debug(log_line)
-                break
-        else:
-            break
-        if time.monotonic() - started_at < timeout_sec:
-            _logger.info("Waiting for transaction logs synchronization")
-            time.sleep(1)
-            continue
-        first_server_name = first_server.api.get_server_name()
-        _save_json_artifact(
-            artifacts_dir,
-            f'transaction_logs-{first_server_name}',
-            first_server_logs,
-            )
-        other_server_name = other_server.api.get_server_name()
-        _save_json_artifact(
-            artifacts_dir,
-            f'transaction_logs-{other_server_name}',
-            other_server_logs,
-            )
-        raise RuntimeError(f"Transaction logs did not sync in {timeout_sec} seconds")
+    first_server_logs = first_server.api.get_transaction_log()
+    for other_server in other_servers:
+        other_server_logs = other_server.api.get_transaction_log()
+        diff_list = transaction_log_differ.diff(first_server_logs, other_server_logs)
+        if diff_list:
+            _logger.info(
+                "Transaction logs from %r and %r are different",
+                first_server,
+                other_server,
+                )
+            for log_line in diff_list:
+                _logger.debug(log_line)
+            return [(first_server, first_server_logs), (other_server, other_server_logs)]
+    return None
+
+
+class _TransactionBuses:
+    """Follow transaction buses of several servers in background threads.
+
+    For each bus, the last sequence number of each peer database is kept.
+    Servers can't be in sync while their buses disagree on them.
+    """
+
+    def __init__(self, servers):
+        self._sockets = [TransactionBusSocket(server.api) for server in servers]
+        self._lock = threading.Lock()
+        self._sequences = [{} for _ in servers]
+        self._last_received_at = time.monotonic()
+        self._received = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._receive, args=(index,), name=f'transaction_bus_{index}', daemon=True)
+            for index in range(len(self._sockets))
+            ]
+
+    def __enter__(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        for transaction_socket in self._sockets:
+            transaction_socket.close()
+
+    def _receive(self, index):
+        transaction_socket = self._sockets[index]
+        while not self._stopped.is_set():
+            try:
+                transaction = transaction_socket.get_transaction()
+            except TransactionBusSocketError as e:
+                # Transactions sent while reconnecting are lost: the
+                # comparison of the servers must not be skipped.
+                _logger.debug("Error on receiving transaction: %s", e)
+                try:
+                    transaction_socket.reset()
+                except Exception:
+                    _logger.exception("Failed to reconnect to transaction bus")
+                    self._stopped.wait(1)
+                with self._lock:
+                    self._sequences[index].clear()
+                    self._last_received_at = time.monotonic()
+                self._received.set()
+                continue
+            if transaction is None:
+                continue
+            persistent_id = transaction.get_persistent_id()
+            with self._lock:
+                if persistent_id is not None:
+                    [peer_id, db_id, sequence] = persistent_id
+                    sequences = self._sequences[index]
+                    sequences[peer_id, db_id] = max(sequence, sequences.get((peer_id, db_id), 0))
+                self._last_received_at = time.monotonic()
+            self._received.set()
+
+    def wait_until_quiet(self, silence_sec: float, timeout_sec: float):
+        started_at = time.monotonic()
+        while True:
+            with self._lock:
+                quiet_sec = time.monotonic() - self._last_received_at
+            if quiet_sec > silence_sec:
+                _logger.debug("No transactions for %.2f seconds", silence_sec)
+                return
+            if time.monotonic() - started_at > timeout_sec:
+                raise RuntimeError(f"Timed out waiting for no transactions for {timeout_sec} seconds")
+            time.sleep(silence_sec - quiet_sec)
+
+    def wait_for_transaction(self, timeout_sec: float) -> bool:
+        self._received.clear()
+        return self._received.wait(timeout_sec)
+
+    def sequences_match(self) -> bool:
+        with self._lock:
+            for peer_db in set().union(*self._sequences):
+                if len({sequences.get(peer_db) for sequences in self._sequences}) > 1:
+                    _logger.info("Servers have seen different transactions of %s", peer_db)
+                    return False
+        return True
 
 
 def wait_for_servers_synced(artifacts_dir, server_list):
+    """Wait until the servers have the same data and transaction logs.
+
+    Transaction buses of all servers are followed. Servers are compared only
+    when the buses go quiet and agree on the transactions seen, and then only
+    after new transactions or after a long silence.
+    """
     start_time = time.monotonic()
 
     def timeout_left_sec():
         return MEDIASERVER_MERGE_TIMEOUT_SEC - (time.monotonic() - start_time)
 
-    [_, mediaserver, *_] = server_list
-    wait_until_no_transactions(mediaserver.api, silence_sec=3, timeout_sec=timeout_left_sec())
-    wait_for_servers_info_synced(server_list, timeout_sec=timeout_left_sec())
-    _wait_for_transaction_logs_synced(server_list, timeout_left_sec(), artifacts_dir)
+    with _TransactionBuses(server_list) as buses:
+        compare_anyway = False
+        while True:
+            buses.wait_until_quiet(silence_sec=3, timeout_sec=timeout_left_sec())
+            logs_diff = None
+            if buses.sequences_match() or compare_anyway:
+                if _servers_info_synced(server_list):
+                    logs_diff = _find_transaction_logs_diff(server_list)
+                    if logs_diff is None:
+                        return
+            if timeout_left_sec() <= 0:
+                break
+            _logger.info("Waiting for servers to sync")
+            compare_anyway = not buses.wait_for_transaction(min(_recheck_sec, timeout_left_sec()))
+    if logs_diff is not None:
+        for server, logs in logs_diff:
+            server_name = server.api.get_server_name()
+            _save_json_artifact(artifacts_dir, f'transaction_logs-{server_name}', logs)
+        raise RuntimeError(f"Transaction logs did not sync in {MEDIASERVER_MERGE_TIMEOUT_SEC} seconds")
+    raise RuntimeError(f"Servers did not sync in {MEDIASERVER_MERGE_TIMEOUT_SEC} seconds")
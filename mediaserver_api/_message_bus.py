@@ -8,6 +8,7 @@ from functools import lru_cache
 from typing import Any
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 
 from websocket import WebSocketException
 from websocket import WebSocketTimeoutException
@@ -71,6 +72,9 @@ class TransactionBusSocket:
         self._websocket.close()
         self._websocket = self._create_websocket()
 
+    def close(self):
+        self._websocket.close()
+
 
 class Transaction:
 
@@ -92,6 +96,19 @@ class Transaction:
     def _parse(self) -> Mapping[str, Any]:
         return json.loads(self._raw)
 
+    @lru_cache(1)
+    def get_persistent_id(self) -> Optional[Tuple[str, str, int]]:
+        """Return peer ID, database ID and sequence, as in the transaction log.
+
+        Runtime transactions are not saved in the transaction log and have
+        no persistent ID.
+        """
+        transaction = self._parse()['tran']
+        persistent_info = transaction.get('persistentInfo')
+        if not persistent_info or not persistent_info.get('sequence'):
+            return None
+        return transaction['peerID'], persistent_info['dbID'], persistent_info['sequence']
+
     @lru_cache(1)
     def get_caption(self) -> Optional[str]:
         parsed_transaction = self._parse()
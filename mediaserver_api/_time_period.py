@@ -2,9 +2,16 @@
 from __future__ import annotations
 
 import os
+from array import array
+from bisect import bisect_right
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from heapq import merge
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
 from typing import Optional
 from typing import Sequence
 
@@ -67,22 +74,32 @@ class TimePeriod:
 
     def is_among(self, periods_list, tolerance_sec=1):
         trimmed = self.trim_left(tolerance_sec * 1000).trim_right(tolerance_sec * 1000)
-        return any([period.contains(trimmed) for period in periods_list])
+        if isinstance(periods_list, TimePeriodSet):
+            return periods_list.contains(trimmed)
+        return any(period.contains(trimmed) for period in periods_list)
 
     @staticmethod
     def consolidate(periods_list, tolerance_sec=0) -> Sequence[TimePeriod]:
-        tolerance = timedelta(seconds=tolerance_sec)
-        try:
-            [first, *others] = periods_list
-        except ValueError:
-            return []
-        consolidated = [first]
-        for period in others:
-            gap_length = period.start - consolidated[-1].end
-            if gap_length <= tolerance:
-                consolidated[-1] = consolidated[-1].extend(gap_length).join(period)
-            else:
+        tolerance_ms = tolerance_sec * 1000
+        consolidated = []
+        start_ms = end_ms = None
+        for period in periods_list:
+            if start_ms is not None and period.start_ms - end_ms <= tolerance_ms:
+                if not period.complete:
+                    consolidated.append(TimePeriod(start_ms, None))
+                    start_ms = None
+                else:
+                    end_ms = period.end_ms
+                continue
+            if start_ms is not None:
+                consolidated.append(TimePeriod(start_ms, end_ms - start_ms))
+            if not period.complete:
                 consolidated.append(period)
+                start_ms = None
+            else:
+                start_ms, end_ms = period.start_ms, period.end_ms
+        if start_ms is not None:
+            consolidated.append(TimePeriod(start_ms, end_ms - start_ms))
         return consolidated
 
     @classmethod
@@ -98,11 +115,10 @@ class TimePeriod:
 
     @staticmethod
     def calculate_gaps(periods_list):
-        gaps_list = []
-        for previous, current in zip(periods_list, periods_list[1:]):
-            gap_timedelta = current.start - previous.end
-            gaps_list.append(gap_timedelta.total_seconds())
-        return gaps_list
+        return [
+            (current.start_ms - previous.end_ms) / 1000
+            for previous, current in zip(periods_list, periods_list[1:])
+            ]
 
     @classmethod
     def from_datetime(cls, start: datetime, duration: Optional[timedelta] = None):
@@ -141,3 +157,104 @@ class TimePeriod:
         if self.end < other.end:
             return False
         return True
+
+
+class TimePeriodSet:
+    """Union of complete time periods kept as sorted arrays of bounds.
+
+    Overlapping and adjacent periods are merged, so containment is
+    a binary search and set operations are linear merges.
+    """
+
+    def __init__(self, starts_ms: Iterable[int] = (), ends_ms: Iterable[int] = ()):
+        # Bounds must be sorted and must not overlap; use from_* methods otherwise.
+        self._starts_ms = array('q', starts_ms)
+        self._ends_ms = array('q', ends_ms)
+        if len(self._starts_ms) != len(self._ends_ms):
+            raise ValueError("Starts and ends must have the same length")
+
+    @classmethod
+    def _from_bounds(cls, bounds: Iterable[tuple[int, int]], tolerance_ms: int = 0) -> TimePeriodSet:
+        starts_ms = array('q')
+        ends_ms = array('q')
+        for start_ms, end_ms in bounds:
+            if starts_ms and start_ms - ends_ms[-1] <= tolerance_ms:
+                ends_ms[-1] = max(ends_ms[-1], end_ms)
+            else:
+                starts_ms.append(start_ms)
+                ends_ms.append(end_ms)
+        return cls(starts_ms, ends_ms)
+
+    @classmethod
+    def from_periods(cls, periods: Iterable[TimePeriod], tolerance_sec: float = 0) -> TimePeriodSet:
+        bounds = []
+        for period in periods:
+            if not period.complete:
+                raise RuntimeError(f"Non-finished {period} could not be added to a set")
+            bounds.append((period.start_ms, period.end_ms))
+        return cls._from_bounds(sorted(bounds), int(tolerance_sec * 1000))
+
+    @classmethod
+    def from_filenames(cls, filename_list: Iterable[str]) -> TimePeriodSet:
+        return cls.from_periods(TimePeriod._from_filename(name) for name in filename_list)
+
+    @classmethod
+    def from_recorded_periods(cls, raw_periods: Iterable[Mapping[str, Any]]) -> TimePeriodSet:
+        """Make a set from periods as the Server lists them for a camera."""
+        bounds = []
+        for raw in raw_periods:
+            duration_ms = int(raw['durationMs'])
+            if duration_ms == -1:
+                raise RuntimeError(f"Non-finished period {raw} could not be added to a set")
+            start_ms = int(raw['startTimeMs'])
+            bounds.append((start_ms, start_ms + duration_ms))
+        return cls._from_bounds(sorted(bounds))
+
+    def __repr__(self):
+        return f'<TimePeriodSet of {len(self)} periods>'
+
+    def __len__(self):
+        return len(self._starts_ms)
+
+    def __iter__(self) -> Iterator[TimePeriod]:
+        for start_ms, end_ms in zip(self._starts_ms, self._ends_ms):
+            yield TimePeriod.from_start_and_end_ms(start_ms, end_ms)
+
+    def __eq__(self, other):
+        if not isinstance(other, TimePeriodSet):
+            return NotImplemented
+        return self._starts_ms == other._starts_ms and self._ends_ms == other._ends_ms
+
+    def contains(self, period: TimePeriod) -> bool:
+        if not period.complete:
+            raise RuntimeError(f"Non-finished {period} could not be compared")
+        index = bisect_right(self._starts_ms, period.start_ms) - 1
+        return index >= 0 and self._ends_ms[index] >= period.end_ms
+
+    def union(self, other: TimePeriodSet) -> TimePeriodSet:
+        return self._from_bounds(merge(
+            zip(self._starts_ms, self._ends_ms),
+            zip(other._starts_ms, other._ends_ms),
+            ))
+
+    def intersection(self, other: TimePeriodSet) -> TimePeriodSet:
+        starts_ms = array('q')
+        ends_ms = array('q')
+        i = j = 0
+        while i < len(self) and j < len(other):
+            start_ms = max(self._starts_ms[i], other._starts_ms[j])
+            end_ms = min(self._ends_ms[i], other._ends_ms[j])
+            if start_ms < end_ms:
+                starts_ms.append(start_ms)
+                ends_ms.append(end_ms)
+            if self._ends_ms[i] < other._ends_ms[j]:
+                i += 1
+            else:
+                j += 1
+        return TimePeriodSet(starts_ms, ends_ms)
+
+    def gaps(self) -> TimePeriodSet:
+        return TimePeriodSet(self._ends_ms[:-1], self._starts_ms[1:])
+
+    def duration_sec(self) -> float:
+        return (sum(self._ends_ms) - sum(self._starts_ms)) / 1000
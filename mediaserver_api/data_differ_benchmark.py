@@ -0,0 +1,67 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+"""Measure how long the full info differ takes on large systems.
+
+Cameras, servers and users from the test data files are replicated
+with new IDs. A few resources differ between the compared structures,
+as they do while servers synchronize.
+"""
+import argparse
+import copy
+import json
+import time
+from pathlib import Path
+from uuid import UUID
+
+from mediaserver_api._diff_schemes import full_info_differ
+
+_files_dir = Path(__file__).with_name('test_data_differ_files')
+
+
+def _make_full_info(resource_count):
+    full_info = {}
+    for key in ['cameras', 'servers', 'users']:
+        [sample, *_] = json.loads(_files_dir.joinpath(f'full-info-{key}-x.json').read_text())[key]
+        full_info[key] = []
+        for index in range(resource_count):
+            resource = copy.deepcopy(sample)
+            resource['id'] = '{%s}' % UUID(int=index)
+            resource['name'] = f'{key}_{index}'
+            full_info[key].append(resource)
+    return full_info
+
+
+def _change_some(full_info, changed_count):
+    changed = copy.deepcopy(full_info)
+    for resource in changed['cameras'][:changed_count]:
+        resource['name'] += '_renamed'
+    del changed['users'][:changed_count]
+    return changed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        '--resources',
+        type=int, default=10000,
+        help="Cameras, servers and users each; default: %(default)s")
+    arg_parser.add_argument(
+        '--changed',
+        type=int, default=10,
+        help="Resources that differ; default: %(default)s")
+    arg_parser.add_argument(
+        '--repeat',
+        type=int, default=5,
+        help="Diffs to measure; default: %(default)s")
+    args = arg_parser.parse_args()
+    x = _make_full_info(args.resources)
+    y = _change_some(x, args.changed)
+    for name, other in [('equal', copy.deepcopy(x)), ('different', y)]:
+        started_at = time.perf_counter()
+        for _ in range(args.repeat):
+            diff_list = full_info_differ.diff(x, other)
+        duration_sec = (time.perf_counter() - started_at) / args.repeat
+        print(f"{name:9s} {len(diff_list):5d} diffs {duration_sec * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
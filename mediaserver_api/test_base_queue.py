@@ -0,0 +1,60 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import unittest
+from typing import NamedTuple
+
+from mediaserver_api._base_queue import BaseQueue
+from mediaserver_api._base_queue import EventNotOccurred
+
+
+class _Record(NamedTuple):
+    time_sec: int
+    name: str
+
+
+class _FakeQueue(BaseQueue):
+    _reload_interval_sec = 0
+
+    def __init__(self):
+        super().__init__(api=None)
+        self.log = []
+        self.requested_since_sec = []
+
+    def _load_events(self, since_sec):
+        self.requested_since_sec.append(since_sec)
+        return [record for record in self.log if record[0] >= since_sec]
+
+    def _make_record(self, record_data):
+        return _Record(*record_data)
+
+    def _get_time_sec(self, record):
+        return record.time_sec
+
+
+class TestBaseQueue(unittest.TestCase):
+
+    def test_events_of_same_second_are_not_duplicated(self):
+        queue = _FakeQueue()
+        queue.log.extend([(1, 'first'), (2, 'second')])
+        self.assertEqual(queue.wait_for_next(), _Record(1, 'first'))
+        self.assertEqual(queue.wait_for_next(), _Record(2, 'second'))
+        queue.log.extend([(2, 'third'), (3, 'fourth')])
+        self.assertEqual(queue.wait_for_next(), _Record(2, 'third'))
+        self.assertEqual(queue.wait_for_next(), _Record(3, 'fourth'))
+        self.assertEqual(queue.requested_since_sec, [0, 2])
+
+    def test_skip_existing_events(self):
+        queue = _FakeQueue()
+        queue.log.extend([(1, 'first'), (1, 'second')])
+        queue.skip_existing_events()
+        queue.log.append((1, 'third'))
+        self.assertEqual(queue.wait_for_next(), _Record(1, 'third'))
+        with self.assertRaises(EventNotOccurred):
+            queue.wait_for_next(timeout_sec=0)
+
+    def test_changed_event_is_detected(self):
+        queue = _FakeQueue()
+        queue.log.extend([(1, 'first'), (2, 'second')])
+        queue.skip_existing_events()
+        queue.log[1] = (2, 'changed')
+        with self.assertRaisesRegex(RuntimeError, "Event sequence failure #1"):
+            queue.wait_for_next()
@@ -0,0 +1,118 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import ssl
+import subprocess
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest.mock import patch
+
+from mediaserver_api._http import HttpConnectionError
+from mediaserver_api._http import _HttpsConnection
+from mediaserver_api._http import http_connection_pool_stats
+from mediaserver_api._http import http_request
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond()
+
+    def _respond(self):
+        self.server.requests.append((self.command, self.client_address))
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # The connection is closed as if it has been idle for too long.
+        self.close_connection = self.server.close_after_response
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._cert_dir = TemporaryDirectory()
+        cls._cert = Path(cls._cert_dir.name, 'cert.pem')
+        cls._key = Path(cls._cert_dir.name, 'key.pem')
+        subprocess.run(
+            [
+                'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+                '-keyout', str(cls._key), '-out', str(cls._cert),
+                ],
+            check=True, capture_output=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._cert_dir.cleanup()
+
+    def setUp(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(self._cert, self._key)
+        server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+        server.requests = []
+        server.close_after_response = False
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self._server = server
+        [address, port] = server.server_address
+        self._url = f'https://{address}:{port}/'
+
+    def _request(self, method):
+        return http_request(method, self._url, {} if method == 'POST' else None, ca_cert=str(self._cert), timeout=10)
+
+    def test_connection_is_reused(self):
+        stats_before = http_connection_pool_stats()
+        for _ in range(3):
+            self._request('GET')
+        stats = http_connection_pool_stats()
+        self.assertEqual(stats['misses'] - stats_before['misses'], 1)
+        self.assertEqual(stats['hits'] - stats_before['hits'], 2)
+        self.assertEqual(len({client for _method, client in self._server.requests}), 1)
+
+    def test_closed_idle_connection_is_evicted(self):
+        self._server.close_after_response = True
+        stats_before = http_connection_pool_stats()
+        self._request('GET')
+        self._request('POST')
+        stats = http_connection_pool_stats()
+        self.assertEqual(stats['reconnects'] - stats_before['reconnects'], 0)
+        self.assertEqual(len(self._server.requests), 2)
+
+    def test_idempotent_request_is_resent(self):
+        self._server.close_after_response = True
+        stats_before = http_connection_pool_stats()
+        self._request('GET')
+        with patch.object(_HttpsConnection, 'is_dropped', return_value=False):
+            self._request('GET')
+        stats = http_connection_pool_stats()
+        self.assertEqual(stats['reconnects'] - stats_before['reconnects'], 1)
+        self.assertEqual([method for method, _client in self._server.requests], ['GET', 'GET'])
+
+    def test_post_is_not_resent(self):
+        self._server.close_after_response = True
+        stats_before = http_connection_pool_stats()
+        self._request('GET')
+        with patch.object(_HttpsConnection, 'is_dropped', return_value=False):
+            with self.assertRaises(HttpConnectionError):
+                self._request('POST')
+        stats = http_connection_pool_stats()
+        self.assertEqual(stats['reconnects'] - stats_before['reconnects'], 0)
+        self.assertEqual([method for method, _client in self._server.requests], ['GET'])
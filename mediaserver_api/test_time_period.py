@@ -4,6 +4,7 @@ import time
 import unittest
 
 from mediaserver_api._time_period import TimePeriod
+from mediaserver_api._time_period import TimePeriodSet
 
 
 class TestTimePeriodContains(unittest.TestCase):
@@ -93,6 +94,47 @@ class TestTimePeriodContains(unittest.TestCase):
             start_ms=now_ms - duration_ms - gap * 2, duration_ms=duration_ms)
         self.assertFalse(shifted_period.is_among(periods_list))
 
+    def test_consolidate(self):
+        periods = [TimePeriod(0, 1000), TimePeriod(1500, 500), TimePeriod(5000, 1000), TimePeriod(6000, None)]
+        self.assertEqual(TimePeriod.consolidate(periods), [
+            TimePeriod(0, 1000), TimePeriod(1500, 500), TimePeriod(5000, None)])
+        self.assertEqual(TimePeriod.consolidate(periods, tolerance_sec=1), [
+            TimePeriod(0, 2000), TimePeriod(5000, None)])
+        self.assertEqual(TimePeriod.consolidate([]), [])
+
+
+class TestTimePeriodSet(unittest.TestCase):
+
+    def test_from_filenames(self):
+        filenames = ['54000_1000.mkv', '50000_1000.mkv', '51000_1000.mkv', '51500_200.mkv']
+        period_set = TimePeriodSet.from_filenames(filenames)
+        self.assertEqual(list(period_set), [TimePeriod(50000, 2000), TimePeriod(54000, 1000)])
+        self.assertEqual(period_set.duration_sec(), 3)
+        with self.assertRaises(RuntimeError):
+            TimePeriodSet.from_filenames(['50000.mkv'])
+
+    def test_from_recorded_periods(self):
+        raw = [{'startTimeMs': '3000', 'durationMs': '1000'}, {'startTimeMs': '1000', 'durationMs': '1000'}]
+        period_set = TimePeriodSet.from_recorded_periods(raw)
+        self.assertEqual(list(period_set), [TimePeriod(1000, 1000), TimePeriod(3000, 1000)])
+
+    def test_contains(self):
+        period_set = TimePeriodSet.from_periods([TimePeriod(0, 1000), TimePeriod(2000, 1000)])
+        self.assertTrue(period_set.contains(TimePeriod(0, 1000)))
+        self.assertTrue(period_set.contains(TimePeriod(2500, 500)))
+        self.assertFalse(period_set.contains(TimePeriod(500, 2000)))
+        self.assertFalse(period_set.contains(TimePeriod(-1, 10)))
+        self.assertFalse(period_set.contains(TimePeriod(2900, 200)))
+        self.assertTrue(TimePeriod(2000, 1000).is_among(period_set, tolerance_sec=0))
+
+    def test_union_intersection_gaps(self):
+        one = TimePeriodSet.from_periods([TimePeriod(0, 1000), TimePeriod(2000, 1000)])
+        other = TimePeriodSet.from_periods([TimePeriod(500, 2000), TimePeriod(5000, 1000)])
+        self.assertEqual(list(one.union(other)), [TimePeriod(0, 3000), TimePeriod(5000, 1000)])
+        self.assertEqual(list(one.intersection(other)), [TimePeriod(500, 500), TimePeriod(2000, 500)])
+        self.assertEqual(list(one.gaps()), [TimePeriod(1000, 1000)])
+        self.assertEqual(list(TimePeriodSet().gaps()), [])
+
 
 if __name__ == '__main__':
     logging.basicConfig(
@@ -16,6 +16,8 @@ from os_access._networking import PingError
 from os_access._networking import current_host_address
 from os_access._networking import get_host_by_name
 from os_access._os_access_interface import DiskIoInfo
+from os_access._os_access_interface import MetricsSample
+from os_access._os_access_interface import MetricsSampler
 from os_access._os_access_interface import OsAccess
 from os_access._os_access_interface import OsAccessNotReady
 from os_access._path import RemotePath
@@ -37,6 +39,8 @@ __all__ = [
     'DiskIoInfo',
     'InterfaceDown',
     'LinuxNetworking',
+    'MetricsSample',
+    'MetricsSampler',
     'Networking',
     'OsAccess',
     'OsAccessNotReady',
@@ -1,8 +1,10 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import logging
+import threading
 import time
 from abc import ABCMeta
 from abc import abstractmethod
+from collections import deque
 from contextlib import ExitStack
 from contextlib import contextmanager
 from datetime import datetime
@@ -14,6 +16,7 @@ from subprocess import CalledProcessError
 from subprocess import CompletedProcess
 from subprocess import TimeoutExpired
 from typing import Collection
+from typing import Deque
 from typing import Iterable
 from typing import Literal
 from typing import Mapping
@@ -59,6 +62,66 @@ class DiskIoInfo(NamedTuple):
     write_count: int
 
 
+class MetricsSample(NamedTuple):
+    # Seconds; only differences between samples of one sampler make sense.
+    timestamp_sec: float
+    # Share of time all CPUs were busy since the previous sample.
+    cpu_usage: float
+    # The counters below are cumulative, as in DiskIoInfo.
+    process_cpu_sec: float
+    process_memory_bytes: int
+    process_memory_peak_bytes: int
+    process_thread_count: int
+    process_open_files_count: int
+    disks_io: Sequence[DiskIoInfo]
+
+
+class MetricsSampler(metaclass=ABCMeta):
+    """Collect metrics of the OS and a process at a fixed rate in background.
+
+    Samples are kept in a bounded buffer: the oldest are dropped first.
+    """
+
+    def __init__(self, pid: int, interval_sec: float, max_samples: int):
+        self._pid = pid
+        self._interval_sec = interval_sec
+        self._samples: Deque[MetricsSample] = deque(maxlen=max_samples)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} PID {self._pid} every {self._interval_sec} sec>'
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample_safely, name=f'metrics_sampler_{self._pid}')
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stopped.set()
+        self._thread.join(timeout=self._interval_sec + 30)
+        if self._thread.is_alive():
+            _logger.error("%r has not stopped", self)
+
+    def list_samples(self) -> Sequence[MetricsSample]:
+        if self._error is not None:
+            raise RuntimeError(f"{self!r} has failed") from self._error
+        return list(self._samples)
+
+    def _sample_safely(self):
+        try:
+            self._sample()
+        except Exception as e:
+            _logger.exception("%r failed", self)
+            self._error = e
+
+    @abstractmethod
+    def _sample(self):
+        """Append samples until stopped or until the process exits."""
+        pass
+
+
 class OsAccess(ServiceManager, metaclass=ABCMeta):
     OS_FAMILY = None
     _user_description = 'NX Functional Tests user'
@@ -566,6 +629,20 @@ class OsAccess(ServiceManager, metaclass=ABCMeta):
     def get_io_time(self) -> Collection[DiskIoInfo]:
         pass
 
+    @abstractmethod
+    def metrics_sampler(
+            self,
+            pid: int,
+            interval_sec: float = 1,
+            max_samples: int = 100000,
+            ) -> MetricsSampler:
+        """Sample the OS and process metrics in background, use as a context manager.
+
+        Cheaper than calling get_ram_usage(), get_io_time() and the like
+        repeatedly for a long time.
+        """
+        pass
+
     @abstractmethod
     def get_open_files_count(self, pid: int) -> int:
         pass
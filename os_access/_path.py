@@ -6,10 +6,12 @@ import logging
 import os
 import pathlib
 import posixpath
+import shutil
 import stat
 import sys
 from abc import abstractmethod
 from fnmatch import fnmatch
+from typing import BinaryIO
 from typing import Iterable
 from typing import NamedTuple
 from typing import Sequence
@@ -110,16 +112,39 @@ class RemotePath(os.PathLike):
         return result
 
     def rglob(self, pattern: str) -> 'Iterable[RemotePath]':
+        return [path for path, _ in self.rglob_with_stat(pattern)]
+
+    def rglob_with_stat(self, pattern: str) -> 'Sequence[Tuple[RemotePath, _FileStat]]':
+        """Find paths recursively along with their sizes and modification times.
+
+        Stats come with the listing, no request per path is made.
+        """
         if not pattern:
             raise ValueError(f"Unacceptable pattern: {pattern}")
         if '/' in pattern or '\\' in pattern:
             raise NotImplementedError("Directories are unsupported")
         result = []
-        for path, entry in self._walk(strict=False):
+        for path, entry in self._walk_tree():
             if _glob(pattern, entry.name):
-                result.append(path)
+                result.append((path, entry.stat()))
         return result
 
+    def _walk_tree(self) -> 'Iterable[Tuple[RemotePath, DirEntry]]':
+        try:
+            return self._walk_in_bulk()
+        except _BulkWalkUnavailable as e:
+            _logger.debug("Walk %s directory by directory: %s", self, e)
+            return self._walk(strict=False)
+
+    def _walk_in_bulk(self) -> 'Sequence[Tuple[RemotePath, DirEntry]]':
+        """Walk the tree in a single request.
+
+        A walk directory by directory takes a round trip per directory,
+        which is slow for video archives with thousands of directories.
+        A non-existent path or a non-directory is an empty tree.
+        """
+        raise _BulkWalkUnavailable(f"{self.__class__.__name__} cannot walk in a single request")
+
     def _walk(self, strict=True) -> 'Iterable[Tuple[RemotePath, DirEntry]]':
         try:
             entries = [*self._scandir()]
@@ -235,6 +260,16 @@ class RemotePath(os.PathLike):
     def write_bytes(self, data: bytes):
         pass
 
+    @abstractmethod
+    def download(self, local_file: BinaryIO):
+        """Write the contents to a file object chunk by chunk."""
+        pass
+
+    @abstractmethod
+    def upload(self, local_file: BinaryIO):
+        """Replace the contents with ones read from a file object chunk by chunk."""
+        pass
+
     def iterdir(self):
         return [self / entry.name for entry in self._scandir()]
 
@@ -270,6 +305,7 @@ class DirEntry(NamedTuple):
     name: str
     is_dir_value: bool
     is_symlink_value: bool
+    stat_value: _FileStat
 
     def is_dir(self):
         return self.is_dir_value
@@ -277,7 +313,28 @@ class DirEntry(NamedTuple):
     def is_symlink(self):
         return self.is_symlink_value
 
+    def stat(self):
+        return self.stat_value
+
+
+class _BulkWalkUnavailable(Exception):
+    pass
+
 
 def copy_file(source, destination):
+    """Copy a file chunk by chunk if either side is local."""
     _logger.info("Copy from %s to %s", source, destination)
-    destination.write_bytes(source.read_bytes())
+    if isinstance(source, RemotePath) and isinstance(destination, RemotePath):
+        destination.write_bytes(source.read_bytes())
+    elif isinstance(source, RemotePath):
+        try:
+            with destination.open('wb') as local_file:
+                source.download(local_file)
+        except Exception:
+            destination.unlink(missing_ok=True)
+            raise
+    elif isinstance(destination, RemotePath):
+        with source.open('rb') as local_file:
+            destination.upload(local_file)
+    else:
+        shutil.copyfile(source, destination)
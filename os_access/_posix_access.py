@@ -4,6 +4,7 @@ import functools
 import io
 import json
 import logging
+import os
 import re
 import shlex
 import time
@@ -13,6 +14,9 @@ from contextlib import suppress
 from datetime import datetime
 from subprocess import CalledProcessError
 from subprocess import TimeoutExpired
+from textwrap import dedent
+from typing import BinaryIO
+from typing import Collection
 from typing import Mapping
 from typing import Optional
 from typing import Tuple
@@ -26,6 +30,8 @@ from os_access._linux_networking import LinuxNetworking
 from os_access._networking import Networking
 from os_access._os_access_interface import Disk
 from os_access._os_access_interface import DiskIoInfo
+from os_access._os_access_interface import MetricsSample
+from os_access._os_access_interface import MetricsSampler
 from os_access._os_access_interface import OsAccess
 from os_access._os_access_interface import RamUsage
 from os_access._path import RemotePath
@@ -262,6 +268,51 @@ class PosixAccess(OsAccess):
             smb_log_file_name = 'smb_server-' + file.stem
             copy_file(file, target_local_dir / smb_log_file_name)
 
+    def download_tar_zstd(
+            self,
+            paths: Collection[RemotePath],
+            local_file: BinaryIO,
+            timeout_sec: float = 600,
+            ) -> Mapping[str, float]:
+        """Stream files as a zstd-compressed tar archive over a single channel.
+
+        Missing files are skipped. Return how long each file took,
+        judging by when tar started it.
+        """
+        names = [os.fspath(path).lstrip('/') for path in paths]
+        command = [
+            'tar', '--create', '--verbose', '--use-compress-program', 'zstd', '--ignore-failed-read',
+            '--directory', '/', '--file', '-', *names,
+            ]
+        # With the archive on stdout, tar lists files to stderr.
+        stderr = b''
+        started_at = []
+        started = time.monotonic()
+        with self.shell.Popen(command) as run:
+            while True:
+                # Cache the return code first, see Run.communicate().
+                returncode = run.returncode
+                [stdout_chunk, stderr_chunk] = run.receive(timeout_sec=1)
+                if stdout_chunk:
+                    local_file.write(stdout_chunk)
+                if stderr_chunk:
+                    now = time.monotonic()
+                    started_at.extend([now] * stderr_chunk.count(b'\n'))
+                    stderr += stderr_chunk
+                if returncode is not None and stdout_chunk is None and stderr_chunk is None:
+                    break
+                if time.monotonic() - started > timeout_sec:
+                    raise TimeoutExpired(command, timeout_sec, None, stderr)
+        if returncode != 0:
+            raise CalledProcessError(returncode, command, None, stderr)
+        finished_at = time.monotonic()
+        durations = {}
+        lines = stderr.decode(errors='backslashreplace').splitlines()
+        for line, line_started_at, next_started_at in zip(lines, started_at, [*started_at[1:], finished_at]):
+            if not line.startswith('tar: '):  # Warnings about missing files.
+                durations['/' + line] = next_started_at - line_started_at
+        return durations
+
     def reboot(self):
         """Reboot and return when OS has been rebooted."""
         # Last reboot output is used as it, by definition, should change only if reboot occurred.
@@ -1171,6 +1222,9 @@ class PosixAccess(OsAccess):
             command, output)
         raise OSError("Cannot found number of opened files")
 
+    def metrics_sampler(self, pid, interval_sec=1, max_samples=100000):
+        return _SshMetricsSampler(self.shell, pid, interval_sec, max_samples)
+
     def get_pid_by_name(self, executable_name: str) -> int:
         command = ['ps', '--no-headers', '-o', 'pid', '-C', executable_name]
         output = self.run(command, check=False).stdout.decode().strip().split()
@@ -1224,3 +1278,100 @@ class _CPUUsageProvider:
             float(iowait),
             ])
         return used_time, idle_time
+
+
+class _SshMetricsSampler(MetricsSampler):
+    """Sample by a shell loop which prints a line per sample over one SSH channel.
+
+    The loop doesn't start processes except awk and sleep: it reads
+    /proc directly. Open files are counted as /proc/PID/fd entries.
+    """
+
+    # language=Bash
+    _script = r'''
+        shopt -s nullglob
+        pid=$1
+        interval_sec=$2
+        echo "clk_tck $(getconf CLK_TCK)"
+        for file in /sys/block/sd*/queue/hw_sector_size; do
+            disk=${file#/sys/block/}
+            echo "sector_size ${disk%%/*} $(<"$file")"
+        done
+        while [ -d "/proc/$pid" ]; do
+            fds=("/proc/$pid/fd/"*)
+            awk -v fds=${#fds[@]} '
+                FILENAME == "/proc/uptime" { uptime = $1 }
+                FILENAME == "/proc/stat" && $1 == "cpu" { used = $2 + $3 + $4 + $7 + $8 + $9; idle = $5 + $6 }
+                FILENAME ~ /^\/proc\/[0-9]+\/stat$/ { cpu_ticks = $14 + $15 + $16 + $17 }
+                /^VmRSS:/ { rss_kb = $2 }
+                /^VmHWM:/ { hwm_kb = $2 }
+                /^Threads:/ { threads = $2 }
+                FILENAME == "/proc/diskstats" && $3 ~ /^sd[a-z]$/ { disks = disks " " $3 ":" $4 ":" $6 ":" $7 ":" $8 ":" $10 ":" $11 }
+                END { print "sample", uptime, used, idle, cpu_ticks, rss_kb, hwm_kb, threads, fds disks }
+                ' /proc/uptime /proc/stat "/proc/$pid/stat" "/proc/$pid/status" /proc/diskstats
+            sleep "$interval_sec"
+        done
+        '''
+
+    def __init__(self, shell: Ssh, pid: int, interval_sec: float, max_samples: int):
+        super().__init__(pid, interval_sec, max_samples)
+        self._shell = shell
+
+    def _sample(self):
+        script = dedent(self._script).strip()
+        run = self._shell.Popen(['bash', '-c', script, 'metrics_sampler', self._pid, str(self._interval_sec)])
+        try:
+            clk_tck = 100
+            sector_sizes = {}
+            previous_cpu_times = None
+            unfinished_line = b''
+            while not self._stopped.is_set():
+                [stdout, _stderr] = run.receive(timeout_sec=self._interval_sec)
+                if stdout is None:
+                    _logger.info("%r: Sampling finished, exit status %s", self, run.returncode)
+                    break
+                [*lines, unfinished_line] = (unfinished_line + stdout).split(b'\n')
+                for line in lines:
+                    [record_type, *values] = line.decode('ascii').split()
+                    if record_type == 'clk_tck':
+                        [clk_tck] = map(int, values)
+                    elif record_type == 'sector_size':
+                        [disk_name, sector_size] = values
+                        sector_sizes[disk_name] = int(sector_size)
+                    elif record_type == 'sample':
+                        [uptime, used, idle, cpu_ticks, rss_kb, hwm_kb, threads, fds, *disks] = values
+                        cpu_times = float(used), float(idle)
+                        if previous_cpu_times is None:
+                            cpu_usage = 0.
+                        else:
+                            used_delta = cpu_times[0] - previous_cpu_times[0]
+                            idle_delta = cpu_times[1] - previous_cpu_times[1]
+                            cpu_usage = used_delta / max(used_delta + idle_delta, 1)
+                        previous_cpu_times = cpu_times
+                        self._samples.append(MetricsSample(
+                            timestamp_sec=float(uptime),
+                            cpu_usage=cpu_usage,
+                            process_cpu_sec=int(cpu_ticks) / clk_tck,
+                            process_memory_bytes=int(rss_kb) * 1024,
+                            process_memory_peak_bytes=int(hwm_kb) * 1024,
+                            process_thread_count=int(threads),
+                            process_open_files_count=int(fds),
+                            disks_io=[_parse_disk_io(disk, sector_sizes) for disk in disks],
+                            ))
+        finally:
+            # The loop is killed by SIGPIPE as soon as it prints after that.
+            run.close()
+
+
+def _parse_disk_io(disk, sector_sizes):
+    [name, r_completed, sectors_r, time_spent_r, w_completed, sectors_w, time_spent_w] = disk.split(':')
+    sector_size = sector_sizes.get(name, 512)
+    return DiskIoInfo(
+        name=name,
+        reading_sec=float(time_spent_r) / 1000,
+        writing_sec=float(time_spent_w) / 1000,
+        read_bytes=int(sectors_r) * sector_size,
+        write_bytes=int(sectors_w) * sector_size,
+        read_count=int(r_completed),
+        write_count=int(w_completed),
+        )
@@ -7,17 +7,25 @@ import logging
 import os
 import pathlib
 import stat
+from subprocess import CalledProcessError
 from typing import Iterable
 from typing import Sequence
 
 from os_access._exceptions import NotEmpty
 from os_access._path import DirEntry
 from os_access._path import RemotePath
+from os_access._path import _BulkWalkUnavailable
 from os_access._path import _FileStat
 from os_access._ssh_shell import Ssh
 
 _logger = logging.getLogger(__name__)
 
+_find_types = {
+    'd': stat.S_IFDIR,
+    'f': stat.S_IFREG,
+    'l': stat.S_IFLNK,
+    }
+
 
 class SftpPath(RemotePath):
 
@@ -189,24 +197,30 @@ class SftpPath(RemotePath):
 
     def read_bytes(self):
         buf = io.BytesIO()
+        self.download(buf)
+        return buf.getvalue()
+
+    def download(self, local_file):
         try:
-            self._ssh._sftp().getfo(str(self), buf)
+            with self._ssh._sftp_for_transfer() as sftp:
+                sftp.getfo(str(self), local_file)
         except IOError as e:
             if e.errno is None or e.errno == errno.EISDIR:
                 raise IsADirectoryError(e.errno, e.strerror, self._get_filename())
             if e.errno == errno.ENOENT:
                 raise FileNotFoundError(e.errno, e.strerror, self._get_filename())
             raise
-        buf.seek(0)
-        return buf.getvalue()
 
     def write_text(self, data, encoding='utf-8', errors='strict'):
         return self.write_bytes(data.encode(encoding, errors))
 
     def write_bytes(self, data):
-        buf = io.BytesIO(data)
+        return self.upload(io.BytesIO(data))
+
+    def upload(self, local_file):
         try:
-            return self._ssh._sftp().putfo(buf, str(self), confirm=False)
+            with self._ssh._sftp_for_transfer() as sftp:
+                return sftp.putfo(local_file, str(self), confirm=False)
         except IOError as write_exc:
             if write_exc.errno is None:  # SFTP as protocol never raises analogue of errno.EISDIR.
                 raise IsADirectoryError(errno.EISDIR, f"is a dir: {self}")
@@ -220,8 +234,31 @@ class SftpPath(RemotePath):
                 attrs.filename,
                 stat.S_ISDIR(attrs.st_mode),
                 stat.S_ISLNK(attrs.st_mode),
+                _FileStat(attrs.st_size, attrs.st_mtime, attrs.st_mode),
                 )
 
+    def _walk_in_bulk(self):
+        # Names may contain spaces and newlines but not NUL.
+        try:
+            result = self._ssh.run([
+                'find', self, '-mindepth', '1',
+                '-printf', r'%y %s %T@ %m %P\0',
+                ])
+        except CalledProcessError as e:
+            raise _BulkWalkUnavailable(f"find failed: {e.stderr.decode(errors='replace')}")
+        walked = []
+        for record in result.stdout.split(b'\0')[:-1]:
+            [file_type, size, mtime, permissions, relative_path] = record.decode().split(' ', 4)
+            st_mode = _find_types.get(file_type, 0) | int(permissions, 8)
+            path = self / relative_path
+            walked.append((path, DirEntry(
+                path.name,
+                stat.S_ISDIR(st_mode),
+                stat.S_ISLNK(st_mode),
+                _FileStat(int(size), int(float(mtime)), st_mode),
+                )))
+        return walked
+
     def rmdir(self):
         try:
             return self._ssh._sftp().rmdir(str(self))
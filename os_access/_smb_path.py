@@ -12,18 +12,25 @@ from copy import deepcopy
 from ipaddress import IPv4Address
 from pathlib import PureWindowsPath
 from socket import SHUT_RDWR
+from typing import Callable
 from typing import Iterable
+from typing import Optional
 
 from smb import SMBConnection
 from smb import smb_structs
 from smb.base import NotConnectedError
 from smb.base import SMBTimeout
 
+from os_access._command import Shell
 from os_access._exceptions import CannotDelete
 from os_access._exceptions import NotEmpty
 from os_access._path import DirEntry
 from os_access._path import RemotePath
+from os_access._path import _BulkWalkUnavailable
 from os_access._path import _FileStat
+from os_access._powershell import PowerShellCommunicationError
+from os_access._powershell import PowershellError
+from os_access._powershell import run_powershell_script
 
 _logger = logging.getLogger(__name__)
 
@@ -247,8 +254,16 @@ class _SmbConnectionPool:
 
 class SmbPath(RemotePath):
 
-    def __init__(self, connection_pool: _SmbConnectionPool, *parts: str):
+    def __init__(
+            self,
+            connection_pool: _SmbConnectionPool,
+            *parts: str,
+            shell_factory: Optional[Callable[[], Shell]] = None,
+            ):
         self._connection_pool = connection_pool
+        # SMB lists a directory per request; a shell on the same machine
+        # can walk a whole tree at once.
+        self._shell_factory = shell_factory
         self._path = PureWindowsPath(*parts)
         if not self._path.is_absolute():
             raise ValueError('SmbPath must be absolute')
@@ -284,7 +299,7 @@ class SmbPath(RemotePath):
         return self._path.parts
 
     def _with_parts(self, *parts):
-        return SmbPath(self._connection_pool, *parts)
+        return SmbPath(self._connection_pool, *parts, shell_factory=self._shell_factory)
 
     def absolute(self):
         return self
@@ -330,9 +345,50 @@ class SmbPath(RemotePath):
                     shared_file.filename,
                     shared_file.isDirectory,
                     False,
+                    _FileStat(
+                        shared_file.file_size,
+                        int(shared_file.last_write_time),
+                        stat.S_IFDIR if shared_file.isDirectory else stat.S_IFREG,
+                        ),
                     ))
         return result
 
+    def _walk_in_bulk(self):
+        if self._shell_factory is None:
+            raise _BulkWalkUnavailable("No shell to walk the tree")
+        try:
+            records = run_powershell_script(
+                self._shell_factory(),
+                # language=PowerShell
+                r'''
+                    if (-not (Test-Path -LiteralPath $path -PathType Container)) {
+                        return
+                    }
+                    $root = (Get-Item -LiteralPath $path -Force).FullName.TrimEnd('\')
+                    Get-ChildItem -LiteralPath $path -Recurse -Force | ForEach-Object {
+                        $size = if ($_.PSIsContainer) { 0 } else { $_.Length }
+                        $mtime = [DateTimeOffset]::new($_.LastWriteTimeUtc).ToUnixTimeSeconds()
+                        $relative = $_.FullName.Substring($root.Length + 1)
+                        "$([int]$_.PSIsContainer)`t$size`t$mtime`t$relative"
+                    }
+                    ''',
+                {'path': str(self)},
+                )
+        except (PowershellError, PowerShellCommunicationError) as e:
+            raise _BulkWalkUnavailable(f"PowerShell failed: {e}")
+        walked = []
+        for record in records:
+            [is_dir, size, mtime, relative_path] = record.split('\t', 3)
+            is_dir = is_dir == '1'
+            path = self / relative_path
+            walked.append((path, DirEntry(
+                path.name,
+                is_dir,
+                False,
+                _FileStat(int(size), int(mtime), stat.S_IFDIR if is_dir else stat.S_IFREG),
+                )))
+        return walked
+
     @_reconnect_and_retry
     @_reraise_for_existing
     def rmdir(self):
@@ -399,24 +455,34 @@ class SmbPath(RemotePath):
     @_reconnect_and_retry_on_connection_error
     @_reraise_for_existing
     @_retrying_on_status(_STATUS_SHARING_VIOLATION)
+    def download(self, local_file):
+        # Start over if retried.
+        local_file.seek(0)
+        local_file.truncate()
+        with self._connection_pool.connection_acquired() as conn:
+            conn.retrieveFile(self._tree, self._filename, local_file)
+
     def read_bytes(self):
         buffer = io.BytesIO()
-        with self._connection_pool.connection_acquired() as conn:
-            conn.retrieveFile(self._tree, self._filename, buffer)
+        self.download(buffer)
         return buffer.getvalue()
 
+    def write_bytes(self, data):
+        return self.upload(io.BytesIO(data))
+
     @_reconnect_and_retry
     @_retrying_on_status(_STATUS_DELETE_PENDING, _STATUS_SHARING_VIOLATION)
-    def write_bytes(self, data):
-        ad_hoc_file_object = io.BytesIO(data)
+    def upload(self, local_file):
         try:
             with self._connection_pool.connection_acquired() as conn:
                 try:
-                    return conn.storeFile(self._tree, self._filename, ad_hoc_file_object)
+                    local_file.seek(0)  # Start over if retried.
+                    return conn.storeFile(self._tree, self._filename, local_file)
                 except SMBTimeout:
                     time.sleep(0.5)
                     _logger.debug("Fail writing a file to SMB server; Retry")
-                    return conn.storeFile(self._tree, self._filename, ad_hoc_file_object)
+                    local_file.seek(0)
+                    return conn.storeFile(self._tree, self._filename, local_file)
         except smb_structs.OperationFailure as write_exc:
             _store_smb_messages(write_exc)
             status = _extract_error_status(write_exc)
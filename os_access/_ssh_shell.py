@@ -3,9 +3,11 @@ import errno
 import logging
 import math
 import socket
+import threading
 import time
 from abc import ABCMeta
 from abc import abstractmethod
+from contextlib import contextmanager
 from selectors import DefaultSelector
 from selectors import EVENT_READ
 from typing import Optional
@@ -209,6 +211,8 @@ class BaseSsh(PosixShell, metaclass=ABCMeta):
             self._key = paramiko.RSAKey(key=key)
         else:
             self._key = None
+        self._transfer_sftp_lock = threading.Lock()
+        self._idle_transfer_sftp_clients = []
 
     def __repr__(self):
         return '<{!s}>'.format(command_to_script([
@@ -290,7 +294,36 @@ class BaseSsh(PosixShell, metaclass=ABCMeta):
         self._sftp_client = self._client().open_sftp()
         return self._sftp_client
 
+    @contextmanager
+    def _sftp_for_transfer(self):
+        # An SFTP client must not be used by several threads at once.
+        # Concurrent transfers take separate sessions over the same
+        # connection; sessions are reused by subsequent transfers.
+        with self._transfer_sftp_lock:
+            if self._idle_transfer_sftp_clients:
+                sftp = self._idle_transfer_sftp_clients.pop()
+            else:
+                sftp = None
+        if sftp is None:
+            sftp = self._client().open_sftp()
+        reusable = False
+        try:
+            yield sftp
+            reusable = True
+        except FileNotFoundError:  # The session is fine, it's just a missing file.
+            reusable = True
+            raise
+        finally:
+            if reusable:
+                with self._transfer_sftp_lock:
+                    self._idle_transfer_sftp_clients.append(sftp)
+            else:
+                sftp.close()
+
     def close(self):
+        with self._transfer_sftp_lock:
+            while self._idle_transfer_sftp_clients:
+                self._idle_transfer_sftp_clients.pop().close()
         try:
             sftp = self._sftp_client
         except AttributeError:
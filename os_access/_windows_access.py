@@ -19,6 +19,8 @@ from typing import Optional
 
 from os_access._os_access_interface import Disk
 from os_access._os_access_interface import DiskIoInfo
+from os_access._os_access_interface import MetricsSample
+from os_access._os_access_interface import MetricsSampler
 from os_access._os_access_interface import OsAccess
 from os_access._os_access_interface import RamUsage
 from os_access._path import copy_file
@@ -109,6 +111,7 @@ class WindowsAccess(OsAccess):
         if self._winrm_shell is not None:
             self._winrm_shell.close()
             self._winrm_shell = None
+        self.winrm.close()
         self._traffic_capture = None
 
     @functools.lru_cache()
@@ -123,7 +126,7 @@ class WindowsAccess(OsAccess):
         return self.path('C:\\', 'Windows', 'Temp')
 
     def path(self, *parts) -> SmbPath:
-        return SmbPath(self._smb_connection_pool, *parts)
+        return SmbPath(self._smb_connection_pool, *parts, shell_factory=self.winrm_shell)
 
     @property  # TODO: Make it a simple method
     def traffic_capture(self):
@@ -1094,6 +1097,9 @@ class WindowsAccess(OsAccess):
             command, output)
         raise OSError("Cannot found number of opened files")
 
+    def metrics_sampler(self, pid, interval_sec=1, max_samples=100000):
+        return _PerformanceCountersSampler(self, pid, interval_sec, max_samples)
+
     def disable_netprofm_service(self):
         # The Windows service netprofm ('Network List Service') is used for automatic collects and
         # stores properties of connected networks. During the collecting the service can restart
@@ -1140,3 +1146,50 @@ class _DisksCounter:
             _logger.error(f'Failed to get DisksCounter statistics: {e}')
             return []
         return [disk_data for disk_data in result if disk_data['Name'] != '_Total']
+
+
+class _PerformanceCountersSampler(MetricsSampler):
+    """Poll raw performance counters over WinRM.
+
+    Each sample takes a request per counter class: there is no shell loop
+    streaming the counters. Open files are counted as handles of any kind.
+    """
+
+    def __init__(self, os_access: WindowsAccess, pid: int, interval_sec: float, max_samples: int):
+        super().__init__(pid, interval_sec, max_samples)
+        self._os_access = os_access
+
+    def _sample(self):
+        process_counter = _ProcessCounter(self._os_access._performance_counter_engine, self._pid)
+        previous_processor = None
+        while True:
+            started_at = time.monotonic()
+            try:
+                process = process_counter.get_last()
+            except ValueError:
+                _logger.info("%r: Sampling finished, process exited", self)
+                break
+            # See: https://learn.microsoft.com/en-us/previous-versions/windows/desktop/legacy/aa394308(v=vs.85)
+            [[_, processor]] = self._os_access.winrm.wsman_select(
+                'Win32_PerfRawData_PerfOS_Processor', {'Name': '_Total'})
+            idle_ticks = int(processor['PercentProcessorTime'])
+            timestamp_ticks = int(processor['Timestamp_Sys100NS'])
+            if previous_processor is None:
+                cpu_usage = 0.
+            else:
+                [previous_idle_ticks, previous_timestamp_ticks] = previous_processor
+                elapsed_ticks = max(timestamp_ticks - previous_timestamp_ticks, 1)
+                cpu_usage = 1 - (idle_ticks - previous_idle_ticks) / elapsed_ticks
+            previous_processor = idle_ticks, timestamp_ticks
+            self._samples.append(MetricsSample(
+                timestamp_sec=timestamp_ticks * self._os_access._tick,
+                cpu_usage=cpu_usage,
+                process_cpu_sec=float(process['PercentProcessorTime']) * self._os_access._tick,
+                process_memory_bytes=int(process['WorkingSet']),
+                process_memory_peak_bytes=int(process['WorkingSetPeak']),
+                process_thread_count=int(process['ThreadCount']),
+                process_open_files_count=int(process['HandleCount']),
+                disks_io=self._os_access.get_io_time(),
+                ))
+            if self._stopped.wait(max(0., self._interval_sec - (time.monotonic() - started_at))):
+                break
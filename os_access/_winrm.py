@@ -6,17 +6,23 @@ import logging
 import pprint
 import socket
 import threading
+import time
 import xml
-from contextlib import closing
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timezone
 from http.client import HTTPConnection
 from pprint import pformat
 from typing import Any
+from typing import Callable
 from typing import Mapping
 from typing import NamedTuple
 from typing import NoReturn
 from typing import Optional
+from typing import Sequence
+from typing import TypeVar
 from typing import Union
 from uuid import uuid4
 from xml.dom import minidom
@@ -71,6 +77,9 @@ _win32_error_codes = {
 
 STATUS_CONTROL_C_EXIT = 0xC000013A  # See: https://msdn.microsoft.com/en-us/library/cc704588.aspx
 
+_max_idle_sec = 100
+_T = TypeVar('_T')
+
 
 class WinRMOperationTimeoutError(Exception):
     """WinRM-level operation timeout (not a connection-level timeout).
@@ -349,6 +358,27 @@ class BadSelectors(Exception):
         self.code_ns = code_ns
 
 
+class _LatencyHistograms:
+
+    _bounds_sec = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30, 60, float('inf'))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: [0] * len(self._bounds_sec))
+
+    def add(self, action: str, latency_sec: float):
+        [*_, action_name] = action.rsplit('/', 1)
+        with self._lock:
+            self._counts[action_name][bisect_left(self._bounds_sec, latency_sec)] += 1
+
+    def get(self) -> Mapping[str, Mapping[float, int]]:
+        with self._lock:
+            return {
+                action_name: dict(zip(self._bounds_sec, counts))
+                for action_name, counts in self._counts.items()
+                }
+
+
 class WinRM:
     """Windows-specific interface.
 
@@ -356,13 +386,16 @@ class WinRM:
     WinRM must not know of particular WMI classes and CMD and PowerShell scripts.
     """
 
-    def __init__(self, address, port, username, password):
+    def __init__(self, address, port, username, password, max_connections=4):
         self._address: str = address
         self._port: int = port
         user_pass = (username.encode() + b':' + password.encode())
         self._auth = b'Basic ' + base64.b64encode(user_pass)
         self._repr = f'WinRM({address!r}, {port!r}, {username!r}, password)'
         self._lock = threading.Lock()
+        self._max_connections = max_connections
+        self._idle_connections: list[tuple[HTTPConnection, float]] = []
+        self._latency = _LatencyHistograms()
 
     def __repr__(self):
         return self._repr
@@ -370,18 +403,59 @@ class WinRM:
     def netloc(self):
         return f'{self._address}:{self._port}'
 
-    def _request(self, data: bytes):
+    def close(self):
+        with self._lock:
+            idle_connections = self._idle_connections
+            self._idle_connections = []
+        for connection, _last_used_at in idle_connections:
+            connection.close()
+
+    def get_latency_histograms(self) -> Mapping[str, Mapping[float, int]]:
+        """Count requests by action and by latency upper bound in seconds."""
+        return self._latency.get()
+
+    def _take_connection(self) -> tuple[HTTPConnection, bool]:
         # Windows terminates TCP connection after 120 seconds without requests.
-        # A corresponding setting has not been found yet. Reconnect only once
-        # and only if the connection is explicitly closed by Windows.
+        # A corresponding setting has not been found yet. Connections idle for
+        # a bit less than that are not reused.
+        with self._lock:
+            while self._idle_connections:
+                connection, last_used_at = self._idle_connections.pop()
+                if time.monotonic() - last_used_at < _max_idle_sec:
+                    return connection, True
+                connection.close()
         _logger.debug("%s: connect", self)
-        with closing(
-                HTTPConnection(self._address, self._port, timeout=150)) as connection:
-            self._send_request(connection, data)
-            response = self._read_response(connection)
+        return HTTPConnection(self._address, self._port, timeout=150), False
+
+    def _put_connection(self, connection: HTTPConnection):
+        with self._lock:
+            if len(self._idle_connections) < self._max_connections:
+                self._idle_connections.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def _request(self, data: bytes):
+        connection, is_reused = self._take_connection()
+        try:
+            try:
+                self._send_request(connection, data)
+                response = self._read_response(connection)
+            except (ConnectionResetError, BrokenPipeError):
+                if not is_reused:
+                    raise
+                # Reconnect only once and only if the connection is
+                # explicitly closed by Windows.
+                _logger.debug("%s: reconnect", self)
+                connection.close()
+                self._send_request(connection, data)
+                response = self._read_response(connection)
             response_type = response.headers.get('Content-Type', 'text/plain')
             content = response.read()
-            return response.status, response_type, content
+        except Exception:
+            connection.close()
+            raise
+        self._put_connection(connection)
+        return response.status, response_type, content
 
     def _send_request(self, connection, data):
         try:
@@ -508,8 +582,9 @@ class WinRM:
             }
         request_xml = xmltodict.unparse(rq, pretty=True, indent='  ')
         _logger.debug("Request:\n%s", request_xml)
-        with self._lock:
-            status, response_type, content = self._request(request_xml.encode('utf-8'))
+        started_at = time.monotonic()
+        status, response_type, content = self._request(request_xml.encode('utf-8'))
+        self._latency.add(action, time.monotonic() - started_at)
         try:
             response_dom = minidom.parseString(content)
         except xml.parsers.expat.ExpatError:
@@ -537,6 +612,20 @@ class WinRM:
             raise RuntimeError("Unexpected RelatesTo {}: for MessageId {}".format(relates_to, message_id))
         return response_dict['env:Envelope']['env:Body']
 
+    def batch(self, operations: Sequence[Callable[[], _T]]) -> Sequence[_T]:
+        """Run independent operations concurrently, return results in order.
+
+        Each operation takes a connection from the pool, so at most
+        max_connections requests are in flight. Enumerations must be
+        consumed inside the operation, e.g. lambda: list(winrm.wsman_all(cls)).
+        The first error is raised after all operations finish.
+        """
+        if len(operations) <= 1:
+            return [operation() for operation in operations]
+        with ThreadPoolExecutor(self._max_connections, thread_name_prefix=f'winrm_{self._address}') as executor:
+            futures = [executor.submit(operation) for operation in operations]
+        return [future.result() for future in futures]
+
     def enumerate(self, resource_uri, raw_filter, max_elements=32000):
         enumeration_context = [None]
         enumeration_is_ended = [False]
@@ -3,6 +3,7 @@ import hashlib
 import math
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -565,3 +566,51 @@ def _test_get_pid_by_name(one_vm_type, exit_stack):
     else:
         raise RuntimeError(f'Unknown one_vm_type: {one_vm_type}')
     assert one_vm.os_access.get_pid_by_name(process_name)
+
+
+def test_download_tar_zstd_ubuntu22(exit_stack):
+    artifacts_dir = get_run_dir()
+    vm_pool = public_default_vm_pool(artifacts_dir)
+    one_vm = exit_stack.enter_context(vm_pool.clean_vm(vm_types['ubuntu22']))
+    one_vm.ensure_started(artifacts_dir)
+    os_access = one_vm.os_access
+    remote_dir = os_access.tmp() / 'download_tar_zstd'
+    remote_dir.rmtree(ignore_errors=True)
+    remote_dir.mkdir()
+    files = [remote_dir / 'one.txt', remote_dir / 'two.bin', remote_dir / 'missing.txt']
+    files[0].write_text('one')
+    files[1].write_bytes(os.urandom(10 * 1024 * 1024))
+    bundle_file = artifacts_dir / 'bundle.tar.zst'
+    with bundle_file.open('wb') as f:
+        durations = os_access.download_tar_zstd(files, f)
+    assert sorted(durations) == sorted(str(file) for file in files[:2])
+    assert bundle_file.read_bytes()[:4] == b'\x28\xb5\x2f\xfd'  # Zstandard frame magic number
+
+
+def test_concurrent_downloads_ubuntu22(exit_stack):
+    artifacts_dir = get_run_dir()
+    vm_pool = public_default_vm_pool(artifacts_dir)
+    one_vm = exit_stack.enter_context(vm_pool.clean_vm(vm_types['ubuntu22']))
+    one_vm.ensure_started(artifacts_dir)
+    remote_dir = one_vm.os_access.tmp() / 'concurrent_downloads'
+    remote_dir.rmtree(ignore_errors=True)
+    remote_dir.mkdir()
+    files = {remote_dir / f'{index}.bin': os.urandom(10 * 1024 * 1024) for index in range(8)}
+    for file, data in files.items():
+        file.write_bytes(data)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        downloaded = dict(zip(files, executor.map(lambda file: file.read_bytes(), files)))
+    assert downloaded == files
+
+
+def test_winrm_batch_win11(exit_stack):
+    artifacts_dir = get_run_dir()
+    vm_pool = public_default_vm_pool(artifacts_dir)
+    one_vm = exit_stack.enter_context(vm_pool.clean_vm(vm_types['win11']))
+    one_vm.ensure_started(artifacts_dir)
+    winrm = one_vm.os_access.winrm
+    classes = ['Win32_OperatingSystem', 'Win32_ComputerSystem', 'Win32_BIOS', 'Win32_Processor']
+    results = winrm.batch([lambda cls=cls: list(winrm.wsman_all(cls)) for cls in classes])
+    assert [len(objects) > 0 for objects in results] == [True] * len(classes)
+    histograms = winrm.get_latency_histograms()
+    assert sum(histograms['Enumerate'].values()) >= len(classes)
@@ -63,6 +63,36 @@ def test_os_metrics(exit_stack: ExitStack, os_name: str):
     assert metrics['drive'][0] == metrics['disk']
 
 
+def test_metrics_sampler_win11(exit_stack: ExitStack):
+    _test_metrics_sampler(exit_stack, 'win11')
+
+
+def test_metrics_sampler_ubuntu22(exit_stack: ExitStack):
+    _test_metrics_sampler(exit_stack, 'ubuntu22')
+
+
+def _test_metrics_sampler(exit_stack: ExitStack, os_name: str):
+    artifacts_dir = get_run_dir()
+    vm_pool = public_default_vm_pool(artifacts_dir)
+    vm = exit_stack.enter_context(vm_pool.clean_vm(vm_types[os_name]))
+    vm.ensure_started(artifacts_dir)
+    exit_stack.enter_context(vm.os_access.prepared_one_shot_vm(artifacts_dir))
+    if isinstance(vm.os_access, WindowsAccess):
+        pid = vm.os_access.run(['powershell', '-Command', '(Get-Process -Name winlogon)[0].Id']).stdout
+    else:
+        pid = vm.os_access.run(['pgrep', '--oldest', 'systemd']).stdout
+    with vm.os_access.metrics_sampler(int(pid), interval_sec=0.5, max_samples=4) as sampler:
+        time.sleep(5)
+    samples = sampler.list_samples()
+    _logger.info("Samples: %r", samples)
+    assert len(samples) == 4
+    assert all(a.timestamp_sec < b.timestamp_sec for a, b in zip(samples, samples[1:]))
+    assert all(0 <= sample.cpu_usage <= 1 for sample in samples)
+    assert all(sample.process_memory_bytes > 0 for sample in samples)
+    assert all(sample.process_thread_count > 0 for sample in samples)
+    assert all(sample.process_open_files_count > 0 for sample in samples)
+
+
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
     _logger = logging.getLogger(__name__)
@@ -814,6 +814,36 @@ def _test_glob_no_result(path_type):
         assert not list(existing_remote_dir.glob('*.non_existent'))
 
 
+def test_rglob_with_stat_smb():
+    _test_rglob_with_stat('smb')
+
+
+def test_rglob_with_stat_sftp():
+    _test_rglob_with_stat('sftp')
+
+
+def _test_rglob_with_stat(path_type):
+    artifacts_dir = get_run_dir()
+    with _os_paths(path_type, artifacts_dir) as [_home_dir, temp_dir]:
+        remote_test_dir = _remote_test_dir(temp_dir)
+        existing_remote_dir = _existing_remote_dir(remote_test_dir)
+        existing_remote_dir.joinpath('1', '11 with spaces').mkdir(parents=True)
+        existing_remote_dir.joinpath('1', '11 with spaces', '111.txt').write_bytes(b'dummy')
+        existing_remote_dir.joinpath('1', '12.txt').write_bytes(b'dummy text')
+        existing_remote_dir.joinpath('2.dat').write_bytes(b'dummy bytes')
+        found = dict(existing_remote_dir.rglob_with_stat('*'))
+        walked = [path for path, _ in existing_remote_dir._walk()]
+        assert sorted(found) == sorted(walked)
+        for path, path_stat in found.items():
+            if not path.is_dir():
+                assert path_stat.st_size == path.stat().st_size
+        assert sorted(existing_remote_dir.rglob('*.txt')) == sorted([
+            existing_remote_dir.joinpath('1', '11 with spaces', '111.txt'),
+            existing_remote_dir.joinpath('1', '12.txt'),
+            ])
+        assert not existing_remote_dir.joinpath('non_existent').rglob('*')
+
+
 def test_many_mkdir_rmtree_smb_2iterations_depth2():
     _test_many_mkdir_rmtree('smb', 2, 2)
 
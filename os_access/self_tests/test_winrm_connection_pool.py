@@ -0,0 +1,84 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+from os_access._winrm import WinRM
+
+
+def test_connection_reused():
+    with _serving_wsman() as server:
+        winrm = WinRM('127.0.0.1', server.server_port, 'user', 'password')
+        for _ in range(3):
+            assert winrm._request(b'<request/>') == (200, 'application/soap+xml', b'<response/>')
+        winrm.close()
+    assert len(server.client_ports) == 3
+    assert len(set(server.client_ports)) == 1
+
+
+def test_batch_connections_limited():
+    with _serving_wsman() as server:
+        winrm = WinRM('127.0.0.1', server.server_port, 'user', 'password', max_connections=2)
+        results = winrm.batch([lambda: winrm._request(b'<request/>') for _ in range(10)])
+        assert len(results) == 10
+        assert len(winrm._idle_connections) <= 2
+        winrm.close()
+    assert len(set(server.client_ports)) <= 2
+
+
+def test_idle_connection_not_reused():
+    with _serving_wsman() as server:
+        winrm = WinRM('127.0.0.1', server.server_port, 'user', 'password')
+        winrm._request(b'<request/>')
+        [(idle_connection, _)] = winrm._idle_connections
+        with patch('os_access._winrm._max_idle_sec', 0):
+            winrm._request(b'<request/>')
+        assert idle_connection.sock is None
+        winrm.close()
+    assert len(set(server.client_ports)) == 2
+
+
+def test_close():
+    with _serving_wsman() as server:
+        winrm = WinRM('127.0.0.1', server.server_port, 'user', 'password')
+        winrm._request(b'<request/>')
+        [(idle_connection, _)] = winrm._idle_connections
+        winrm.close()
+        assert not winrm._idle_connections
+        assert idle_connection.sock is None
+        winrm._request(b'<request/>')
+        winrm.close()
+    assert len(set(server.client_ports)) == 2
+
+
+@contextmanager
+def _serving_wsman():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _WsmanHandler)
+    server.client_ports = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class _WsmanHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.server.client_ports.append(self.client_address[1])
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = b'<response/>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/soap+xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
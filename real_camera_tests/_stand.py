@@ -7,13 +7,18 @@ from contextlib import closing
 from contextlib import contextmanager
 from datetime import datetime
 from ipaddress import IPv4Address
+from typing import Callable
+from typing import Iterator
+from typing import Mapping
 
 from installation import Mediaserver
 from mediaserver_api import MediaserverApiConnectionError
 from real_camera_tests import camera_stages
 from real_camera_tests._expected_cameras import ExpectedCameras
 from real_camera_tests.camera_stage import BaseStage
+from real_camera_tests.camera_stage import CameraSnapshot
 from real_camera_tests.camera_stage import MultiStage
+from real_camera_tests.camera_stage import NextStep
 from real_camera_tests.camera_stage import RealDeviceConfig
 from real_camera_tests.camera_stage import Stage
 from real_camera_tests.camera_stage import make_camera_step_generator
@@ -37,6 +42,8 @@ from real_camera_tests.server_stages import unexpected_cameras_after_manual_disc
 
 _logger = logging.getLogger(__name__)
 
+_min_tick_interval_sec = 0.5
+
 
 class Stand:
     def __init__(
@@ -162,6 +169,7 @@ class Stand:
 
     def _run_camera_stages(self, discovery_stage: BaseStage, *stages: BaseStage):
         _logger.info('Run camera stages: %r', stages)
+        cameras = CameraSnapshot(self.server)
         step_generators = {
             camera_config.name: make_camera_step_generator(
                 server=self.server,
@@ -170,31 +178,18 @@ class Stand:
                 camera_config=camera_config,
                 check_results=self._check_results,
                 stage_hard_timeout=self._stage_hard_timeout,
+                cameras=cameras,
                 )
             for camera_config
             in self.expected_cameras.filtered_camera_configs
             }
-        exhausted_generators = {}
-        while True:
+
+        def _on_tick():
             self._log_statistics()
-            active_generators = {}
-            for name, step_generator in step_generators.items():
-                try:
-                    next(step_generator)
-                except StopIteration:
-                    exhausted_generators[name] = step_generator
-                else:
-                    active_generators[name] = step_generator
-            _logger.debug(
-                "Camera round complete: active=%r, finished=%r",
-                [*active_generators.values()],
-                [*exhausted_generators.values()],
-                )
-            if not active_generators:
-                break
-            step_generators = active_generators
-            _logger.debug("Sleep for a while before the next round")
-            time.sleep(1)
+            cameras.refresh()
+
+        statistics = _run_due_steps(step_generators, _on_tick)
+        statistics.log()
 
     def _log_statistics(self):
         message = 'Server performance statistics'
@@ -292,3 +287,77 @@ class Stand:
                 raise Exception(
                     f"Cannot connect to {config.hostname}:{config.port}; "
                     f"check that libvlc have opened ports")
+
+
+def _run_due_steps(
+        step_generators: Mapping[str, Iterator[NextStep]],
+        on_tick: Callable[[], None],
+        ) -> '_StepStatistics':
+    """Run steps of all cameras as they fall due until all are exhausted.
+
+    The callback is called before each tick, e.g. to refresh a camera snapshot.
+    """
+    due_at = {name: time.monotonic() for name in step_generators}
+    statistics = _StepStatistics()
+    last_tick_at = None
+    while due_at:
+        wait_until = min(due_at.values())
+        if last_tick_at is not None:
+            # Steps falling due closely are run in one tick with one camera snapshot.
+            wait_until = max(wait_until, last_tick_at + _min_tick_interval_sec)
+        delay_sec = wait_until - time.monotonic()
+        if delay_sec > 0:
+            _logger.debug("Sleep for %.3f sec before the next tick", delay_sec)
+            time.sleep(delay_sec)
+        last_tick_at = time.monotonic()
+        on_tick()
+        for name in [name for name, at in due_at.items() if at <= last_tick_at]:
+            step_started_at = time.monotonic()
+            try:
+                next_step = next(step_generators[name])
+            except StopIteration:
+                del due_at[name]
+                continue
+            step_ended_at = time.monotonic()
+            statistics.add(
+                next_step.stage_name,
+                duration_sec=step_ended_at - step_started_at,
+                lag_sec=step_started_at - due_at[name],
+                )
+            due_at[name] = step_ended_at + next_step.delay_sec
+        _logger.debug(
+            "Camera tick complete: active=%r, finished=%r",
+            [*due_at.keys()],
+            [name for name in step_generators if name not in due_at],
+            )
+    return statistics
+
+
+class _StepStatistics:
+    """Step durations and lags behind the due time per stage."""
+
+    def __init__(self):
+        self._count = {}
+        self._total_duration_sec = {}
+        self._max_duration_sec = {}
+        self._total_lag_sec = {}
+        self._max_lag_sec = {}
+
+    def add(self, stage_name: str, duration_sec: float, lag_sec: float):
+        self._count[stage_name] = self._count.get(stage_name, 0) + 1
+        self._total_duration_sec[stage_name] = self._total_duration_sec.get(stage_name, 0) + duration_sec
+        self._max_duration_sec[stage_name] = max(self._max_duration_sec.get(stage_name, 0), duration_sec)
+        self._total_lag_sec[stage_name] = self._total_lag_sec.get(stage_name, 0) + lag_sec
+        self._max_lag_sec[stage_name] = max(self._max_lag_sec.get(stage_name, 0), lag_sec)
+
+    def log(self):
+        for stage_name, count in self._count.items():
+            _logger.info(
+                "Stage %s: %d steps, duration avg %.3f max %.3f sec, lag avg %.3f max %.3f sec",
+                stage_name,
+                count,
+                self._total_duration_sec[stage_name] / count,
+                self._max_duration_sec[stage_name],
+                self._total_lag_sec[stage_name] / count,
+                self._max_lag_sec[stage_name],
+                )
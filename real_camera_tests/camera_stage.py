@@ -724,6 +724,34 @@ class NvrAnotherChannelConfig(NvrChannelConfig):
         assert self.physical_id.auto.endswith(f'_channel={self.channel}')
 
 
+class CameraSnapshot:
+    """Cameras listed once for all runs.
+
+    The stand refreshes it before each round of steps, so runs of all
+    cameras don't request their cameras one by one.
+    """
+
+    def __init__(self, server: Mediaserver):
+        self._server = server
+        self._cameras = {}
+
+    def refresh(self):
+        try:
+            cameras = self._server.api.list_cameras()
+        except (MediaserverApiHttpError, MediaserverApiConnectionError) as e:
+            _logger.debug("Failed to list cameras: %r", e)
+            cameras = []
+        self._cameras = {}
+        for camera in cameras:
+            # A camera is requested by logical or physical ID, as in get_camera().
+            self._cameras[camera.physical_id] = camera
+            if camera.logical_id is not None:
+                self._cameras[str(camera.logical_id)] = camera
+
+    def find(self, camera_id):
+        return self._cameras.get(str(camera_id))
+
+
 class Run:
     """Several consecutive stages for a camera.
 
@@ -731,11 +759,12 @@ class Run:
     Keeps and updates a camera object.
     """
 
-    def __init__(self, server: Mediaserver, config: CameraConfig):
+    def __init__(self, server: Mediaserver, config: CameraConfig, cameras: Optional[CameraSnapshot] = None):
         self.server = server
         self.name = config.name
         self.id = config.id  # Changed from outside.
         self.config = config
+        self._cameras = cameras
         self._uuid: Optional[str] = None
         self._data: Optional[dict] = None
 
@@ -747,12 +776,16 @@ class Run:
 
     @property
     def data(self):
-        try:
-            camera = self.server.api.get_camera(self.id, is_uuid=False)
-        except (MediaserverApiHttpError, MediaserverApiConnectionError):
-            camera = None
-        self._data = self._data or camera
-
+        if self._data is not None:
+            return self._data
+        if self._cameras is not None:
+            self._data = self._cameras.find(self.id)
+        if self._data is None:
+            # The camera may have been added after the snapshot was taken.
+            try:
+                self._data = self.server.api.get_camera(self.id, is_uuid=False)
+            except (MediaserverApiHttpError, MediaserverApiConnectionError):
+                pass
         return self._data
 
     def clear_cache(self):
@@ -827,6 +860,13 @@ class IoStage(BaseStage):
         return [IoStageExecutor(self.io_events_func, self._io_manager, self.timeout)]
 
 
+class NextStep(NamedTuple):
+    """Yielded after a step: the stage it belongs to and when to run the next one."""
+
+    stage_name: str
+    delay_sec: float = 1
+
+
 class StageExecutor(metaclass=ABCMeta):
     """Single stage for a single camera.
 
@@ -851,9 +891,10 @@ class StageExecutor(metaclass=ABCMeta):
             camera_config: CameraConfig,
             server: Mediaserver,
             hard_timeout: Optional[float] = None,
-            ) -> Generator[None, None, Result]:
+            cameras: Optional[CameraSnapshot] = None,
+            ) -> Generator[NextStep, None, Result]:
         timeout = min(self._timeout, hard_timeout) if hard_timeout else self._timeout
-        run = Run(server, camera_config)
+        run = Run(server, camera_config, cameras)
         stage_name = f'RCT/{camera_config.name}/{self.name}'
         _logger.info(
             "%s: %s: stage started: reported as %s",
@@ -881,7 +922,7 @@ class StageExecutor(metaclass=ABCMeta):
                         "%s: %s: stage step completed, "
                         "first core dump generated",
                         self.name, camera_config.name)
-                    yield  # Wait for a while before generating the next dump.
+                    yield NextStep(self.name)  # Wait for a while before generating the next dump.
                     _logger.debug(
                         "%s: %s: stage step started, "
                         "generate second core dump",
@@ -941,7 +982,7 @@ class StageExecutor(metaclass=ABCMeta):
                         camera_config.name, self.name, duration, timeout)
                     result = TimedOut(timeout, duration, last_result)
                     return result
-            yield
+            yield NextStep(self.name)
 
 
 class _FunctionStageExecutor(StageExecutor):
@@ -972,7 +1013,8 @@ def make_camera_step_generator(
         camera_config: CameraConfig,
         stage_hard_timeout: float,
         check_results: CheckResults,
-        ):
+        cameras: Optional[CameraSnapshot] = None,
+        ) -> Generator[NextStep, None, None]:
     # Preferring logicalId over physicalId
     discovery_stage_executor: StageExecutor
     discovery_stage_executors = discovery_stage.make_executors(camera_config)
@@ -992,6 +1034,7 @@ def make_camera_step_generator(
         camera_config,
         server,
         stage_hard_timeout,
+        cameras,
         )
     check_results.update_result(
         device_name=camera_config.name,
@@ -1016,7 +1059,7 @@ def make_camera_step_generator(
             result=Halt("Just started"),
             started_at_iso=executor_started_at_utc.isoformat(' ', 'microseconds'),
             )
-        executor_result = yield from executor.steps(camera_config, server, stage_hard_timeout)
+        executor_result = yield from executor.steps(camera_config, server, stage_hard_timeout, cameras)
         check_results.update_result(
             device_name=camera_config.name,
             stage_name=executor.name,
@@ -0,0 +1,144 @@
+# Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from mediaserver_api import MediaserverApiConnectionError
+from real_camera_tests._stand import _StepStatistics
+from real_camera_tests._stand import _run_due_steps
+from real_camera_tests.camera_stage import CameraSnapshot
+from real_camera_tests.camera_stage import NextStep
+from real_camera_tests.camera_stage import Run
+
+
+class TestCameraSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.api = _FakeApi()
+        self.cameras = CameraSnapshot(SimpleNamespace(api=self.api))
+
+    def test_find(self):
+        self.api.add_camera('11:22:33:44:55:66', logical_id=7)
+        self.cameras.refresh()
+        self.assertEqual(self.cameras.find('11:22:33:44:55:66').id, '11:22:33:44:55:66')
+        self.assertEqual(self.cameras.find(7).id, '11:22:33:44:55:66')
+        self.assertEqual(self.cameras.find('7').id, '11:22:33:44:55:66')
+        self.assertIsNone(self.cameras.find('66:55:44:33:22:11'))
+
+    def test_refresh(self):
+        self.cameras.refresh()
+        self.assertIsNone(self.cameras.find('11:22:33:44:55:66'))
+        self.api.add_camera('11:22:33:44:55:66')
+        self.assertIsNone(self.cameras.find('11:22:33:44:55:66'))
+        self.cameras.refresh()
+        self.assertIsNotNone(self.cameras.find('11:22:33:44:55:66'))
+
+    def test_refresh_failed(self):
+        self.api.add_camera('11:22:33:44:55:66')
+        self.cameras.refresh()
+        self.api.is_available = False
+        self.cameras.refresh()
+        self.assertIsNone(self.cameras.find('11:22:33:44:55:66'))
+
+
+class TestRun(unittest.TestCase):
+
+    def setUp(self):
+        self.api = _FakeApi()
+        self.server = SimpleNamespace(api=self.api)
+        self.cameras = CameraSnapshot(self.server)
+        self.config = SimpleNamespace(name='camera', id='11:22:33:44:55:66')
+
+    def test_data_from_snapshot(self):
+        self.api.add_camera('11:22:33:44:55:66')
+        self.cameras.refresh()
+        run = Run(self.server, self.config, self.cameras)
+        self.assertEqual(run.uuid, '11:22:33:44:55:66')
+        self.assertEqual(self.api.get_camera_count, 0)
+
+    def test_camera_added_after_snapshot(self):
+        self.cameras.refresh()
+        run = Run(self.server, self.config, self.cameras)
+        self.assertIsNone(run.data)
+        self.api.add_camera('11:22:33:44:55:66')
+        self.assertEqual(run.uuid, '11:22:33:44:55:66')
+        self.assertEqual(self.api.get_camera_count, 2)
+
+    def test_data_kept(self):
+        self.cameras.refresh()
+        run = Run(self.server, self.config, self.cameras)
+        self.api.add_camera('11:22:33:44:55:66')
+        camera = run.data
+        self.assertIs(run.data, camera)
+        self.assertEqual(self.api.get_camera_count, 1)
+        run.clear_cache()
+        self.assertIsNot(run.data, camera)
+
+
+class TestDueSteps(unittest.TestCase):
+
+    def test_steps_run_when_due(self):
+        steps = []
+
+        def _steps(name, delays_sec):
+            for delay_sec in delays_sec:
+                steps.append((name, time.monotonic()))
+                yield NextStep(f'{name}/stage', delay_sec=delay_sec)
+
+        ticks = []
+        started_at = time.monotonic()
+        with patch('real_camera_tests._stand._min_tick_interval_sec', 0.05):
+            statistics = _run_due_steps(
+                {
+                    'fast': _steps('fast', [0, 0, 0]),
+                    'slow': _steps('slow', [0.3]),
+                    },
+                on_tick=lambda: ticks.append(time.monotonic()),
+                )
+        self.assertEqual([name for name, _ in steps], ['fast', 'slow', 'fast', 'fast'])
+        # Ticks are apart, even if steps are due immediately.
+        tick_intervals_sec = [b - a for a, b in zip(ticks, ticks[1:])]
+        self.assertGreaterEqual(min(tick_intervals_sec), 0.05)
+        # The generator of the slow camera is exhausted when it is due again.
+        self.assertGreaterEqual(ticks[-1] - started_at, 0.3)
+        self.assertEqual(statistics._count, {'fast/stage': 3, 'slow/stage': 1})
+
+
+class TestStepStatistics(unittest.TestCase):
+
+    def test_log(self):
+        statistics = _StepStatistics()
+        statistics.add('first', duration_sec=1, lag_sec=0)
+        statistics.add('first', duration_sec=3, lag_sec=2)
+        statistics.add('second', duration_sec=0.5, lag_sec=0.25)
+        with self.assertLogs('real_camera_tests._stand', 'INFO') as logs:
+            statistics.log()
+        self.assertEqual([record.getMessage() for record in logs.records], [
+            "Stage first: 2 steps, duration avg 2.000 max 3.000 sec, lag avg 1.000 max 2.000 sec",
+            "Stage second: 1 steps, duration avg 0.500 max 0.500 sec, lag avg 0.250 max 0.250 sec",
+            ])
+
+
+class _FakeApi:
+
+    def __init__(self):
+        self.is_available = True
+        self.get_camera_count = 0
+        self._cameras = []
+
+    def add_camera(self, physical_id, logical_id=None):
+        self._cameras.append(SimpleNamespace(id=physical_id, physical_id=physical_id, logical_id=logical_id))
+
+    def list_cameras(self):
+        if not self.is_available:
+            raise MediaserverApiConnectionError('server', "Connection refused")
+        return list(self._cameras)
+
+    def get_camera(self, camera_id, is_uuid=True):
+        assert not is_uuid
+        self.get_camera_count += 1
+        for camera in self._cameras:
+            if camera_id in (camera.physical_id, str(camera.logical_id)):
+                return SimpleNamespace(**vars(camera))
+        return None
@@ -87,19 +87,10 @@ class FTTest(metaclass=ABCMeta):
         return [*self._dir_tags(), *self._custom_tags()]
 
     def _custom_tags(self) -> Collection[str]:
-        tags = []
         docstring = inspect.getdoc(self)
         if docstring is None:
             return []
-        p = 'https://networkoptix.testrail.net/index.php?/cases/view/'
-        for line in docstring.splitlines():
-            if line.startswith('Selection-Tag:'):
-                tags.append(line.removeprefix('Selection-Tag:').strip())
-            if line.startswith('TestRail:'):
-                value = line.removeprefix('TestRail:').strip()
-                m = re.fullmatch(re.escape(p) + r'(\d+)', value)
-                tags.append(f'testrail-{m[1]}')
-        return tags
+        return parse_docstring_tags(docstring)
 
     def _dir_tags(self) -> Collection[str]:
         file_id = self._file_id()
@@ -226,4 +217,27 @@ class FTTest(metaclass=ABCMeta):
             }
 
 
+def parse_docstring_tags(docstring: str) -> Collection[str]:
+    r"""Extract tags from a cleaned (dedented) docstring of a test.
+
+    >>> parse_docstring_tags(
+    ...     'Test something.\n'
+    ...     '\n'
+    ...     'Selection-Tag: gitlab\n'
+    ...     'TestRail: https://networkoptix.testrail.net/index.php?/cases/view/58203\n'
+    ...     )
+    ['gitlab', 'testrail-58203']
+    """
+    tags = []
+    p = 'https://networkoptix.testrail.net/index.php?/cases/view/'
+    for line in docstring.splitlines():
+        if line.startswith('Selection-Tag:'):
+            tags.append(line.removeprefix('Selection-Tag:').strip())
+        if line.startswith('TestRail:'):
+            value = line.removeprefix('TestRail:').strip()
+            m = re.fullmatch(re.escape(p) + r'(\d+)', value)
+            tags.append(f'testrail-{m[1]}')
+    return tags
+
+
 _logger = logging.getLogger(__name__)
@@ -1,5 +1,6 @@
 # Copyright 2018-present Network Optix, Inc. Licensed under MPL 2.0: www.mozilla.org/MPL/2.0/
 import argparse
+import ast
 import importlib
 import inspect
 import json
@@ -20,6 +21,7 @@ from urllib.request import urlopen
 
 from config import global_config
 from runner.ft_test import FTTest
+from runner.ft_test import parse_docstring_tags
 
 _logger = logging.getLogger(__name__)
 
@@ -123,8 +125,11 @@ class _Collection:
 
     def collect(self, path: str, pattern: str, tag: str):
         _logger.info("Collect tests with tag %s", tag)
+        index = _StaticIndex(Path('~/.cache/ft_test_index.json').expanduser())
         for test_file in _repo_dir.joinpath(path).rglob(pattern):
             rel = test_file.relative_to(_repo_dir)
+            if not index.may_have_tag(test_file, rel, tag):
+                continue
             module_name = '.'.join(rel.with_suffix('').parts)
             module = importlib.import_module(module_name)
             for member in module.__dict__.values():
@@ -147,6 +152,85 @@ class _Collection:
                     else:
                         raise ValueError(f"{key} defined twice")
                 self._stats[str(PurePosixPath(path, '**', pattern))] += 1
+        index.save()
+
+
+class _StaticIndex:
+    """Tags of test classes found by parsing files without importing them.
+
+    Importing all test modules takes long: they import heavy dependencies.
+    Custom tags come from docstrings of test classes, which are literals;
+    docstrings are not inherited by instances, see inspect.getdoc().
+    A module is imported only if it may contain a test with the tag.
+    Parsed files are cached by modification time and size.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        try:
+            self._entries = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+        self._changed = False
+
+    def may_have_tag(self, test_file: Path, rel: Path, tag: str) -> bool:
+        if tag in _dir_tags(rel):
+            return True
+        entry = self._get_entry(test_file)
+        return entry['import_required'] or tag in entry['tags']
+
+    def _get_entry(self, test_file: Path):
+        stat = test_file.stat()
+        version = [stat.st_mtime_ns, stat.st_size]
+        entry = self._entries.get(str(test_file))
+        if entry is None or entry['version'] != version:
+            entry = {'version': version, **_parse_test_file(test_file)}
+            self._entries[str(test_file)] = entry
+            self._changed = True
+        return entry
+
+    def save(self):
+        if not self._changed:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Other processes may read the index; avoid partially written file.
+        temp_path = self._path.with_name(f'{self._path.name}.{os.getpid()}.tmp')
+        temp_path.write_text(json.dumps(self._entries))
+        os.replace(temp_path, self._path)
+        self._changed = False
+
+
+def _parse_test_file(path: Path):
+    try:
+        tree = ast.parse(path.read_bytes(), str(path))
+    except SyntaxError:
+        return {'import_required': True, 'tags': []}
+    tags = []
+    import_required = False
+    for statement in tree.body:
+        if isinstance(statement, ast.ClassDef):
+            docstring = ast.get_docstring(statement)
+            if docstring is not None:
+                tags.extend(parse_docstring_tags(docstring))
+        elif isinstance(statement, (ast.If, ast.Try, ast.With)):
+            # Classes may be defined conditionally; let import tell.
+            if any(isinstance(node, ast.ClassDef) for node in ast.walk(statement)):
+                import_required = True
+    return {'import_required': import_required, 'tags': tags}
+
+
+def _dir_tags(rel: Path) -> Collection[str]:
+    """Make tags like FTTest does for a path relative to the repo root.
+
+    >>> _dir_tags(Path('tests/foo/test_bar.py'))
+    ['dir:tests/', 'dir:tests/foo/']
+    """
+    file_id = rel.as_posix()
+    return [
+        'dir:' + file_id[:i + 1]
+        for i in range(len(file_id))
+        if file_id[i] == '/'
+        ]
 
 
 _repo_dir = Path(__file__).parent.parent.resolve()
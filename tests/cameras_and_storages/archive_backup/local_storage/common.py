@@ -14,6 +14,7 @@ from mediaserver_api import CameraStatus
 from mediaserver_api import MediaserverApi
 from mediaserver_api import Storage
 from mediaserver_api import TimePeriod
+from mediaserver_api import TimePeriodSet
 from os_access import OsAccess
 from os_access import RemotePath
 from vm.hypervisor import Vm
@@ -209,10 +210,13 @@ def archive_is_backed_up(camera_archive, time_period):
     for _ in range(10):  # Make sure archive wasn't backed up after a while
         periods_low = camera_archive.low().list_periods()
         periods_high = camera_archive.high().list_periods()
-        both_qualities_periods = [*periods_low, *periods_high]
-        all_periods_are_complete = all(period.complete for period in both_qualities_periods)
-        if all_periods_are_complete and time_period.is_among(both_qualities_periods):
-            return True
+        all_periods_are_complete = all(period.complete for period in [*periods_low, *periods_high])
+        if all_periods_are_complete:
+            # Qualities are not merged: the period must be in one of them.
+            if time_period.is_among(TimePeriodSet.from_periods(periods_low)):
+                return True
+            if time_period.is_among(TimePeriodSet.from_periods(periods_high)):
+                return True
         time.sleep(1)
     return False
 
@@ -10,6 +10,7 @@ from doubles.software_cameras import MultiPartJpegCameraServer
 from installation import ClassicInstallerSupplier
 from mediaserver_api import MediaserverApi
 from mediaserver_api import TimePeriod
+from mediaserver_api import TimePeriodSet
 from mediaserver_scenarios.license_scenarios import grant_license
 from mediaserver_scenarios.provisioned_mediaservers import FTMachinePool
 from mediaserver_scenarios.software_camera_scenarios import add_cameras
@@ -80,10 +81,10 @@ def _main_archive_is_correct(camera_archive):
 
 
 def _backup_archive_is_correct(main_camera_archive, backup_camera_archive):
-    main_low_quality = main_camera_archive.low().list_periods()
-    main_high_quality = main_camera_archive.high().list_periods()
-    backup_low_quality = backup_camera_archive.low().list_periods()
-    backup_high_quality = backup_camera_archive.high().list_periods()
+    main_low_quality = TimePeriodSet.from_periods(main_camera_archive.low().list_periods())
+    main_high_quality = TimePeriodSet.from_periods(main_camera_archive.high().list_periods())
+    backup_low_quality = TimePeriodSet.from_periods(backup_camera_archive.low().list_periods())
+    backup_high_quality = TimePeriodSet.from_periods(backup_camera_archive.high().list_periods())
     for period in main_low_quality:
         if not period.is_among(backup_low_quality, tolerance_sec=2):
             raise RuntimeError('Backup for low quality is incomplete')
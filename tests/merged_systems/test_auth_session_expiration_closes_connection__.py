@@ -8,7 +8,7 @@ from directories import get_run_dir
 from doubles.software_cameras import MjpegRtspCameraServer
 from doubles.software_cameras import MultiPartJpegCameraServer
 from doubles.video.multipart_reader import ConnectionClosed
-from doubles.video.multipart_reader import get_frames
+from doubles.video.multipart_reader import watch_frames
 from doubles.video.rtsp_client import ConnectionClosedByServer
 from doubles.video.rtsp_client import get_rtsp_stream
 from installation import ClassicInstallerSupplier
@@ -59,8 +59,8 @@ def _test_close_connection_on_session_expiration(distrib_url, two_vm_types, api_
     merge_systems(one, two, take_remote_settings=False)
     [camera] = add_cameras(one, camera_server)
     if camera_server.protocol == 'http':
-        first_stream_reader = partial(get_frames, one.api.mpjpeg_live_url(camera.id))
-        second_stream_reader = partial(get_frames, two.api.mpjpeg_live_url(camera.id))
+        first_stream_reader = partial(watch_frames, one.api.mpjpeg_live_url(camera.id))
+        second_stream_reader = partial(watch_frames, two.api.mpjpeg_live_url(camera.id))
     elif camera_server.protocol == 'rtsp':
         time_limit_sec = 30 * 60  # Enough for the test
         first_stream_reader = partial(
@@ -9,6 +9,7 @@ from typing import Optional
 
 from directories import clean_up_snapshots
 from directories import get_ft_snapshots_cache_root
+from directories.prerequisites import DefaultDistributionGroup
 from directories.prerequisites import concurrent_safe_download
 from vm.virtual_box._access_settings import AccessSettings
 from vm.virtual_box._vbox_manage_medium import vbox_manage_create_child_medium
@@ -76,7 +77,9 @@ class VBoxSnapshotTemplate(VBoxConfigurationTemplate, VMSnapshotTemplate, metacl
 
     def _get_snapshot(self, snapshot_uri: str):
         clean_up_snapshots()
-        local_path = concurrent_safe_download(snapshot_uri, get_ft_snapshots_cache_root())
+        cache_root = get_ft_snapshots_cache_root()
+        peer_dir_urls = DefaultDistributionGroup().peer_dir_urls(cache_root)
+        local_path = concurrent_safe_download(snapshot_uri, cache_root, peer_dir_urls)
         # WARNING: Non-documented behaviour.
         # Virtualbox implicitly removes parent images if they have no others
         # linked disks. Therefore, removal of the last linked to a template VM